@@ -0,0 +1,132 @@
+"""
+Import-time benchmark for the Smart Routing Pipeline
+Measures cold-start import cost with `python -X importtime` in fresh
+interpreters and fails when a target is exceeded or Google ADK is imported
+eagerly
+
+Run: python -m benchmarks.import_time [--repeat 5] [--target 0.5] [--output benchmarks/import_time.jsonl]
+"""
+import argparse
+import json
+import platform as python_platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.config import __version__
+
+# Entry points whose import must stay cheap: the pipeline package (batch
+# workers, the service) and the CLI module
+MODULES = ["src.pipelines", "main"]
+
+# Modules that must only be imported on the first agent call
+DEFERRED_MODULES = ["google.adk", "google.genai"]
+
+# Seconds allowed for importing each entry point (on top of interpreter startup)
+DEFAULT_TARGET_SECONDS = 0.5
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self µs, cumulative µs, nesting depth) for each line of -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2)),
+                            len(match.group(3)) // 2))
+    return entries
+
+
+def measure_import(statement: str) -> Tuple[float, float, List[Tuple[str, int, int, int]]]:
+    """
+    Import cost of a statement in a fresh interpreter.
+
+    Returns:
+        Tuple of (seconds of top-level imports per -X importtime, wall-clock
+        seconds of the process without -X importtime, importtime entries)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True)
+    entries = parse_importtime(result.stderr)
+    imported = sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1e6
+
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], capture_output=True, check=True)
+    return imported, time.perf_counter() - started, entries
+
+
+def benchmark_module(module: str, repeat: int, baseline: Tuple[float, float]) -> Dict[str, Any]:
+    """Median import cost of a module over `repeat` fresh interpreters, net of interpreter startup."""
+    runs = [measure_import(f"import {module}") for _ in range(repeat)]
+    entries = runs[-1][2]
+    names = {name for name, _, _, _ in entries}
+    heaviest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:5]
+    return {
+        "module": module,
+        "import_seconds": max(0.0, statistics.median(run[0] for run in runs) - baseline[0]),
+        "process_seconds": statistics.median(run[1] for run in runs),
+        "startup_seconds": baseline[1],
+        "modules_imported": len(names),
+        "eager_deferred_modules": [name for name in DEFERRED_MODULES if name in names],
+        "heaviest_modules": [{"module": name, "self_ms": round(self_us / 1000, 1)}
+                             for name, self_us, _, _ in heaviest]
+    }
+
+
+def print_report(results: List[Dict[str, Any]], target: float) -> None:
+    header = f"{'module':<16}{'import(s)':>11}{'process(s)':>12}{'modules':>9}  status"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        status = "ok"
+        if result["eager_deferred_modules"]:
+            status = f"FAIL: imports {', '.join(result['eager_deferred_modules'])}"
+        elif result["import_seconds"] > target:
+            status = f"FAIL: over {target:.2f}s target"
+        print(f"{result['module']:<16}{result['import_seconds']:>11.3f}{result['process_seconds']:>12.3f}"
+              f"{result['modules_imported']:>9}  {status}")
+        heaviest = ", ".join(f"{m['module']} {m['self_ms']}ms" for m in result["heaviest_modules"])
+        print(f"{'':<16}heaviest: {heaviest}")
+    print(f"\nInterpreter startup (python -c pass): {results[0]['startup_seconds']:.3f}s")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Smart Routing Pipeline import-time benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module (median is reported)")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET_SECONDS,
+                        help="Maximum import seconds per module")
+    parser.add_argument("--output", help="Append a JSON record of this run to this JSONL file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    baseline_runs = [measure_import("pass") for _ in range(args.repeat)]
+    baseline = (statistics.median(run[0] for run in baseline_runs),
+                statistics.median(run[1] for run in baseline_runs))
+    results = [benchmark_module(module, args.repeat, baseline) for module in MODULES]
+    print_report(results, args.target)
+
+    if args.output:
+        record = {
+            "version": __version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": python_platform.python_version(),
+            "settings": {"repeat": args.repeat, "target": args.target},
+            "results": results
+        }
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"\nResults appended to {args.output}")
+
+    failed = [r for r in results if r["eager_deferred_modules"] or r["import_seconds"] > args.target]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+End-to-end latency benchmark for the Smart Routing Pipeline
+Runs representative scenarios against the fake LLM backend and reports
+wall-clock time, LLM call count and per-stage time
+
+Run: python -m benchmarks.pipeline_latency [--repeat 3] [--output benchmarks/results.jsonl]
+"""
+import argparse
+import asyncio
+import io
+import json
+import platform as python_platform
+import statistics
+import time
+from contextlib import redirect_stdout
+from typing import Any, Dict, List, Optional
+
+from src.config import AGENTIC_PATTERNS, __version__
+from src.pipelines import stream_smart_routed_content
+from src.pipelines.events import (
+    PipelineEvent,
+    ROUTING_DECISION,
+    RESEARCH_READY,
+    PLATFORM_DRAFT,
+    PLATFORM_FAILED,
+    PLATFORM_READY,
+    FINAL_CONTENT
+)
+from src.testing import FakeLlmScenario, use_fake_llm
+from src.utils import get_agent_cache, get_content_store, get_research_cache
+from src.utils.rate_limiter import get_rate_limiter
+
+STAGES = ["routing", "research", "generation", "quality_loop", "synthesis"]
+
+# Platform sets by size; the 4-platform set exceeds the fast-path limit and goes through SmartRouter
+PLATFORM_SETS = {
+    1: ["linkedin"],
+    2: ["x_twitter", "linkedin"],
+    4: ["x_twitter", "linkedin", "instagram", "blog"]
+}
+PLATFORM_NAMES = {"x_twitter": "X", "linkedin": "LinkedIn", "instagram": "Instagram", "blog": "blog"}
+
+# Failing scores before the final passing one, per regeneration count
+REGENERATION_SCORES = {0: [8.0], 1: [5.0, 8.0], 2: [4.0, 5.5, 8.0]}
+
+
+def build_scenarios(latency: float, jitter: float, seed: int) -> List[Dict[str, Any]]:
+    """Every combination of platform count (1/2/4) and regenerations (0-2)."""
+    scenarios = []
+    for count, platforms in PLATFORM_SETS.items():
+        request = (f"Create content for {' and '.join(PLATFORM_NAMES[p] for p in platforms)} "
+                   f"about remote work productivity")
+        for regenerations, scores in REGENERATION_SCORES.items():
+            scenarios.append({
+                "name": f"{count}_platform{'s' if count > 1 else ''}_{regenerations}_regen",
+                "request": request,
+                "scenario": FakeLlmScenario(
+                    latency_seconds=(latency, jitter),
+                    router_decision={
+                        "selected_platforms": platforms,
+                        "confidence": "HIGH",
+                        "reasoning": "Benchmark routing",
+                        "clarification_needed": False,
+                        "content_focus": "remote work productivity"
+                    },
+                    scores={p: scores for p in platforms},
+                    seed=seed
+                )
+            })
+    return scenarios
+
+
+def stage_times(started: float, events: List[PipelineEvent]) -> Dict[str, float]:
+    """
+    Split a run's wall-clock time into stages using event timestamps.
+
+    Args:
+        started: Time the request was submitted
+        events: Events the run produced, in order
+
+    Returns:
+        Stage name -> seconds
+    """
+    def last(predicate, default: float) -> float:
+        times = [e.timestamp for e in events if predicate(e)]
+        return max(times) if times else default
+
+    routed = last(lambda e: e.type == ROUTING_DECISION, started)
+    researched = last(lambda e: e.type == RESEARCH_READY, routed)
+    generated = last(lambda e: e.type == PLATFORM_FAILED or (
+        e.type == PLATFORM_DRAFT and e.data.get("attempt") == 1 and not e.data.get("repaired")
+    ), researched)
+    assessed = last(lambda e: e.type == PLATFORM_READY, generated)
+    finished = last(lambda e: e.type == FINAL_CONTENT, assessed)
+
+    boundaries = [started, routed, researched, generated, assessed, finished]
+    return {stage: boundaries[i + 1] - boundaries[i] for i, stage in enumerate(STAGES)}
+
+
+async def run_scenario(request: str, scenario: FakeLlmScenario) -> Dict[str, Any]:
+    """Run one request on a fresh fake backend and measure it."""
+    events = []
+    with use_fake_llm(scenario) as backend:
+        started = time.time()
+        with redirect_stdout(io.StringIO()):
+            async for event in stream_smart_routed_content(request):
+                events.append(event)
+        wall_clock = time.time() - started
+
+    return {
+        "wall_clock": wall_clock,
+        "llm_calls": backend.total_calls,
+        "calls_by_role": dict(backend.calls),
+        "stages": stage_times(started, events)
+    }
+
+
+async def run_benchmarks(repeat: int, latency: float, jitter: float, seed: int) -> List[Dict[str, Any]]:
+    """
+    Run every scenario `repeat` times and summarize with medians.
+
+    Returns:
+        One result dict per scenario
+    """
+    results = []
+    for spec in build_scenarios(latency, jitter, seed):
+        runs = [await run_scenario(spec["request"], spec["scenario"]) for _ in range(repeat)]
+        results.append({
+            "scenario": spec["name"],
+            "wall_clock_median": statistics.median(r["wall_clock"] for r in runs),
+            "wall_clock_max": max(r["wall_clock"] for r in runs),
+            "llm_calls": runs[0]["llm_calls"],
+            "calls_by_role": runs[0]["calls_by_role"],
+            "stages_median": {
+                stage: statistics.median(r["stages"][stage] for r in runs) for stage in STAGES
+            }
+        })
+    return results
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    header = f"{'scenario':<24}{'wall(s)':>9}{'calls':>7}" + "".join(f"{s:>14}" for s in STAGES)
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        stages = "".join(f"{result['stages_median'][s]:>14.3f}" for s in STAGES)
+        print(f"{result['scenario']:<24}{result['wall_clock_median']:>9.3f}"
+              f"{result['llm_calls']:>7}{stages}")
+
+
+def prepare_environment(mode: str, requests_per_minute: Optional[int]) -> None:
+    """Isolate runs from caches, the content store and (unless simulated) rate limits."""
+    AGENTIC_PATTERNS["conditional_execution"]["mode"] = mode
+    get_research_cache().enabled = False
+    get_content_store().enabled = False
+    agent_cache = get_agent_cache()
+    agent_cache.config = {**agent_cache.config, "enabled": False, "agents": {}}
+    get_rate_limiter().configure({"default": {
+        "requests_per_minute": requests_per_minute or 1_000_000,
+        "tokens_per_minute": 1_000_000_000
+    }})
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Smart Routing Pipeline latency benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (median is reported)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean fake LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Latency standard deviation in seconds")
+    parser.add_argument("--mode", choices=["sequential", "parallel"], default="sequential",
+                        help="Platform execution mode")
+    parser.add_argument("--rpm", type=int, help="Simulate a requests-per-minute limit")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for latency sampling")
+    parser.add_argument("--output", help="Append a JSON record of this run to this JSONL file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    prepare_environment(args.mode, args.rpm)
+    results = asyncio.run(run_benchmarks(args.repeat, args.latency, args.jitter, args.seed))
+    print_report(results)
+
+    if args.output:
+        record = {
+            "version": __version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": python_platform.python_version(),
+            "settings": {key: getattr(args, key) for key in ("repeat", "latency", "jitter", "mode", "rpm", "seed")},
+            "results": results
+        }
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"\nResults appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
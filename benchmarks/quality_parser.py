@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for quality report parsing
+Compares the single-pass parse_quality_report against the previous
+multi-search parsing over a corpus of quality checker reports, in speed and
+in the score, improvements and priority fix each one extracts
+
+Run: python -m benchmarks.quality_parser [--corpus benchmarks/data/quality_reports.jsonl]
+"""
+import argparse
+import json
+import re
+import timeit
+from typing import Any, List, Optional, Tuple
+
+from src.utils.quality import parse_quality_report
+
+DEFAULT_CORPUS = "benchmarks/data/quality_reports.jsonl"
+
+
+def legacy_parse(quality_result: str) -> Tuple[float, List[str], Optional[str]]:
+    """Previous implementation: uncompiled searches for the score, the improvements and the priority fix."""
+    score = 0.0
+    for pattern in [r"OVERALL SCORE[:\s]+(\d+\.?\d*)/10", r"Overall Score[:\s]+(\d+\.?\d*)/10",
+                    r"Score[:\s]+(\d+\.?\d*)/10", r"(\d+\.?\d*)/10"]:
+        match = re.search(pattern, quality_result, re.IGNORECASE)
+        if match:
+            score = min(max(float(match.group(1)), 0.0), 10.0)
+            break
+
+    improvements = []
+    improvements_match = re.search(r"CONTEXTUAL IMPROVEMENTS[^:]*:(.+?)(?=\*\*|$)",
+                                   quality_result, re.DOTALL | re.IGNORECASE)
+    if improvements_match:
+        items = re.split(r'\d+\.', improvements_match.group(1).strip())
+        improvements = [item.strip() for item in items if item.strip()]
+
+    priority_fix = None
+    priority_match = re.search(r"PRIORITY FIX[^:]*:(.+?)(?=\*\*|$)",
+                               quality_result, re.DOTALL | re.IGNORECASE)
+    if priority_match:
+        priority_fix = priority_match.group(1).strip()
+    return score, improvements, priority_fix
+
+
+def differences(reports: List[str]) -> List[Tuple[int, str, Any, Any]]:
+    """Fields where the single-pass result differs from the legacy parse: (report index, field, legacy, new)."""
+    found = []
+    for index, report in enumerate(reports):
+        score, improvements, priority_fix = legacy_parse(report)
+        parsed = parse_quality_report(report)
+        # Whitespace differs only in how wrapped lines are joined
+        legacy = {
+            "overall_score": score,
+            "improvements": [" ".join(item.split()) for item in improvements],
+            "priority_fix": " ".join(priority_fix.split()) if priority_fix else None
+        }
+        for name, value in legacy.items():
+            if value != getattr(parsed, name):
+                found.append((index, name, value, getattr(parsed, name)))
+    return found
+
+
+def load_corpus(path: str) -> List[str]:
+    """Reports from a JSONL file with a "report" field per line."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line)["report"] for line in f if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Quality report parser micro-benchmark")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSONL file of quality reports")
+    parser.add_argument("--iterations", type=int, default=2000, help="Passes over the corpus")
+    args = parser.parse_args()
+
+    reports = load_corpus(args.corpus)
+    total = len(reports) * args.iterations
+
+    timings = {}
+    for name, parse in (("legacy", legacy_parse), ("single_pass", parse_quality_report)):
+        seconds = min(timeit.repeat(lambda: [parse(r) for r in reports], number=args.iterations, repeat=3))
+        timings[name] = seconds / total * 1e6
+
+    diffs = differences(reports)
+    print(f"Corpus: {len(reports)} reports x {args.iterations} passes")
+    print(f"  legacy (score, improvements, fix): {timings['legacy']:8.1f} µs/report")
+    print(f"  single pass (full QualityReport):  {timings['single_pass']:8.1f} µs/report")
+    print(f"  speedup: {timings['legacy'] / timings['single_pass']:.2f}x")
+    print(f"  fields differing from legacy: {len(diffs)}")
+    for index, name, legacy, new in diffs:
+        print(f"    report {index} {name}:\n      legacy: {legacy!r}\n      new:    {new!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,25 @@ Interactive showcase demonstrating intelligent platform selection
 SMART ROUTING FEATURES:
 - Conditional platform execution based on request analysis
 - Intelligent clarification handling for ambiguous requests
-- Rate-limited multi-platform content generation
+- Quota-aware multi-platform content generation
 - Research-enhanced content with platform optimization
+- Batch processing of JSONL request files with resume
+- HTTP service mode with a bounded request queue
 
-Usage: python main.py
+Usage:
+    python main.py
+    python main.py --batch requests.jsonl [--output results.jsonl] [--concurrency 4] [--no-resume]
+    python main.py --serve [--host 0.0.0.0] [--port 8000]
 """
+import argparse
 import asyncio
 import time
+from src.config import BATCH_CONFIG, SERVICE_CONFIG
 from src.config.environment import check_environment
-from src.config import RATE_LIMIT_DELAYS
-from src.pipelines.smart_routing import create_smart_routed_content
+from src.agents import preload_agents
+from src.pipelines.batch import run_batch
+from src.pipelines.smart_routing import stream_smart_routed_content
+from src.pipelines.events import PLATFORM_READY, PLATFORM_FAILED, FINAL_CONTENT
 
 
 async def interactive_smart_routing():
@@ -70,7 +79,25 @@ async def interactive_smart_routing():
         start_time = time.time()
         
         try:
-            result = await create_smart_routed_content(user_request)
+            result = ""
+            stage_seconds = {}
+            token_usage = {}
+            async for event in stream_smart_routed_content(user_request, priority="interactive"):
+                if event.type == PLATFORM_READY:
+                    # Show each platform as soon as its final version is accepted
+                    ready_time = time.time() - start_time
+                    scores = event.data["scores"]
+                    score_text = f"{scores[-1]:.1f}/10" if scores else "unscored"
+                    print("\n" + "=" * 70)
+                    print(f"{event.platform.upper()} READY ({score_text}, {ready_time:.1f}s)")
+                    print("=" * 70)
+                    print(event.data["content"])
+                elif event.type == PLATFORM_FAILED:
+                    print(f"\n{event.platform} failed: {event.data['error']}")
+                elif event.type == FINAL_CONTENT:
+                    result = event.data["result"]
+                    stage_seconds = event.data["stage_seconds"]
+                    token_usage = event.data["token_usage"]
             
             end_time = time.time()
             execution_time = end_time - start_time
@@ -81,19 +108,42 @@ async def interactive_smart_routing():
             print(result)
             print("=" * 70)
             print(f"\nExecution Time: {execution_time:.1f} seconds")
+            if stage_seconds:
+                print("Stage Times: " + " | ".join(
+                    f"{stage} {seconds:.1f}s" for stage, seconds in stage_seconds.items()
+                ))
+            if token_usage:
+                print(f"Tokens: {token_usage['total_tokens']:,} "
+                      f"({token_usage['input_tokens']:,} in / {token_usage['output_tokens']:,} out, "
+                      f"{token_usage['calls']} calls)")
             print("Content successfully generated and optimized!")
             
         except Exception as e:
             print(f"\nError processing request: {e}")
             print("Please try again with a different request.")
         
-        cooling_period = RATE_LIMIT_DELAYS["cooling_period"]
-        print(f"\nCooling down for API rate limits ({cooling_period} seconds)...")
-        await asyncio.sleep(cooling_period)
         print("Ready for next request!")
 
 
-async def main():
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Smart Routing Social Media Pipeline")
+    parser.add_argument("--batch", metavar="INPUT_JSONL",
+                        help="Process a JSONL file of requests instead of the interactive loop")
+    parser.add_argument("--output", metavar="OUTPUT_JSONL",
+                        help="Batch results file (default: <input>.results.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONFIG["concurrency"],
+                        help="Number of pipelines running at once in batch mode")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Reprocess every request instead of skipping completed IDs")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run the HTTP service instead of the interactive loop")
+    parser.add_argument("--host", default=SERVICE_CONFIG["host"], help="HTTP service host")
+    parser.add_argument("--port", type=int, default=SERVICE_CONFIG["port"], help="HTTP service port")
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace):
     """Main execution function for smart routing pipeline."""
     
     print("\nEnvironment Check - Smart Routing Pipeline")
@@ -108,7 +158,20 @@ async def main():
     print("-" * 50)
     print()
     
-    # Start interactive interface
+    if args.serve:
+        import uvicorn
+        from src.service.app import app
+        server = uvicorn.Server(uvicorn.Config(app, host=args.host, port=args.port))
+        await server.serve()
+        return
+    
+    if args.batch:
+        output_path = args.output or f"{args.batch.rsplit('.', 1)[0]}.results.jsonl"
+        await run_batch(args.batch, output_path, args.concurrency, resume=not args.no_resume)
+        return
+    
+    # Start interactive interface (agents load while the first request is typed)
+    preload_agents()
     await interactive_smart_routing()
 
 
@@ -121,4 +184,4 @@ if __name__ == "__main__":
         print("Note: nest_asyncio not available - running without nested loop support")
     
     # Run the main function
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
\ No newline at end of file
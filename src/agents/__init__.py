@@ -1,17 +1,91 @@
 """
 Agent definitions for Smart Routing Pipeline
 Includes routing, content, research, and quality agents with enhanced feedback loop
+
+Agents are built lazily: importing this package doesn't import Google ADK.
+An agent's module (and the ADK) is imported the first time one of its agents
+is accessed, e.g. `agents.quality_checker` or `get_agent("quality_checker")`.
 """
+import importlib
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
+
+# Agent name -> submodule that defines it
+_AGENT_MODULES = {
+    "smart_router": "routing",
+    "x_content_specialist": "content",
+    "linkedin_content_specialist": "content",
+    "instagram_content_specialist": "content",
+    "blog_content_specialist": "content",
+    "research_agent": "research",
+    "quality_synthesizer": "quality",
+    "quality_checker": "quality",
+    "content_regenerator": "quality",
+    "draft_ranker": "quality"
+}
+AGENT_NAMES = list(_AGENT_MODULES)
+
+# Platform -> content specialist name
+PLATFORM_AGENTS = {
+    "x_twitter": "x_content_specialist",
+    "linkedin": "linkedin_content_specialist",
+    "instagram": "instagram_content_specialist",
+    "blog": "blog_content_specialist"
+}
+
+
+def get_agent(name: str) -> "LlmAgent":
+    """
+    Return an agent by name, building it on first use.
+
+    Args:
+        name: Agent attribute name (e.g. "quality_checker")
+
+    Returns:
+        The shared LlmAgent instance
+
+    Raises:
+        KeyError: If no agent has that name
+    """
+    module = importlib.import_module(f"{__name__}.{_AGENT_MODULES[name]}")
+    return getattr(module, name)
+
+
+def get_platform_agent(platform: str) -> Optional["LlmAgent"]:
+    """Return the content specialist for a platform, or None for unknown platforms."""
+    name = PLATFORM_AGENTS.get(platform)
+    return get_agent(name) if name else None
+
+
+def preload_agents() -> threading.Thread:
+    """
+    Build every agent (importing the ADK) in a background thread.
+
+    Lets an interactive session pay the ADK import while the user is typing
+    instead of on the first request.
+
+    Returns:
+        The started daemon thread
+    """
+    def build_all():
+        for name in AGENT_NAMES:
+            get_agent(name)
+
+    thread = threading.Thread(target=build_all, name="agent-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name: str):
+    if name in _AGENT_MODULES:
+        agent = get_agent(name)
+        globals()[name] = agent
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from .routing import smart_router
-from .content import (
-    x_content_specialist,
-    linkedin_content_specialist,
-    instagram_content_specialist,
-    blog_content_specialist
-)
-from .research import research_agent
-from .quality import quality_synthesizer, quality_checker, content_regenerator
 
 __all__ = [
     "smart_router",
@@ -22,5 +96,11 @@ __all__ = [
     "research_agent",
     "quality_synthesizer",
     "quality_checker",
-    "content_regenerator"
-]
\ No newline at end of file
+    "content_regenerator",
+    "draft_ranker",
+    "AGENT_NAMES",
+    "PLATFORM_AGENTS",
+    "get_agent",
+    "get_platform_agent",
+    "preload_agents"
+]
@@ -201,7 +201,7 @@ Create a blog article that someone would willingly read to the end because they'
 OUTPUT FORMAT:
 [Compelling title that promises genuine value]
 
-[Complete article with natural flow and authentic voice]
+[Complete article with natural flow and authentic voice, its sections under markdown ## subheadings]
 
 WRITE ONLY THE ARTICLE with title.""",
     output_key="blog_content"
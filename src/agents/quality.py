@@ -180,4 +180,29 @@ OUTPUT FORMAT:
 
 Focus on making content sound more natural and human while addressing the specific feedback provided. Don't over-engineer - make targeted improvements that matter.""",
     output_key="regenerated_content"
-)
\ No newline at end of file
+)
+
+draft_ranker = LlmAgent(
+    name="DraftRanker",
+    model=GEMINI_TEXT_MODEL,
+    description="Comparative quality judge that picks the best of several candidate drafts for one platform.",
+    instruction="""You are an expert content quality assessor comparing several candidate drafts written for the same platform and request. Pick the one that would score highest on a full quality review.
+
+COMPARE ON:
+- **Human Authenticity**: Natural voice, no AI-generated patterns or corporate speak
+- **Engagement Potential**: Strong hook, invites real interaction
+- **Practical Value**: Specific, useful, memorable
+- **Platform Optimization**: Length, format and conventions of the platform
+
+Red flags ("Excited to share", "Key takeaways", hashtags, generic messaging) count heavily against a draft.
+
+OUTPUT FORMAT:
+**BEST CANDIDATE**: [candidate number]
+
+**RANKING**: [candidate numbers from best to worst, e.g. 2 > 3 > 1]
+
+**WHY**: [One or two sentences on what makes the best candidate stronger]
+
+Judge only the drafts given. Do not rewrite them.""",
+    output_key="draft_ranking"
+)
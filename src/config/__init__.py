@@ -2,13 +2,22 @@
 Configuration package for Smart Routing Social Media Content Pipeline
 Exports actively used settings and constants.
 """
+import os
 
 from .settings import (
     GOOGLE_API_KEY,
     GEMINI_TEXT_MODEL,
     QUALITY_SCORE_THRESHOLD,
     MAX_QUALITY_ATTEMPTS,
-    RATE_LIMIT_DELAYS,
+    EARLY_STOPPING_CONFIG,
+    RATE_LIMITS,
+    RESILIENCE_CONFIG,
+    CACHE_CONFIG,
+    CONTENT_STORE_CONFIG,
+    SINGLE_FLIGHT_CONFIG,
+    SCHEDULER_CONFIG,
+    TRACING_CONFIG,
+    TOKEN_BUDGET_CONFIG,
     SUPPORTED_PLATFORMS
 )
 
@@ -29,12 +38,27 @@ AGENTIC_PATTERNS = {
     "conditional_execution": {
         "enabled": True,
         "mode": "sequential",  # "sequential" for free tier, "parallel" for paid
+        "max_concurrency": 4,  # Platform specialists running at once in parallel mode
         "description": "Platform-specific content generation based on routing decisions"
     },
     "reflection": {
         "enabled": True,
         "iterations": 1,
         "description": "Quality assessment and iterative improvement"
+    },
+    "speculative_drafting": {
+        "enabled": True,
+        "confidence_levels": ["MEDIUM", "LOW"],  # Router confidence that triggers best-of-N
+        "candidates": 3,       # Drafts generated per platform in one round
+        "compare_top": 3,      # Best locally scored drafts sent to the DraftRanker
+        "description": "Best-of-N drafting ranked locally and by one comparative quality call"
+    },
+    "incremental_regeneration": {
+        "enabled": True,
+        "platforms": ["blog"],          # Long-form platforms revised section by section
+        "min_sections": 3,              # Articles with fewer markdown sections are rewritten whole
+        "max_rewrite_fraction": 0.6,    # Rewritten whole when flagged sections hold more of the words
+        "description": "Regenerate only the sections quality feedback points at, concurrently"
     }
 }
 
@@ -43,7 +67,14 @@ RESEARCH_CONFIG = {
     "enabled": True,
     "search_queries_per_topic": 2,
     "max_sources": 3,
-    "fallback_mode": "strategic_analysis"
+    "fallback_mode": "strategic_analysis",
+    "cache_enabled": True,               # Reuse research per topic across requests
+    "cache_ttl_seconds": 6 * 3600,       # Freshness window before topics are re-researched
+    "cache_directory": ".cache/research",
+    "slicing": {
+        "enabled": True,                 # Send each prompt only the research its platforms use
+        "report": os.getenv("RESEARCH_SLICE_REPORT", "false").lower() == "true"  # Print size reduction per slice
+    }
 }
 
 # Smart routing specific configurations
@@ -57,15 +88,44 @@ ROUTING_CONFIG = {
         "enabled": True,
         "end_conversation": True,
         "message_template": "clarification_request"
+    },
+    "fast_path": {
+        "enabled": True,          # Route explicit requests locally, skipping SmartRouter
+        "min_confidence": 0.9     # Below this the LLM router decides
     }
 }
 
+# Batch processing configuration
+BATCH_CONFIG = {
+    "concurrency": 4,   # Pipelines running at once (they share one rate limiter)
+    "priority": "batch",  # Scheduler priority of batch requests (see SCHEDULER_CONFIG)
+    "resume": True      # Skip request IDs already completed in the output file
+}
+
+# HTTP service configuration
+SERVICE_CONFIG = {
+    "host": "0.0.0.0",
+    "port": 8000,
+    "workers": 4,               # Pipelines processed concurrently
+    "default_priority": "interactive",  # Priority of requests that don't set one
+    "max_queue_size": 32,       # Waiting requests before shedding load with 503
+    "retry_after_seconds": 30   # Retry-After hint before any request has completed
+}
+
 __all__ = [
     'GOOGLE_API_KEY',
     'GEMINI_TEXT_MODEL',
     'QUALITY_SCORE_THRESHOLD',
     'MAX_QUALITY_ATTEMPTS',
-    'RATE_LIMIT_DELAYS',
+    'EARLY_STOPPING_CONFIG',
+    'RATE_LIMITS',
+    'RESILIENCE_CONFIG',
+    'CACHE_CONFIG',
+    'CONTENT_STORE_CONFIG',
+    'SINGLE_FLIGHT_CONFIG',
+    'SCHEDULER_CONFIG',
+    'TRACING_CONFIG',
+    'TOKEN_BUDGET_CONFIG',
     'SUPPORTED_PLATFORMS',
     'APP_NAME',
     'USER_ID',
@@ -73,6 +133,8 @@ __all__ = [
     'AGENTIC_PATTERNS',
     'RESEARCH_CONFIG',
     'ROUTING_CONFIG',
+    'BATCH_CONFIG',
+    'SERVICE_CONFIG',
     'check_environment'
 ]
 
@@ -4,7 +4,7 @@ Checks all required dependencies and configurations.
 """
 import os
 import sys
-from dotenv import load_dotenv
+from importlib.util import find_spec
 
 
 def check_environment() -> bool:
@@ -14,19 +14,17 @@ def check_environment() -> bool:
     Returns:
         bool: True if environment is properly configured, False otherwise
     """
-    # Load environment variables
-    load_dotenv()
+    # Environment variables are loaded once, by src.config.settings (or
+    # below when run as a script)
     
-    # Test required ADK imports
-    try:
-        from google.adk.agents import LlmAgent
-        from google.adk.runners import InMemoryRunner
-        from google.genai import types
-        print(">> Google ADK imported successfully")
-    except ImportError as e:
-        print(f"Error: Failed to import required ADK modules: {e}")
+    # Check required ADK packages are installed without importing them:
+    # importing the ADK takes seconds and happens on the first agent call
+    missing = [name for name in ("google.adk", "google.genai") if find_spec(name) is None]
+    if missing:
+        print(f"Error: Required ADK modules not installed: {', '.join(missing)}")
         print("      Run: pip install google-adk")
         return False
+    print(">> Google ADK installed")
     
     # Check API key
     google_api_key = os.getenv("GOOGLE_API_KEY")
@@ -77,6 +75,9 @@ def print_environment_info():
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     print("Environment Check - Social Media Content Pipeline")
     print("-" * 50)
     
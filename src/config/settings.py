@@ -16,12 +16,122 @@ GEMINI_TEXT_MODEL = os.getenv("GEMINI_TEXT_MODEL", "gemini-2.5-flash")
 QUALITY_SCORE_THRESHOLD = 6.5
 MAX_QUALITY_ATTEMPTS = 3
 
-# Rate Limiting Configuration
-RATE_LIMIT_DELAYS = {
-    "after_routing": 4,        # Seconds after routing decision
-    "after_research": 2,       # Seconds after research
-    "between_platforms": 3,    # Seconds between platform content generation  
-    "cooling_period": 15       # Seconds between user requests
+# Early stopping: stop regenerating a platform that is unlikely to pass
+EARLY_STOPPING_CONFIG = {
+    "enabled": True,
+    "min_gain": 0.5,             # Plateau: last regeneration gained less than this
+    "max_similarity": 0.9,       # Regenerated draft this similar to the previous one
+    "close_enough_margin": 0.3   # Scores this close below the threshold are accepted
+}
+
+# Rate Limiting Configuration (quota per model, shared by every agent call)
+# Calls proceed immediately while budget remains and only wait when a quota
+# would be exceeded. Defaults match the Gemini free tier; raise for paid tiers.
+RATE_LIMITS = {
+    "default": {
+        "requests_per_minute": int(os.getenv("GEMINI_RPM", "10")),
+        "tokens_per_minute": int(os.getenv("GEMINI_TPM", "250000"))
+    }
+}
+
+# Resilience Configuration (every agent call)
+# Per-agent timeouts, retries of transient failures (timeouts, 429, 5xx) with
+# jittered exponential backoff or the server's Retry-After, a duplicate
+# "hedged" attempt for calls slower than usual, and a circuit breaker per
+# model that fails fast while the backend is unhealthy.
+RESILIENCE_CONFIG = {
+    "timeout_seconds": {
+        "default": 60,
+        "ResearchEnhancer": 120,        # Runs Google Search
+        "BlogContentSpecialist": 120    # Longest outputs
+    },
+    "max_retries": 2,                   # Retries after the first attempt
+    "backoff_base_seconds": 1.0,        # Delay drawn from [0, base * 2**retry]
+    "backoff_max_seconds": 20.0,
+    "max_retry_after_seconds": 60.0,    # Longer Retry-After hints fail instead of waiting
+    "hedge_after_seconds": {
+        "default": 30,                  # Start a duplicate attempt when no answer by then
+        "ResearchEnhancer": None,       # None disables hedging for the agent
+        "BlogContentSpecialist": 75
+    },
+    "circuit_breaker": {
+        "failure_threshold": 5,         # Consecutive transient failures that open the circuit
+        "reset_seconds": 30             # Open circuit fails fast this long before a trial call
+    }
+}
+
+# Agent Call Memoization (opt-in)
+# Identical calls (same agent, model, instruction and input) are answered
+# from an in-memory LRU backed by an on-disk store instead of the model.
+CACHE_CONFIG = {
+    "enabled": os.getenv("AGENT_CACHE_ENABLED", "false").lower() == "true",
+    "directory": os.getenv("AGENT_CACHE_DIR", ".cache/agent_calls"),
+    "ttl_seconds": 24 * 3600,          # Entries older than this are ignored and trimmed
+    "max_memory_entries": 512,         # In-memory LRU size
+    "max_disk_bytes": 256 * 1024 * 1024,
+    "agents": {}                       # Per-agent override, e.g. {"QualityChecker": True}
+}
+
+# Single-flight Configuration
+# Concurrent identical requests run the pipeline once and every caller gets
+# the same events and result. Concurrent identical agent calls (same agent,
+# model, instruction and input) can share one model call too; that is off by
+# default because the sharing callers' sessions don't record the turn.
+SINGLE_FLIGHT_CONFIG = {
+    "requests": os.getenv("SINGLE_FLIGHT_REQUESTS", "true").lower() == "true",
+    "agent_calls": os.getenv("SINGLE_FLIGHT_AGENT_CALLS", "false").lower() == "true"
+}
+
+# Scheduler Configuration (multi-tenant)
+# Each request runs for a tenant (user ID) at a priority. Model calls from
+# every in-flight pipeline wait for one of `max_concurrent_calls` slots, which
+# go to the highest priority first and, within a priority, to the tenant that
+# has used the least of its token share recently (tokens / weight).
+SCHEDULER_CONFIG = {
+    "enabled": os.getenv("SCHEDULER_ENABLED", "true").lower() == "true",
+    "max_concurrent_calls": int(os.getenv("SCHEDULER_MAX_CONCURRENT_CALLS", "8")),
+    "priorities": ["interactive", "normal", "batch"],   # Highest first
+    "default_priority": "normal",
+    "usage_half_life_seconds": 60,     # How quickly past token usage stops counting against a tenant
+    "tenant_defaults": {
+        "max_concurrent_requests": int(os.getenv("TENANT_MAX_CONCURRENT_REQUESTS", "4")),
+        "tokens_per_minute": None,     # Hard per-tenant cap; None = weighted share of the model quota only
+        "weight": 1.0                  # Relative token share when tenants compete for call slots
+    },
+    "tenants": {}                      # Per-tenant overrides, e.g. {"acme": {"weight": 2, "max_concurrent_requests": 8}}
+}
+
+# Content Store Configuration
+# Every request's routing decision, research, drafts, quality reports and
+# final content are saved to a local SQLite database (compressed text) in
+# the background. With reuse enabled, platforms that already have approved
+# content for the same topic are served from the store instead of generated.
+CONTENT_STORE_CONFIG = {
+    "enabled": os.getenv("CONTENT_STORE_ENABLED", "true").lower() == "true",
+    "path": os.getenv("CONTENT_STORE_PATH", ".cache/content.db"),
+    "compression_level": 6,            # zlib level for text columns
+    "reuse": {
+        "enabled": os.getenv("CONTENT_REUSE_ENABLED", "false").lower() == "true",
+        "max_age_seconds": 7 * 24 * 3600,   # Older approved content is regenerated
+        "min_score": None                   # None = QUALITY_SCORE_THRESHOLD
+    }
+}
+
+# Tracing Configuration
+# Spans per stage and agent call, aggregated into latency histograms.
+# Set TRACE_SPANS_FILE to also append every span as a JSON line.
+TRACING_CONFIG = {
+    "enabled": True,
+    "spans_file": os.getenv("TRACE_SPANS_FILE") or None,
+    "max_spans": 10000,                # Recent spans kept in memory for summaries
+    "buckets": [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300]
+}
+
+# Token Budget Configuration
+# Regeneration rounds are skipped once a request's tokens so far plus the
+# projected cost of the next round would exceed the budget (0 disables).
+TOKEN_BUDGET_CONFIG = {
+    "max_tokens_per_request": int(os.getenv("REQUEST_TOKEN_BUDGET", "150000"))
 }
 
 # Supported Platforms
@@ -3,10 +3,23 @@ Pipeline orchestration for Smart Routing System
 Manages execution flow and agent coordination
 """
 
-from .smart_routing import create_smart_routed_content
-from .research_enhanced import create_content
+from .smart_routing import create_smart_routed_content, stream_smart_routed_content
+from .events import PipelineEvent
+from .batch import run_batch
+
+
+def __getattr__(name: str):
+    # The research-enhanced showcase builds its own agent set and
+    # SequentialAgent, so it is only imported when asked for
+    if name == "create_content":
+        from .research_enhanced import create_content
+        return create_content
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "create_smart_routed_content",
-    "create_content"
+    "stream_smart_routed_content",
+    "create_content",
+    "run_batch",
+    "PipelineEvent"
 ]
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Batch Pipeline Runner
+Processes a JSONL file of requests through the smart routing pipeline with
+bounded concurrency, streaming results to JSONL and resuming partial runs
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.config import BATCH_CONFIG
+from src.pipelines.events import CLARIFICATION, ERROR, FINAL_CONTENT
+from src.pipelines.smart_routing import stream_smart_routed_content
+
+
+def load_batch_requests(input_path: str) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """
+    Read requests from a JSONL file.
+
+    Each line is an object with a "request" field, an optional "request_id"
+    and an optional "user_id" (the tenant the request runs for); lines
+    without an id are identified by their line number.
+
+    Args:
+        input_path: Path to the input JSONL file
+
+    Yields:
+        Tuples of (request_id, request, user_id or None)
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Warning: Skipping invalid JSON on line {line_number}: {e}")
+                continue
+            if not isinstance(record, dict) or not isinstance(record.get("request", ""), str):
+                print(f"Warning: Skipping line {line_number}: expected an object with a string \"request\"")
+                continue
+            request = record.get("request", "").strip()
+            if not request:
+                print(f"Warning: Skipping line {line_number} without a request")
+                continue
+            request_id = record.get("request_id")
+            if request_id is None:
+                request_id = f"line-{line_number}"
+            yield str(request_id), request, record.get("user_id")
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """
+    Collect request IDs that already finished in a previous run.
+
+    Requests that ended in an error are not counted, so resuming retries them.
+
+    Args:
+        output_path: Path to the output JSONL file
+
+    Returns:
+        Set of completed request IDs
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from an interrupted run
+                continue
+            if record.get("status") != "error":
+                completed.add(record.get("request_id"))
+    return completed
+
+
+async def process_batch_request(request_id: str, request: str,
+                                user_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run one request through the pipeline and build its output record.
+
+    Batch requests run at BATCH_CONFIG["priority"], so the scheduler serves
+    interactive requests sharing the process first.
+
+    Args:
+        request_id: Request identifier
+        request: User content request
+        user_id: Tenant the request runs for (default: USER_ID)
+
+    Returns:
+        JSON-serializable result record
+    """
+    start_time = time.time()
+    record: Dict[str, Any] = {"request_id": request_id, "request": request, "status": "completed"}
+    if user_id:
+        record["user_id"] = user_id
+    final_content = False
+
+    async for event in stream_smart_routed_content(request, user_id=user_id,
+                                                   priority=BATCH_CONFIG["priority"]):
+        if event.type == CLARIFICATION:
+            record["status"] = "clarification_needed"
+        elif event.type == ERROR:
+            record["status"] = "error"
+            record["error"] = event.data["error"]
+        elif event.type == FINAL_CONTENT:
+            final_content = True
+            record["result"] = event.data["result"]
+            record["content"] = event.data["content"]
+            record["scores_history"] = event.data["scores_history"]
+            record["stop_reasons"] = event.data["stop_reasons"]
+            record["failed_platforms"] = event.data["failed_platforms"]
+            record["stage_seconds"] = event.data["stage_seconds"]
+            record["token_usage"] = event.data["token_usage"]
+
+    # A stream that stops short of FINAL_CONTENT produced nothing to keep
+    if not final_content and record["status"] != "error":
+        record["status"] = "error"
+        record["error"] = "Pipeline ended without final content"
+    record["elapsed_seconds"] = round(time.time() - start_time, 2)
+    return record
+
+
+async def run_batch(
+    input_path: str,
+    output_path: str,
+    concurrency: int = BATCH_CONFIG["concurrency"],
+    resume: bool = BATCH_CONFIG["resume"]
+) -> Dict[str, int]:
+    """
+    Process every request in a JSONL file with bounded concurrency.
+
+    Pipelines share the process-wide rate limiter, so concurrency only
+    overlaps work while quota is available. Each result is appended to the
+    output file as soon as its request finishes.
+
+    Args:
+        input_path: Path to the input JSONL file
+        output_path: Path to the output JSONL file (appended to)
+        concurrency: Number of pipelines running at once
+        resume: Skip request IDs already completed in output_path
+
+    Returns:
+        Dict with counts of total, skipped, completed and failed requests
+    """
+    completed_ids = load_completed_ids(output_path) if resume else set()
+    pending: List[Tuple[str, str, Optional[str]]] = []
+    skipped = 0
+    for request_id, request, user_id in load_batch_requests(input_path):
+        if request_id in completed_ids:
+            skipped += 1
+        else:
+            pending.append((request_id, request, user_id))
+
+    summary = {"total": len(pending) + skipped, "skipped": skipped, "completed": 0, "failed": 0}
+    print(f"\n>> BATCH - {len(pending)} requests to process, {skipped} already completed")
+    print(f"   Concurrency: {concurrency}")
+
+    queue: "asyncio.Queue[Tuple[str, str, Optional[str]]]" = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+
+    write_lock = asyncio.Lock()
+    mode = "a" if resume else "w"
+
+    with open(output_path, mode, encoding="utf-8") as output_file:
+        # Terminate a line left half-written by an interrupted run
+        if mode == "a" and output_file.tell() > 0:
+            with open(output_path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    output_file.write("\n")
+
+        async def worker() -> None:
+            while True:
+                try:
+                    request_id, request, user_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    record = await process_batch_request(request_id, request, user_id)
+                except Exception as e:
+                    record = {"request_id": request_id, "request": request,
+                              "status": "error", "error": str(e)}
+
+                async with write_lock:
+                    output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    output_file.flush()
+                    if record["status"] == "error":
+                        summary["failed"] += 1
+                    else:
+                        summary["completed"] += 1
+                    done = summary["completed"] + summary["failed"]
+                    print(f"\n>> BATCH - {done}/{len(pending)} finished "
+                          f"({request_id}: {record['status']})")
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    print(f"\n>> BATCH COMPLETE - {summary['completed']} completed, "
+          f"{summary['failed']} failed, {summary['skipped']} skipped")
+    return summary
@@ -0,0 +1,47 @@
+"""
+Pipeline progress events for Smart Routing System
+Typed events yielded by the streaming pipeline API as each stage completes
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+# Event types, in the order a request normally produces them
+ROUTING_DECISION = "routing_decision"    # data: decision
+CLARIFICATION = "clarification"          # data: message
+RESEARCH_READY = "research_ready"        # data: research
+PARTIAL_TEXT = "partial_text"            # data: agent, text (only when stream_text=True)
+PLATFORM_DRAFT = "platform_draft"        # data: content, attempt
+PLATFORM_FAILED = "platform_failed"      # data: error
+QUALITY_SCORES = "quality_scores"        # data: attempt, scores, reports, approved, stopped, regenerating
+PLATFORM_READY = "platform_ready"        # data: content, scores, stop_reason (final version for the platform)
+FINAL_CONTENT = "final_content"          # data: result, content, scores_history, stop_reasons, failed_platforms
+ERROR = "error"                          # data: error
+
+
+@dataclass
+class PipelineEvent:
+    """A single progress event emitted by the smart routing pipeline."""
+    type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    platform: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+# Callback the pipeline stages use to publish events
+EventCallback = Callable[[PipelineEvent], None]
+
+
+def emit_event(emit: Optional[EventCallback], event_type: str,
+               platform: Optional[str] = None, **data: Any) -> None:
+    """
+    Publish an event if a listener is attached.
+
+    Args:
+        emit: Event callback, or None when nobody is streaming
+        event_type: One of the event type constants in this module
+        platform: Platform the event refers to, if any
+        **data: Event payload
+    """
+    if emit is not None:
+        emit(PipelineEvent(type=event_type, data=data, platform=platform))
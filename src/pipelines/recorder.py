@@ -0,0 +1,69 @@
+"""
+Request recording for Smart Routing System
+Collects a request's pipeline events into a ContentRecord for the content store
+"""
+import uuid
+from typing import Optional
+from src.pipelines.events import (
+    PipelineEvent,
+    EventCallback,
+    ROUTING_DECISION,
+    CLARIFICATION,
+    RESEARCH_READY,
+    PLATFORM_DRAFT,
+    PLATFORM_FAILED,
+    QUALITY_SCORES,
+    PLATFORM_READY,
+    FINAL_CONTENT,
+    ERROR
+)
+from src.utils.content_store import ContentRecord
+
+
+class RequestRecorder:
+    """
+    Event callback that records what a request produced, then forwards the
+    event to the original listener (if any).
+    """
+
+    def __init__(self, request: str, emit: Optional[EventCallback] = None):
+        self.record = ContentRecord(request=request, request_id=uuid.uuid4().hex)
+        self.finished = False
+        self._emit = emit
+
+    def __call__(self, event: PipelineEvent) -> None:
+        self._add(event)
+        if self._emit is not None:
+            self._emit(event)
+
+    def _add(self, event: PipelineEvent) -> None:
+        record, data = self.record, event.data
+        if event.type == ROUTING_DECISION:
+            record.routing = data["decision"]
+        elif event.type == CLARIFICATION:
+            record.status = "clarification"
+        elif event.type == RESEARCH_READY:
+            record.research = data["research"]
+        elif event.type == PLATFORM_DRAFT:
+            record.drafts.append({"platform": event.platform, "attempt": data["attempt"],
+                                  "content": data["content"], "repaired": data.get("repaired", False)})
+        elif event.type == QUALITY_SCORES:
+            reports = data.get("reports", {})
+            record.assessments.extend(
+                {"platform": platform, "attempt": data["attempt"], "score": score,
+                 "report": reports.get(platform)}
+                for platform, score in data["scores"].items()
+            )
+        elif event.type == PLATFORM_READY:
+            record.platforms[event.platform] = {"content": data["content"], "scores": data["scores"],
+                                                "stop_reason": data["stop_reason"]}
+        elif event.type == PLATFORM_FAILED:
+            record.failed_platforms.append(event.platform)
+        elif event.type == ERROR:
+            record.status = "error"
+        elif event.type == FINAL_CONTENT:
+            record.result = data["result"]
+            record.failed_platforms = list(data["failed_platforms"])
+            record.token_usage = data.get("token_usage", {})
+            record.stage_seconds = data.get("stage_seconds", {})
+            self.finished = True
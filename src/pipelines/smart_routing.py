@@ -2,32 +2,88 @@
 Smart Routing Pipeline
 Hybrid approach: LLM routing decisions + Python conditional execution + Quality feedback loop
 """
-import asyncio
+from __future__ import annotations
+
+import time
 import uuid
-from typing import Dict, List, Any, Tuple
-from google.adk.agents import LlmAgent
-from google.adk.runners import InMemoryRunner
-from google.genai import types
-
-from src.agents.routing import smart_router
-from src.agents.content import (
-    x_content_specialist,
-    linkedin_content_specialist,
-    instagram_content_specialist,
-    blog_content_specialist
-)
-from src.agents.research import research_agent
-from src.agents.quality import quality_synthesizer, quality_checker, content_regenerator
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Dict, List, Any, AsyncIterator, Callable, Optional, Tuple
+
+from src import agents
 from src.utils.parsing import parse_routing_decision, build_clarification_message
-from src.utils.runners import run_single_agent
+from src.utils.runners import run_single_agent, run_platform_tasks
+from src.utils.resilience import AgentCallError
+from src.utils.research_cache import get_research_cache
+from src.utils.content_store import get_content_store
+from src.utils.single_flight import SingleFlightStream
+from src.utils.scheduler import RequestContext, get_scheduler
+from src.utils.fast_routing import get_fast_router
+from src.utils.validation import validate_drafts, format_violation_feedback
+from src.utils.repair import repair_draft
+from src.utils.tracing import get_tracer
+from src.utils.token_usage import check_token_budget
+from src.utils.research_slicing import get_research_slicer
+from src.utils.validation import check_platform_constraints
+from src.utils.sections import (
+    plan_section_regeneration,
+    format_section_regeneration_prompt,
+    splice_section,
+    revised_similarity
+)
+from src.utils.speculative import (
+    build_candidate_prompt,
+    shortlist_candidates,
+    format_ranking_prompt,
+    parse_best_candidate
+)
 from src.utils.quality import (
-    parse_quality_score, 
+    parse_quality_report,
+    QualityReport,
     is_score_acceptable, 
     should_retry_generation,
+    early_stop_reason,
+    draft_similarity,
     format_regeneration_prompt,
-    format_final_result_with_attempts
+    format_final_result_with_attempts,
+    STOP_REASONS
+)
+from src.config import (
+    QUALITY_SCORE_THRESHOLD,
+    MAX_QUALITY_ATTEMPTS,
+    EARLY_STOPPING_CONFIG,
+    AGENTIC_PATTERNS,
+    ROUTING_CONFIG,
+    SINGLE_FLIGHT_CONFIG,
+    SESSION_ID
 )
-from src.config import QUALITY_SCORE_THRESHOLD, MAX_QUALITY_ATTEMPTS, RATE_LIMIT_DELAYS
+from src.pipelines.events import (
+    PipelineEvent,
+    EventCallback,
+    emit_event,
+    ROUTING_DECISION,
+    CLARIFICATION,
+    RESEARCH_READY,
+    PARTIAL_TEXT,
+    PLATFORM_DRAFT,
+    PLATFORM_FAILED,
+    QUALITY_SCORES,
+    PLATFORM_READY,
+    FINAL_CONTENT,
+    ERROR
+)
+from src.pipelines.recorder import RequestRecorder
+
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
+
+
+def _partial_text_callback(emit: Optional[EventCallback], stream_text: bool,
+                           agent_name: str,
+                           platform: Optional[str] = None) -> Optional[Callable[[str], None]]:
+    """Build an on_partial callback that republishes model text as events."""
+    if emit is None or not stream_text:
+        return None
+    return lambda text: emit_event(emit, PARTIAL_TEXT, platform, agent=agent_name, text=text)
 
 
 async def regenerate_content_with_feedback(
@@ -37,58 +93,242 @@ async def regenerate_content_with_feedback(
     research_data: str, 
     user_id: str, 
     session_id: str,
-    attempt: int
+    attempt: int,
+    on_partial: Optional[Callable[[str], None]] = None
 ) -> str:
     """
     Regenerate content for a specific platform based on quality feedback.
     
+    Long-form platforms (AGENTIC_PATTERNS["incremental_regeneration"]) rewrite
+    only the sections the feedback points at when it can be mapped onto them;
+    otherwise the whole draft is rewritten.
+    
     Args:
         platform: Platform name (x_twitter, linkedin, instagram, blog)
         original_content: The original content that needs improvement
         quality_feedback: Quality assessment feedback
-        research_data: Research data to include in regeneration
+        research_data: Full research; only the platform's slice is included
         user_id: User identifier
         session_id: Session identifier
         attempt: Current attempt number
+        on_partial: Optional callback receiving streamed model text
         
     Returns:
         Regenerated content for the platform
+        
+    Raises:
+        AgentCallError: The specialist call failed
     """
-    try:
-        # Map platform to specialist (same mapping as original)
-        platform_specialists = {
-            "x_twitter": x_content_specialist,
-            "linkedin": linkedin_content_specialist, 
-            "instagram": instagram_content_specialist,
-            "blog": blog_content_specialist
-        }
+    specialist = agents.get_platform_agent(platform)
+    if not specialist:
+        print(f"Warning: No specialist found for platform {platform}")
+        return original_content
+    
+    # Add the research this platform uses
+    platform_research = get_research_slicer().slice(
+        research_data, [platform], f"{platform} regeneration"
+    )
+    
+    incremental_config = AGENTIC_PATTERNS["incremental_regeneration"]
+    if incremental_config["enabled"] and platform in incremental_config["platforms"]:
+        improved_content = await regenerate_sections(
+            platform, specialist, original_content, quality_feedback, platform_research,
+            user_id, session_id, attempt, incremental_config
+        )
+        if improved_content is not None:
+            return improved_content
+    
+    # Create regeneration prompt
+    regeneration_prompt = format_regeneration_prompt(
+        original_content, quality_feedback, attempt
+    )
+    full_prompt = f"""RESEARCH DATA:
+{platform_research}
+
+{regeneration_prompt}"""
+    
+    # Generate improved content
+    with get_tracer().span("regeneration", platform=platform, attempt=attempt):
+        improved_content = await run_single_agent(
+            specialist, user_id, session_id, full_prompt, on_partial=on_partial
+        )
+    
+    return improved_content
+
+
+async def regenerate_sections(
+    platform: str,
+    specialist: LlmAgent,
+    original_content: str,
+    quality_feedback: str,
+    platform_research: str,
+    user_id: str,
+    session_id: str,
+    attempt: int,
+    config: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Rewrite only the sections of a long-form draft that the feedback is about.
+    
+    The draft is split at its markdown headings and each CONTEXTUAL
+    IMPROVEMENTS item / PRIORITY FIX is mapped onto sections. The targeted
+    sections are regenerated concurrently, each in its own session, and
+    spliced back between the untouched ones.
+    
+    Args:
+        platform: Platform name
+        specialist: The platform's content specialist
+        original_content: Draft that failed assessment
+        quality_feedback: Quality assessment feedback
+        platform_research: Research slice for the platform
+        user_id: User identifier
+        session_id: Session identifier
+        attempt: Current attempt number
+        config: AGENTIC_PATTERNS["incremental_regeneration"]
         
-        specialist = platform_specialists.get(platform)
-        if not specialist:
-            print(f"Warning: No specialist found for platform {platform}")
-            return original_content
+    Returns:
+        The revised draft, or None when it should be rewritten whole (too
+        few sections, feedback that maps onto no section or onto most of the
+        draft, or a draft that breaks platform rules such as length)
         
-        # Create regeneration prompt
-        regeneration_prompt = format_regeneration_prompt(
-            original_content, quality_feedback, attempt
+    Raises:
+        AgentCallError: Every section call failed
+    """
+    if check_platform_constraints(platform, original_content):
+        return None
+    plan = plan_section_regeneration(
+        original_content, parse_quality_report(quality_feedback),
+        config["min_sections"], config["max_rewrite_fraction"]
+    )
+    if plan is None:
+        return None
+    sections, targeted, general = plan
+    
+    print(f"   ✂️ {platform}: regenerating {len(targeted)} of {len(sections)} sections")
+    execution_config = AGENTIC_PATTERNS["conditional_execution"]
+    with get_tracer().span("regeneration", platform=platform, attempt=attempt, sections=len(targeted)):
+        # Section-scoped sessions so sections run concurrently and don't see each other
+        outcomes = await run_platform_tasks(
+            [str(index) for index in sorted(targeted)],
+            lambda index: run_single_agent(
+                specialist, user_id, f"{session_id}:{platform}:section{index}",
+                f"RESEARCH DATA:\n{platform_research}\n\n" + format_section_regeneration_prompt(
+                    sections, int(index), targeted[int(index)], general, attempt
+                )
+            ),
+            mode="parallel",
+            max_concurrency=execution_config.get("max_concurrency", 4)
         )
-        
-        # Add research data context
-        full_prompt = f"""RESEARCH DATA:
-{research_data}
+    
+    failures = [outcome for outcome in outcomes.values() if isinstance(outcome, Exception)]
+    if len(failures) == len(outcomes):
+        raise failures[0]
+    for index, outcome in outcomes.items():
+        if isinstance(outcome, Exception):
+            print(f"   ! {platform}: section {int(index) + 1} kept as is ({outcome})")
+    
+    return "".join(
+        splice_section(section, outcomes[str(index)])
+        if isinstance(outcomes.get(str(index)), str) else section.text
+        for index, section in enumerate(sections)
+    )
 
-{regeneration_prompt}"""
+
+async def assess_platform_quality(
+    platform: str,
+    content: str,
+    user_id: str,
+    session_id: str
+) -> QualityReport:
+    """
+    Score a single platform's content with the quality checker.
+    
+    Args:
+        platform: Platform name (x_twitter, linkedin, instagram, blog)
+        content: Content to assess
+        user_id: User identifier
+        session_id: Session identifier
         
-        # Generate improved content
-        improved_content = await run_single_agent(
-            specialist, user_id, session_id, full_prompt
+    Returns:
+        Parsed QualityReport (the full report text is in report.text)
+    """
+    content_package = f"GENERATED CONTENT FOR ASSESSMENT:\n\n**{platform.upper()}:**\n{content}\n"
+    
+    # Platform-scoped session ID tells concurrent assessments apart
+    with get_tracer().span("assessment", platform=platform):
+        quality_result = await run_single_agent(
+            agents.quality_checker, user_id, f"{session_id}:{platform}", content_package
         )
+    
+    return parse_quality_report(quality_result)
+
+
+async def generate_best_of_n(
+    platform: str,
+    specialist: LlmAgent,
+    prompt: str,
+    user_id: str,
+    session_id: str,
+    config: Dict[str, Any]
+) -> str:
+    """
+    Generate several candidate drafts for a platform in one round and keep the best.
+    
+    Candidates are generated concurrently (the shared rate limiter still
+    applies), scored locally, and the best `compare_top` are compared in a
+    single DraftRanker call. The local ranking decides when only one
+    candidate is viable or the ranker's answer can't be parsed.
+    
+    Args:
+        platform: Platform name (x_twitter, linkedin, instagram, blog)
+        specialist: The platform's content specialist
+        prompt: Generation prompt
+        user_id: User identifier
+        session_id: Session identifier
+        config: AGENTIC_PATTERNS["speculative_drafting"]
         
-        return improved_content
+    Returns:
+        The selected draft
+    """
+    total = max(1, config["candidates"])
+    execution_config = AGENTIC_PATTERNS["conditional_execution"]
+    
+    with get_tracer().span("speculative_drafting", platform=platform, candidates=total):
+        # Candidate-scoped sessions so drafts run concurrently and don't see each other
+        outcomes = await run_platform_tasks(
+            [str(candidate) for candidate in range(1, total + 1)],
+            lambda candidate: run_single_agent(
+                specialist, user_id, f"{session_id}:{platform}:candidate{candidate}",
+                build_candidate_prompt(prompt, int(candidate), total)
+            ),
+            mode="parallel",
+            max_concurrency=execution_config.get("max_concurrency", 4)
+        )
+        candidates = [outcome for outcome in outcomes.values() if isinstance(outcome, str)]
+        if not candidates:
+            raise RuntimeError(f"No candidate drafts generated for {platform}")
         
-    except Exception as e:
-        print(f"Error regenerating content for {platform}: {e}")
-        return original_content
+        shortlist = shortlist_candidates(platform, candidates, config["compare_top"])
+        best = 0
+        if len(shortlist) > 1:
+            try:
+                ranking = await run_single_agent(
+                    agents.draft_ranker, user_id, f"{session_id}:{platform}",
+                    format_ranking_prompt(platform, shortlist)
+                )
+                choice = parse_best_candidate(ranking, len(shortlist))
+            except AgentCallError as e:
+                print(f"   ! {platform}: DraftRanker failed ({e})")
+                choice = None
+            if choice is None:
+                print(f"   ! {platform}: no DraftRanker choice, using local ranking")
+            else:
+                best = choice
+    
+    index, draft, local_score = shortlist[best]
+    print(f"   🎯 {platform}: candidate {index + 1}/{len(candidates)} selected "
+          f"(local score {local_score:.1f}, {len(shortlist)} compared)")
+    return draft
 
 
 async def quality_feedback_loop(
@@ -97,10 +337,28 @@ async def quality_feedback_loop(
     user_id: str, 
     session_id: str,
     max_attempts: int = MAX_QUALITY_ATTEMPTS,
-    score_threshold: float = QUALITY_SCORE_THRESHOLD
-) -> Tuple[Dict[str, str], List[float], int]:
+    score_threshold: float = QUALITY_SCORE_THRESHOLD,
+    emit: Optional[EventCallback] = None,
+    stream_text: bool = False
+) -> Tuple[Dict[str, str], Dict[str, List[float]], int, Dict[str, str]]:
     """
-    Quality feedback loop that regenerates content until acceptable or max attempts reached.
+    Quality feedback loop that scores each platform separately and regenerates
+    only the platforms below threshold, until all pass or max attempts reached.
+    
+    Platforms that pass are carried forward untouched and are not re-scored.
+    Drafts that break mechanical platform rules (length, hashtags, red-flag
+    phrases) are repaired locally when possible; otherwise they fail with a
+    score of 0 and go straight to regeneration without a quality checker call.
+    
+    Before each regeneration round the request's token usage so far plus the
+    projected cost of the round is checked against TOKEN_BUDGET_CONFIG; when
+    it would exceed the budget the current drafts are kept.
+    
+    Platforms unlikely to pass stop early (EARLY_STOPPING_CONFIG): a score
+    just below the threshold is accepted as close enough, a regeneration
+    that gained less than min_gain ends the platform's attempts, and a
+    regenerated draft nearly identical to the previous one is discarded
+    without re-assessment.
     
     Args:
         generated_content: Dict of platform -> content
@@ -109,80 +367,310 @@ async def quality_feedback_loop(
         session_id: Session identifier
         max_attempts: Maximum regeneration attempts (from settings)
         score_threshold: Minimum acceptable quality score (from settings)
+        emit: Optional callback receiving progress events
+        stream_text: Whether to publish partial model text while regenerating
         
     Returns:
-        Tuple of (final_content_dict, scores_history, attempts_made)
+        Tuple of (final_content_dict, platform -> scores_history, attempts_made,
+        platform -> stop reason (a STOP_REASONS key))
     """
     current_content = generated_content.copy()
-    scores_history = []
+    scores_history = {platform: [] for platform in current_content}
+    stop_reasons: Dict[str, str] = {}
+    pending_platforms = list(current_content)
+    execution_config = AGENTIC_PATTERNS["conditional_execution"]
+    tracer = get_tracer()
     attempt = 1
     
-    while attempt <= max_attempts:
-        print(f"\n>> QUALITY ASSESSMENT - Attempt {attempt}/{max_attempts}")
-        
-        # Format content for quality assessment
-        content_package = "GENERATED CONTENT FOR ASSESSMENT:\n"
-        for platform, content in current_content.items():
-            content_package += f"\n**{platform.upper()}:**\n{content}\n"
-        
-        # Assess quality
-        quality_result = await run_single_agent(
-            quality_checker, user_id, session_id, content_package
-        )
-        
-        # Parse score
-        score = parse_quality_score(quality_result)
-        scores_history.append(score)
-        
-        print(f"   Quality Score: {score:.1f}/10")
-        
-        # Check if acceptable or max attempts reached
-        if is_score_acceptable(score, score_threshold):
-            print(f"   ✅ Content approved! Score {score:.1f} meets threshold {score_threshold}")
-            break
+    def finish(platform: str, reason: str) -> None:
+        stop_reasons[platform] = reason
+        emit_event(emit, PLATFORM_READY, platform, content=current_content[platform],
+                   scores=scores_history[platform], stop_reason=reason)
+    
+    while True:
+        with tracer.span("quality_attempt", attempt=attempt, platforms=len(pending_platforms)):
+            print(f"\n>> QUALITY ASSESSMENT - Attempt {attempt}/{max_attempts}")
+            print(f"   Assessing: {', '.join(pending_platforms)}")
+        
+            failing_feedback = {}
+            attempt_scores = {}
+            attempt_reports = {}
+        
+            # Obvious failures don't need an LLM to tell us so
+            violations = validate_drafts({p: current_content[p] for p in pending_platforms})
+            for platform, platform_violations in violations.items():
+                if not platform_violations:
+                    continue
             
-        if attempt >= max_attempts:
-            print(f"   ⚠️ Max attempts reached. Final score: {score:.1f}")
-            break
+                repaired = repair_draft(platform, current_content[platform], platform_violations)
+                if repaired is not None:
+                    print(f"   🔧 {platform}: repaired locally "
+                          f"({', '.join(v.rule for v in platform_violations)})")
+                    current_content[platform] = repaired
+                    emit_event(emit, PLATFORM_DRAFT, platform, content=repaired,
+                               attempt=attempt, repaired=True)
+                else:
+                    print(f"   ✗ {platform}: fails local checks "
+                          f"({', '.join(v.rule for v in platform_violations)}) - skipping quality check")
+                    scores_history[platform].append(0.0)
+                    attempt_scores[platform] = 0.0
+                    failing_feedback[platform] = format_violation_feedback(platform, platform_violations)
+                    attempt_reports[platform] = failing_feedback[platform]
+        
+            # Assess each remaining platform separately
+            assessments = await run_platform_tasks(
+                [p for p in pending_platforms if p not in failing_feedback],
+                lambda platform: assess_platform_quality(
+                    platform, current_content[platform], user_id, session_id
+                ),
+                mode=execution_config.get("mode", "sequential"),
+                max_concurrency=execution_config.get("max_concurrency", 4)
+            )
+        
+            for platform, outcome in assessments.items():
+                if isinstance(outcome, Exception):
+                    print(f"   ! Quality assessment failed for {platform}: {outcome}")
+                    finish(platform, "assessment_failed")
+                    continue
             
-        # Regenerate content for next attempt
-        print(f"   🔄 Score {score:.1f} below threshold {score_threshold}. Regenerating content...")
-        
-        # Add delay between attempts
-        await asyncio.sleep(2)
-        
-        improved_content = {}
-        for platform, content in current_content.items():
-            try:
-                improved = await regenerate_content_with_feedback(
-                    platform, content, quality_result, research_data, 
-                    user_id, session_id, attempt
+                score = outcome.overall_score
+                scores_history[platform].append(score)
+                attempt_scores[platform] = score
+                attempt_reports[platform] = outcome.text
+            
+                if is_score_acceptable(score, score_threshold):
+                    print(f"   ✅ {platform}: {score:.1f}/10 approved (threshold {score_threshold})")
+                    finish(platform, "approved")
+                else:
+                    print(f"   🔄 {platform}: {score:.1f}/10 below threshold {score_threshold}")
+                    failing_feedback[platform] = outcome.text
+        
+            # Stop platforms that another round is unlikely to get over the threshold
+            stopped_early = {}
+            if attempt < max_attempts:
+                for platform in list(failing_feedback):
+                    reason = early_stop_reason(scores_history[platform], score_threshold)
+                    if reason:
+                        print(f"   ⏹️ {platform}: {scores_history[platform][-1]:.1f}/10, "
+                              f"stopping early ({STOP_REASONS[reason]})")
+                        del failing_feedback[platform]
+                        stopped_early[platform] = reason
+                        finish(platform, reason)
+        
+            budget_check = None
+            if failing_feedback and attempt < max_attempts:
+                budget_check = check_token_budget(
+                    tracer.request_usage(), list(failing_feedback), attempt
                 )
-                improved_content[platform] = improved
-                await asyncio.sleep(1)  # Rate limiting between platforms
+            over_budget = budget_check is not None and not budget_check["allowed"]
+            final_attempt = not failing_feedback or attempt >= max_attempts or over_budget
+            emit_event(
+                emit, QUALITY_SCORES, attempt=attempt, scores=attempt_scores, reports=attempt_reports,
+                approved=[p for p in attempt_scores
+                          if p not in failing_feedback and p not in stopped_early],
+                stopped=stopped_early,
+                regenerating=[] if final_attempt else list(failing_feedback)
+            )
+        
+            # Check if all acceptable or max attempts reached
+            if not failing_feedback:
+                print("   ✅ All platforms approved!" if not stopped_early
+                      else "   ✅ No platforms left to regenerate")
+                break
+            
+            if attempt >= max_attempts:
+                print(f"   ⚠️ Max attempts reached. Under threshold: {', '.join(failing_feedback)}")
+                for platform in failing_feedback:
+                    finish(platform, "max_attempts")
+                break
+            
+            if over_budget:
+                print(f"   💸 Token budget: {budget_check['used']:,} used + "
+                      f"~{budget_check['projected']:,} projected exceeds {budget_check['budget']:,}. "
+                      f"Keeping current drafts: {', '.join(failing_feedback)}")
+                for platform in failing_feedback:
+                    finish(platform, "token_budget")
+                break
+            
+            # Regenerate only the platforms that failed
+            print(f"   Regenerating: {', '.join(failing_feedback)}")
+        
+            regenerated = await run_platform_tasks(
+                list(failing_feedback),
+                lambda platform: regenerate_content_with_feedback(
+                    platform, current_content[platform], failing_feedback[platform],
+                    research_data, user_id, session_id, attempt,
+                    on_partial=_partial_text_callback(emit, stream_text, "regeneration", platform)
+                ),
+                mode=execution_config.get("mode", "sequential"),
+                max_concurrency=execution_config.get("max_concurrency", 4)
+            )
+        
+            pending_platforms = list(failing_feedback)
+            for platform, outcome in regenerated.items():
+                if isinstance(outcome, Exception):
+                    # Re-assessing the unchanged draft would only repeat its score
+                    print(f"   Error improving {platform} content: {outcome}")
+                    pending_platforms.remove(platform)
+                    finish(platform, "regeneration_failed")
+                    continue
                 
-            except Exception as e:
-                print(f"   Error improving {platform} content: {e}")
-                improved_content[platform] = content  # Keep original on error
+                # A near-copy would score the same; keep the version already assessed.
+                # Section-level revisions are compared on the sections they changed
+                incremental_config = AGENTIC_PATTERNS["incremental_regeneration"]
+                if incremental_config["enabled"] and platform in incremental_config["platforms"]:
+                    similarity = revised_similarity(current_content[platform], outcome)
+                else:
+                    similarity = draft_similarity(current_content[platform], outcome)
+                if EARLY_STOPPING_CONFIG["enabled"] and \
+                        similarity >= EARLY_STOPPING_CONFIG["max_similarity"]:
+                    print(f"   ⏹️ {platform}: regenerated draft {similarity:.0%} similar to the "
+                          f"previous one, keeping the assessed version")
+                    pending_platforms.remove(platform)
+                    finish(platform, "similar_draft")
+                    continue
+                
+                current_content[platform] = outcome
+                emit_event(emit, PLATFORM_DRAFT, platform, content=outcome, attempt=attempt + 1)
         
-        current_content = improved_content
-        attempt += 1
+            if not pending_platforms:
+                break
+            attempt += 1
     
-    return current_content, scores_history, attempt - 1
+    return current_content, scores_history, attempt, stop_reasons
+
+
+# Concurrent identical requests share one pipeline run
+_request_flights = SingleFlightStream("request")
 
 
-async def create_smart_routed_content(request: str) -> str:
+def _request_key(request: str, stream_text: bool,
+                 context: RequestContext) -> Tuple[str, bool, RequestContext]:
+    """Requests for the same tenant and priority that differ only in whitespace are the same work."""
+    return " ".join(request.split()), stream_text, context
+
+
+async def create_smart_routed_content(request: str, user_id: Optional[str] = None,
+                                      priority: Optional[str] = None) -> str:
     """
     Main smart routing pipeline with conditional execution and quality feedback loop.
     
+    Returns the fully formatted result once every stage has finished; use
+    stream_smart_routed_content to receive progress events as they happen.
+    Concurrent identical requests run the pipeline once and all receive its
+    result (SINGLE_FLIGHT_CONFIG["requests"]).
+    
+    Args:
+        request: User content request
+        user_id: Tenant the request runs for (default: USER_ID)
+        priority: Scheduling priority, e.g. "interactive" or "batch" (see SCHEDULER_CONFIG)
+    
+    Raises:
+        ValueError: If the priority is unknown
+    """
+    if not SINGLE_FLIGHT_CONFIG["requests"]:
+        return await _run_smart_routing(request, get_scheduler().context(user_id, priority))
+    
+    result = ""
+    async for event in stream_smart_routed_content(request, user_id=user_id, priority=priority):
+        if event.type == FINAL_CONTENT:
+            result = event.data["result"]
+    return result
+
+
+async def stream_smart_routed_content(request: str, stream_text: bool = False,
+                                      user_id: Optional[str] = None,
+                                      priority: Optional[str] = None) -> AsyncIterator[PipelineEvent]:
+    """
+    Streaming variant of the smart routing pipeline.
+    
+    Yields typed PipelineEvents as each stage completes: the routing decision,
+    research, each platform draft, per-attempt quality scores, each platform's
+    final content as soon as it is accepted, and finally FINAL_CONTENT with
+    the same formatted result create_smart_routed_content returns.
+    
+    A request identical to one already running for the same tenant and
+    priority subscribes to that run instead of starting another: it receives
+    every event from the start and the same result. The run is cancelled
+    once all its consumers stop early.
+    
+    Args:
+        request: User content request
+        stream_text: Also yield PARTIAL_TEXT events with model text as it streams
+        user_id: Tenant the request runs for (default: USER_ID)
+        priority: Scheduling priority, e.g. "interactive" or "batch" (see SCHEDULER_CONFIG)
+    
+    Raises:
+        ValueError: If the priority is unknown
+    """
+    context = get_scheduler().context(user_id, priority)
+    key = _request_key(request, stream_text, context) if SINGLE_FLIGHT_CONFIG["requests"] else object()
+    async with aclosing(_request_flights.stream(
+        key, lambda emit: _run_smart_routing(request, context, emit, stream_text)
+    )) as events:
+        async for event in events:
+            yield event
+
+
+async def _run_smart_routing(request: str, context: RequestContext,
+                             emit: Optional[EventCallback] = None, stream_text: bool = False) -> str:
+    """
+    Run the pipeline for one request inside its own trace, once the
+    scheduler admits it for its tenant.
+    
+    Requests that finish are saved to the content store in the background.
+    """
+    tracer = get_tracer()
+    content_store = get_content_store()
+    recorder = RequestRecorder(request, emit) if content_store.enabled else None
+    try:
+        async with get_scheduler().request(context):
+            with tracer.span("request", user_id=context.user_id, priority=context.priority):
+                return await _run_pipeline_stages(request, context.user_id, recorder or emit, stream_text)
+    finally:
+        await tracer.flush()
+        if recorder is not None and recorder.finished:
+            content_store.save_in_background(recorder.record)
+
+
+def _stage_seconds() -> Dict[str, float]:
+    """Per-stage timings recorded so far for the current request."""
+    tracer = get_tracer()
+    trace_id = tracer.current_trace_id()
+    return tracer.stage_summary(trace_id) if trace_id else {}
+
+
+def _token_usage() -> Dict[str, Any]:
+    """Token usage recorded so far for the current request."""
+    tracer = get_tracer()
+    trace_id = tracer.current_trace_id()
+    return tracer.token_summary(trace_id) if trace_id else {}
+
+
+async def _run_pipeline_stages(request: str, user_id: str, emit: Optional[EventCallback] = None,
+                               stream_text: bool = False) -> str:
+    """
+    Run the smart routing pipeline, publishing progress events to `emit`.
+    
     Steps:
-    1. Smart routing decision (1 API call)
-    2. Parse decision and check for clarification needs
+    1. Smart routing decision (local fast path, or 1 API call)
+    2. Parse decision and check for clarification needs; with content reuse
+       enabled, platforms with approved content for the same topic are
+       served from the content store and skip the remaining steps
     3. Research enhancement for selected platforms (1 API call) 
-    4. Conditional content generation (N API calls based on selection)
+    4. Conditional content generation (N API calls based on selection; best-of-N
+       candidates plus one ranking call per platform on MEDIUM/LOW confidence)
     5. Quality feedback loop with regeneration (up to MAX_QUALITY_ATTEMPTS iterations)
     6. Final synthesis with quality assessment (1 API call)
+    
+    Each stage is traced; FINAL_CONTENT carries the per-stage timings and
+    token usage.
+    Agent sessions belong to `user_id` and are namespaced under SESSION_ID;
+    each agent call runs in a session of its own, deleted when the call ends.
     """
+    tracer = get_tracer()
+    session_id = f"{SESSION_ID}-{uuid.uuid4()}"
+    
     try:
         print(f"\n>> Processing Request: {request}")
         print("   Smart Routing Pipeline Active")
@@ -192,20 +680,25 @@ async def create_smart_routed_content(request: str) -> str:
         # Step 1: Smart Routing Decision
         print("\n>> SMART ROUTING - Analyzing request and selecting platforms")
         
-        user_id = "content_creator"
-        session_id = str(uuid.uuid4())
+        # Explicit requests are routed locally; the LLM router handles the rest
+        with tracer.span("routing"):
+            routing_decision = None
+            fast_router = get_fast_router()
+            if ROUTING_CONFIG["fast_path"]["enabled"]:
+                routing_decision = fast_router.route(request)
         
-        routing_result = await run_single_agent(
-            smart_router, user_id, session_id, request
-        )
-        
-        # Rate limiting after routing
-        await asyncio.sleep(RATE_LIMIT_DELAYS["after_routing"])
+            if routing_decision:
+                print("   Fast-path routing: explicit platforms detected, SmartRouter skipped")
+            else:
+                routing_result = await run_single_agent(
+                    agents.smart_router, user_id, session_id, request
+                )
         
-        # Step 2: Parse Routing Decision
-        print(">> DECISION PARSING - Processing platform selection")
+            # Step 2: Parse Routing Decision
+            print(">> DECISION PARSING - Processing platform selection")
         
-        routing_decision = parse_routing_decision(routing_result)
+            if not routing_decision:
+                routing_decision = parse_routing_decision(routing_result)
         selected_platforms = routing_decision.get("selected_platforms", [])
         confidence = routing_decision.get("confidence", "LOW")
         clarification_needed = routing_decision.get("clarification_needed", False)
@@ -213,113 +706,216 @@ async def create_smart_routed_content(request: str) -> str:
         
         print(f"   Selected Platforms: {selected_platforms}")
         print(f"   Confidence: {confidence}")
+        print(f"   Fast-Path Rate: {fast_router.fast_path_rate():.0%} "
+              f"({fast_router.stats['fast_path']} fast / {fast_router.stats['llm_fallback']} LLM)")
+        emit_event(emit, ROUTING_DECISION, decision=routing_decision)
         
         # Handle clarification needs
         if clarification_needed or not selected_platforms:
             print("   ⚠️ Clarification needed or no platforms selected")
-            return build_clarification_message()
+            clarification_message = build_clarification_message()
+            emit_event(emit, CLARIFICATION, message=clarification_message)
+            emit_event(emit, FINAL_CONTENT, result=clarification_message, content={},
+                       scores_history={}, stop_reasons={}, failed_platforms=[],
+                       stage_seconds=_stage_seconds(), token_usage=_token_usage())
+            return clarification_message
+        
+        # Platforms already approved for an equivalent request are reused as-is
+        reused = {}
+        content_store = get_content_store()
+        if content_store.reuse_enabled:
+            try:
+                reused = await content_store.find_approved(content_focus, selected_platforms)
+            except Exception as e:
+                print(f"   ! Content store lookup failed ({e}); generating every platform")
+            for platform, stored in reused.items():
+                print(f"   ♻️ {platform}: reusing approved content ({stored.score:.1f}/10, "
+                      f"{(time.time() - stored.created_at) / 3600:.0f}h old)")
+                emit_event(emit, PLATFORM_READY, platform, content=stored.content,
+                           scores=[stored.score], stop_reason="reused")
+            content_store.stats["reused"] += len(reused)
+        platforms_to_generate = [p for p in selected_platforms
+                                 if p in agents.PLATFORM_AGENTS and p not in reused]
         
         # Step 3: Research Enhancement
         print("\n>> RESEARCH ENHANCEMENT - Gathering current information")
         
-        research_prompt = f"""Research current trends and information for: {request}
+        with tracer.span("research"):
+            research_cache = get_research_cache()
+            try:
+                if not platforms_to_generate:
+                    # Every platform is reused; research only feeds the final package
+                    research_data = next((s.research for s in reused.values() if s.research), "")
+                elif research_cache.enabled:
+                    # Topic-scoped research shared across requests and platform selections
+                    research_data, from_cache = await research_cache.get_or_research(
+                        content_focus,
+                        lambda prompt: run_single_agent(agents.research_agent, user_id, session_id, prompt)
+                    )
+                    if from_cache:
+                        print(f"   Reusing fresh research for topic: {content_focus}")
+                else:
+                    research_prompt = f"""Research current trends and information for: {request}
         
         Target platforms: {', '.join(selected_platforms)}
         Content focus: {content_focus}
         
         Provide relevant, current data that would enhance content creation for these platforms."""
-        
-        research_data = await run_single_agent(
-            research_agent, user_id, session_id, research_prompt
-        )
-        
-        await asyncio.sleep(RATE_LIMIT_DELAYS["after_research"])
+            
+                    research_data = await run_single_agent(
+                        agents.research_agent, user_id, session_id, research_prompt
+                    )
+            except AgentCallError as e:
+                # Content can still be written without fresh research
+                print(f"   ! Research unavailable ({e}); continuing without it")
+                research_data = "No current research available. Rely on well-established knowledge of the topic."
+        emit_event(emit, RESEARCH_READY, research=research_data)
         
         # Step 4: Conditional Content Generation
         print("\n>> CONTENT GENERATION - Creating platform-specific content")
         
-        # Map platforms to specialists
+        # Low-confidence routes draft several candidates per platform up front
+        speculative_config = AGENTIC_PATTERNS["speculative_drafting"]
+        speculative = speculative_config["enabled"] and \
+            str(confidence).upper() in speculative_config["confidence_levels"]
+        if speculative:
+            print(f"   Speculative drafting: best of {speculative_config['candidates']} per platform "
+                  f"({confidence} confidence)")
+        
+        # Map platforms to specialists (built on first use)
         platform_specialists = {
-            "x_twitter": x_content_specialist,
-            "linkedin": linkedin_content_specialist,
-            "instagram": instagram_content_specialist,
-            "blog": blog_content_specialist
+            platform: agents.get_platform_agent(platform) for platform in platforms_to_generate
         }
         
         generated_content = {}
-        failed_platforms = []
+        failed_platforms = [p for p in selected_platforms if p not in agents.PLATFORM_AGENTS]
+        for platform in failed_platforms:
+            print(f"   ! Unknown platform: {platform}")
+            emit_event(emit, PLATFORM_FAILED, platform, error="Unknown platform")
         
-        for platform in selected_platforms:
-            if platform in platform_specialists:
-                try:
-                    print(f"   → Generating {platform} content")
-                    
-                    # Create enhanced prompt with research
-                    enhanced_prompt = f"""RESEARCH DATA:
-{research_data}
+        async def generate_for_platform(platform: str) -> str:
+            print(f"   → Generating {platform} content")
+            
+            # Create enhanced prompt with the research this platform uses
+            platform_research = get_research_slicer().slice(
+                research_data, [platform], f"{platform} generation"
+            )
+            enhanced_prompt = f"""RESEARCH DATA:
+{platform_research}
 
 ORIGINAL REQUEST: {request}
 
 Create {platform} content that incorporates the research insights naturally while maintaining platform best practices and authentic voice."""
-                    
+            
+            with tracer.span("platform_generation", platform=platform):
+                if speculative:
+                    content = await generate_best_of_n(
+                        platform, platform_specialists[platform], enhanced_prompt,
+                        user_id, session_id, speculative_config
+                    )
+                else:
                     content = await run_single_agent(
-                        platform_specialists[platform], user_id, session_id, enhanced_prompt
+                        platform_specialists[platform], user_id, session_id, enhanced_prompt,
+                        on_partial=_partial_text_callback(
+                            emit, stream_text, platform_specialists[platform].name, platform
+                        )
                     )
-                    generated_content[platform] = content
-                    
-                    await asyncio.sleep(RATE_LIMIT_DELAYS["between_platforms"])
-                    
-                except Exception as e:
-                    print(f"   ! Failed to generate {platform} content: {e}")
-                    failed_platforms.append(platform)
-            else:
-                print(f"   ! Unknown platform: {platform}")
+            # Published as soon as this platform finishes, even in parallel mode
+            emit_event(emit, PLATFORM_DRAFT, platform, content=content, attempt=1)
+            return content
+        
+        # Sequential for free tier, bounded concurrent fan-out for paid tier
+        execution_config = AGENTIC_PATTERNS["conditional_execution"]
+        execution_mode = execution_config.get("mode", "sequential")
+        print(f"   Execution Mode: {execution_mode}")
+        
+        with tracer.span("generation"):
+            generation_results = await run_platform_tasks(
+                [p for p in selected_platforms if p in platform_specialists],
+                generate_for_platform,
+                mode=execution_mode,
+                max_concurrency=execution_config.get("max_concurrency", 4)
+            )
+        
+        for platform, outcome in generation_results.items():
+            if isinstance(outcome, Exception):
+                print(f"   ! Failed to generate {platform} content: {outcome}")
                 failed_platforms.append(platform)
+                emit_event(emit, PLATFORM_FAILED, platform, error=str(outcome))
+            else:
+                generated_content[platform] = outcome
         
-        if not generated_content:
-            return "Error: Could not generate content for any selected platforms."
+        if not generated_content and not reused:
+            error_msg = "Error: Could not generate content for any selected platforms."
+            emit_event(emit, ERROR, error=error_msg)
+            emit_event(emit, FINAL_CONTENT, result=error_msg, content={},
+                       scores_history={}, stop_reasons={}, failed_platforms=failed_platforms,
+                       stage_seconds=_stage_seconds(), token_usage=_token_usage())
+            return error_msg
         
         # Step 5: Quality Feedback Loop
         print("\n>> QUALITY FEEDBACK LOOP - Iterative improvement")
         
-        final_content, scores_history, attempts_made = await quality_feedback_loop(
-            generated_content, research_data, user_id, session_id
-        )
+        with tracer.span("quality_loop"):
+            if generated_content:
+                final_content, scores_history, attempts_made, stop_reasons = await quality_feedback_loop(
+                    generated_content, research_data, user_id, session_id,
+                    emit=emit, stream_text=stream_text
+                )
+            else:
+                final_content, scores_history, attempts_made, stop_reasons = {}, {}, 0, {}
+        
+        # Reused platforms join the final content in the order they were selected
+        if reused:
+            for platform, stored in reused.items():
+                final_content[platform] = stored.content
+                scores_history[platform] = [stored.score]
+                stop_reasons[platform] = "reused"
+            final_content = {p: final_content[p] for p in selected_platforms if p in final_content}
         
         # Step 6: Final Synthesis
         print("\n>> FINAL SYNTHESIS - Packaging optimized content")
         
-        # Format content for synthesis
-        content_package = f"""
+        with tracer.span("synthesis"):
+            # Format content for synthesis
+            content_package = f"""
 ROUTING DECISION:
 - Selected Platforms: {selected_platforms}
 - Confidence: {confidence}
 - Content Focus: {content_focus}
 
 RESEARCH INSIGHTS:
-{research_data}
+{get_research_slicer().slice(research_data, list(final_content), "final package")}
 
 QUALITY-OPTIMIZED CONTENT:
 """
-        for platform, content in final_content.items():
-            content_package += f"\n**{platform.upper()}:**\n{content}\n"
-        
-        if failed_platforms:
-            content_package += f"\n**FAILED PLATFORMS:** {', '.join(failed_platforms)}\n"
-        
-        # Use enhanced final result formatting with quality tracking
-        final_result = format_final_result_with_attempts(
-            content_package, scores_history, attempts_made
-        )
-        
-        # Add failure notice if any platforms failed
-        if failed_platforms:
-            failure_notice = f"\n\n**Note:** Content generation failed for: {', '.join(failed_platforms)}"
-            final_result += failure_notice
-        
+            for platform, content in final_content.items():
+                content_package += f"\n**{platform.upper()}:**\n{content}\n"
+        
+            if failed_platforms:
+                content_package += f"\n**FAILED PLATFORMS:** {', '.join(failed_platforms)}\n"
+        
+            # Use enhanced final result formatting with quality tracking
+            final_result = format_final_result_with_attempts(
+                content_package, scores_history, attempts_made, stop_reasons
+            )
+        
+            # Add failure notice if any platforms failed
+            if failed_platforms:
+                failure_notice = f"\n\n**Note:** Content generation failed for: {', '.join(failed_platforms)}"
+                final_result += failure_notice
+        
+        emit_event(emit, FINAL_CONTENT, result=final_result, content=final_content,
+                   scores_history=scores_history, stop_reasons=stop_reasons,
+                   failed_platforms=failed_platforms,
+                   stage_seconds=_stage_seconds(), token_usage=_token_usage())
         return final_result
         
     except Exception as e:
         error_msg = f"\nError in smart routing pipeline: {str(e)}"
         print(error_msg)
+        emit_event(emit, ERROR, error=str(e))
+        emit_event(emit, FINAL_CONTENT, result=error_msg, content={},
+                   scores_history={}, stop_reasons={}, failed_platforms=[],
+                   stage_seconds=_stage_seconds(), token_usage=_token_usage())
         return error_msg
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""
+HTTP service for Smart Routing Pipeline
+ASGI app exposing the pipeline behind a bounded work queue with load shedding
+"""
+
+from .work_queue import WorkQueue, PipelineJob, QueueFullError
+
+__all__ = [
+    "WorkQueue",
+    "PipelineJob",
+    "QueueFullError"
+]
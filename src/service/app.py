@@ -0,0 +1,118 @@
+"""
+ASGI app for the Smart Routing Pipeline
+Exposes the pipeline over HTTP with sync and streaming endpoints
+
+Run: python main.py --serve   (or: uvicorn src.service.app:app)
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from src.service.work_queue import WorkQueue, QueueFullError
+from src.utils.fast_routing import get_fast_router
+from src.utils.scheduler import get_scheduler
+from src.utils.tracing import get_tracer
+
+work_queue = WorkQueue()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    await work_queue.start()
+    try:
+        yield
+    finally:
+        await work_queue.stop()
+
+
+app = FastAPI(title="Smart Routing Social Media Pipeline", lifespan=lifespan)
+
+
+class ContentRequest(BaseModel):
+    request: str
+    user_id: Optional[str] = None    # Tenant (default: USER_ID)
+    priority: Optional[str] = None   # See SCHEDULER_CONFIG["priorities"]
+
+
+def _overloaded(error: QueueFullError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"error": str(error), **work_queue.stats()},
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+@app.post("/content")
+async def create_content(body: ContentRequest):
+    """Run the pipeline and return the final result as JSON."""
+    try:
+        job = work_queue.submit(body.request, user_id=body.user_id, priority=body.priority)
+    except QueueFullError as e:
+        return _overloaded(e)
+    except ValueError as e:
+        return JSONResponse(status_code=422, content={"error": str(e)})
+
+    try:
+        record = await job.result
+    except asyncio.CancelledError:
+        # The client disconnected; stop spending model calls on its request
+        job.cancel()
+        raise
+    return JSONResponse(status_code=500 if record["status"] == "error" else 200, content=record)
+
+
+@app.post("/content/stream")
+async def stream_content(body: ContentRequest):
+    """Run the pipeline and stream progress events as newline-delimited JSON."""
+    try:
+        job = work_queue.submit(body.request, stream=True, user_id=body.user_id, priority=body.priority)
+    except QueueFullError as e:
+        return _overloaded(e)
+    except ValueError as e:
+        return JSONResponse(status_code=422, content={"error": str(e)})
+
+    async def event_lines() -> AsyncIterator[str]:
+        try:
+            while True:
+                event = await job.events.get()
+                if event is None:
+                    break
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        finally:
+            # Closed early when the client disconnects: stop the job with it
+            job.cancel()
+
+    return StreamingResponse(event_lines(), media_type="application/x-ndjson")
+
+
+@app.get("/stats")
+async def stats():
+    """Queue depth, in-flight count, totals, routing fast-path usage and per-tenant scheduling."""
+    fast_router = get_fast_router()
+    return {
+        **work_queue.stats(),
+        "routing": {**fast_router.stats, "fast_path_rate": round(fast_router.fast_path_rate(), 3)},
+        "scheduler": get_scheduler().stats()
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Stage and agent latency histograms in the Prometheus text format."""
+    return PlainTextResponse(get_tracer().prometheus_text(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/json")
+async def metrics_json():
+    """The same histograms as JSON lines, with p50/p95/p99 per series."""
+    return PlainTextResponse(get_tracer().json_lines(), media_type="application/x-ndjson")
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
@@ -0,0 +1,222 @@
+"""
+In-process work queue for the pipeline service
+Bounded queue drained by a fixed number of pipeline workers
+"""
+import asyncio
+import itertools
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import SERVICE_CONFIG
+from src.pipelines.events import PipelineEvent, CLARIFICATION, ERROR, FINAL_CONTENT
+from src.pipelines.smart_routing import stream_smart_routed_content
+from src.utils.scheduler import RequestContext, get_scheduler
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Work queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PipelineJob:
+    """A queued pipeline request and the channels its results arrive on."""
+
+    def __init__(self, request: str, context: RequestContext, stream: bool = False):
+        self.request = request
+        self.context = context
+        self.stream = stream
+        self.submitted_at = time.time()
+        self.result: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        # Only streaming jobs buffer events; None marks the end of the stream
+        self.events: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        self.cancelled = False
+        self.finished = False
+        self.task: Optional[asyncio.Task] = None
+
+    def publish(self, event: PipelineEvent) -> None:
+        if self.stream and not self.cancelled:
+            self.events.put_nowait(asdict(event))
+
+    def cancel(self) -> None:
+        """Give up on the job for a client that went away: skipped if queued, stopped if running."""
+        if self.finished:
+            return
+        self.cancelled = True
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+    def finish(self, record: Dict[str, Any]) -> None:
+        """Resolve the result (unless the caller gave up on it) and end the event stream."""
+        self.finished = True
+        if not self.result.done():
+            self.result.set_result(record)
+        self.events.put_nowait(None)
+
+
+class WorkQueue:
+    """
+    Bounded queue of pipeline jobs processed by `workers` concurrent workers.
+
+    Waiting jobs start in priority order, then arrival order. Submissions
+    beyond `max_size` waiting jobs are rejected with QueueFullError so
+    callers can shed load instead of piling up latency.
+    """
+
+    def __init__(self, workers: int = SERVICE_CONFIG["workers"],
+                 max_size: int = SERVICE_CONFIG["max_queue_size"]):
+        self.workers = workers
+        self.max_size = max_size
+        self._queue: "asyncio.PriorityQueue[Tuple[int, int, PipelineJob]]" = \
+            asyncio.PriorityQueue(maxsize=max_size)
+        self._arrivals = itertools.count()
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self._total_seconds = 0.0
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks, answering every running and waiting job with an error."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            job.finish(_stopped_record())
+            self._queue.task_done()
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a queue slot frees up."""
+        finished = self.completed + self.failed
+        if not finished:
+            return SERVICE_CONFIG["retry_after_seconds"]
+        average_seconds = self._total_seconds / finished
+        return max(1, int(average_seconds * (self._queue.qsize() + 1) / self.workers))
+
+    def submit(self, request: str, stream: bool = False, user_id: Optional[str] = None,
+               priority: Optional[str] = None) -> PipelineJob:
+        """
+        Queue a request for processing.
+
+        Args:
+            request: User content request
+            stream: Whether the caller wants progress events
+            user_id: Tenant the request runs for (default: USER_ID)
+            priority: Scheduling priority (default: SERVICE_CONFIG["default_priority"])
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If the queue is at capacity
+            ValueError: If the priority is unknown
+        """
+        scheduler = get_scheduler()
+        context = scheduler.context(user_id, priority or SERVICE_CONFIG["default_priority"])
+        job = PipelineJob(request, context, stream)
+        try:
+            self._queue.put_nowait((scheduler.rank(context.priority), next(self._arrivals), job))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(self.retry_after())
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue depth, in-flight count and totals."""
+        finished = self.completed + self.failed
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_size": self.max_size,
+            "in_flight": self.in_flight,
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "avg_seconds": round(self._total_seconds / finished, 2) if finished else None
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                if job.cancelled:
+                    # The client went away while the job was waiting
+                    self.cancelled += 1
+                    job.finish({"status": "cancelled"})
+                else:
+                    await self._process(job)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job: PipelineJob) -> None:
+        self.in_flight += 1
+        start_time = time.time()
+        # Its own task, so a client that goes away can stop the job but not the worker
+        job.task = asyncio.create_task(self._run_job(job))
+        try:
+            # wait() raises CancelledError only when this worker is cancelled,
+            # not when the job ends with one
+            await asyncio.wait({job.task})
+        except asyncio.CancelledError:
+            job.task.cancel()
+            job.finish(_stopped_record())
+            raise
+        finally:
+            self.in_flight -= 1
+
+        if job.task.cancelled():
+            record = {"status": "cancelled"} if job.cancelled else \
+                {"status": "error", "error": "Pipeline was cancelled unexpectedly"}
+        elif job.task.exception() is not None:
+            record = {"status": "error", "error": str(job.task.exception())}
+        else:
+            record = job.task.result()
+
+        if record["status"] == "cancelled":
+            self.cancelled += 1
+        else:
+            self._total_seconds += time.time() - start_time
+            if record["status"] == "error":
+                self.failed += 1
+            else:
+                self.completed += 1
+        job.finish(record)
+
+    async def _run_job(self, job: PipelineJob) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"status": "completed"}
+        final_content = False
+        async for event in stream_smart_routed_content(job.request, user_id=job.context.user_id,
+                                                       priority=job.context.priority):
+            job.publish(event)
+            if event.type == CLARIFICATION:
+                record["status"] = "clarification_needed"
+            elif event.type == ERROR:
+                record["status"] = "error"
+                record["error"] = event.data["error"]
+            elif event.type == FINAL_CONTENT:
+                final_content = True
+                record.update(event.data)
+        if not final_content and record["status"] != "error":
+            record["status"] = "error"
+            record["error"] = "Pipeline ended without final content"
+        record["total_seconds"] = round(time.time() - job.submitted_at, 2)
+        return record
+
+
+def _stopped_record() -> Dict[str, Any]:
+    return {"status": "error", "error": "Service stopped before the request finished"}
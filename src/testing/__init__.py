@@ -0,0 +1,20 @@
+"""
+Testing support for Smart Routing Pipeline
+Fake model backend for running the pipeline without a Gemini API key
+"""
+
+from .fake_llm import (
+    FakeLlm,
+    FakeLlmBackend,
+    FakeLlmScenario,
+    FakeLlmError,
+    use_fake_llm
+)
+
+__all__ = [
+    "FakeLlm",
+    "FakeLlmBackend",
+    "FakeLlmScenario",
+    "FakeLlmError",
+    "use_fake_llm"
+]
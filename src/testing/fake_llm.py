@@ -0,0 +1,351 @@
+"""
+Fake LLM backend for Smart Routing Pipeline
+Drop-in model for the existing LlmAgents so the pipeline can be exercised and
+benchmarked without a Gemini API key
+"""
+import asyncio
+import json
+import random
+import re
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional, Tuple
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+from src.config import GEMINI_TEXT_MODEL, QUALITY_SCORE_THRESHOLD
+from src.utils.fast_routing import extract_platforms, extract_topic
+from src.utils.rate_limiter import estimate_tokens
+
+# Agent name -> role the fake answers as (specialists answer as their platform)
+AGENT_ROLES = {
+    "SmartRouter": "router",
+    "ResearchEnhancer": "research",
+    "XContentSpecialist": "x_twitter",
+    "LinkedInContentSpecialist": "linkedin",
+    "InstagramContentSpecialist": "instagram",
+    "BlogContentSpecialist": "blog",
+    "QualityChecker": "checker",
+    "QualitySynthesizer": "synthesizer",
+    "ContentRegenerator": "regenerator",
+    "DraftRanker": "ranker"
+}
+
+PLATFORM_ROLES = ("x_twitter", "linkedin", "instagram", "blog")
+
+# Canned drafts that satisfy the local platform rules in src/utils/validation.py
+_DRAFT_SENTENCES = [
+    "Most of my best work happens before anyone else is online.",
+    "Last month I moved every meeting after lunch and kept mornings for deep work.",
+    "The first week felt strange, the second week felt productive, and by the third I stopped checking chat every ten minutes.",
+    "Nobody complained, and two of my teammates quietly copied the idea.",
+    "What would change if you protected one uninterrupted block tomorrow?"
+]
+# Revised drafts use different wording so regenerations aren't near-copies
+_REVISED_DRAFT_SENTENCES = [
+    [
+        "Protecting two quiet hours each morning changed how my whole week feels.",
+        "I started small: no calls before eleven, and chat notifications off until then.",
+        "Within a fortnight my unfinished task list had shrunk by half, which surprised me more than anyone.",
+        "A few colleagues noticed the calmer replies and asked how I set it up.",
+        "Which hour of your day would you guard first?"
+    ],
+    [
+        "My calendar used to decide my priorities for me.",
+        "So I blocked every Tuesday and Thursday morning as a no-meeting zone and told the team why.",
+        "The early results were messy, yet by week three the big projects finally moved forward.",
+        "Our manager liked it enough to suggest the same blocks for everyone.",
+        "What is one meeting you could quietly drop this week?"
+    ]
+]
+_REVISION_PATTERN = re.compile(r"CONTENT REGENERATION REQUEST \(Attempt (\d+)")
+_SECTION_REVISION_PATTERN = re.compile(
+    r"SECTION REGENERATION REQUEST \(Attempt (\d+).*?SECTION TO IMPROVE \(about (\d+) words\):\n([^\n]*)",
+    re.DOTALL
+)
+_CANDIDATE_PATTERN = re.compile(r"CANDIDATE (\d+) OF \d+")
+_DRAFT_WORDS = {"x_twitter": 0, "linkedin": 320, "instagram": 220, "blog": 950}
+# Blog drafts are markdown articles: a title and an opening, then subheaded sections
+_BLOG_TITLE = "The Quiet Hours That Made Remote Work Work"
+_BLOG_HEADINGS = ["## Where the time actually went", "## What changed in practice",
+                  "## The part nobody warned me about", "## Making it stick"]
+
+_RESEARCH_TEMPLATE = """**RESEARCH INSIGHTS FOR NATURAL INTEGRATION**
+
+**Conversation Starters** (2-3 insights):
+- Teams report fewer interruptions when {topic} is planned around focus blocks
+- Async updates are replacing a third of status meetings
+- Most people overestimate how many hours of deep work they get each week
+
+**Story-Worthy Examples** (1-2 real scenarios):
+- A ten-person design studio moved every status update to a shared doc and
+  reclaimed a full afternoon per person each week
+- A support team rotated a single "interrupt handler" so everyone else could focus
+
+**Human Connection Points** (1-2 relatable angles):
+- Everyone knows the feeling of ending a busy day with nothing finished
+- Parents working from home juggle focus time around school runs
+
+**Fresh Context** (current developments):
+- Hybrid schedules have settled into two or three office days for many teams
+
+**Natural Integration Suggestions**:
+- X/Twitter: one surprising number, casually
+- LinkedIn: a personal lesson backed by the trend
+- Instagram: a behind-the-scenes story
+- Blog: the evidence and a practical walkthrough
+
+**Avoid Academic Research Patterns**:
+- Skip formal citations and "studies show" language
+"""
+
+
+class FakeLlmError(RuntimeError):
+    """Error raised by the fake backend when error injection triggers."""
+
+    code = 503   # Classified like a transient server error, so it is retried
+
+
+@dataclass
+class FakeLlmScenario:
+    """
+    Behaviour of the fake backend for one run.
+
+    Attributes:
+        latency_seconds: (mean, stddev) of the per-call latency, normally distributed
+        role_latency: Per-role overrides of latency_seconds
+        router_decision: JSON the SmartRouter returns; derived from the request when None
+        scores: Platform -> overall scores returned by successive quality checks
+        default_score: Score once a platform's scripted scores run out
+        error_rate: Probability that any call raises FakeLlmError
+        fail_first: Role -> number of initial calls that raise FakeLlmError
+        repeat_drafts: Regenerations return the original draft unchanged
+        best_candidate: Candidate number the DraftRanker picks
+        seed: Random seed for latency and error sampling
+    """
+    latency_seconds: Tuple[float, float] = (0.05, 0.01)
+    role_latency: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    router_decision: Optional[Dict[str, Any]] = None
+    scores: Dict[str, List[float]] = field(default_factory=dict)
+    default_score: float = 8.0
+    error_rate: float = 0.0
+    fail_first: Dict[str, int] = field(default_factory=dict)
+    repeat_drafts: bool = False
+    best_candidate: int = 1
+    seed: Optional[int] = None
+
+
+class FakeLlmBackend:
+    """Shared state behind every FakeLlm installed for a scenario."""
+
+    def __init__(self, scenario: Optional[FakeLlmScenario] = None):
+        self.scenario = scenario or FakeLlmScenario()
+        self.random = random.Random(self.scenario.seed)
+        self.calls: Counter = Counter()
+        self.failures: Counter = Counter()
+        self._assessments: Counter = Counter()
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def sample_latency(self, role: str) -> float:
+        mean, stddev = self.scenario.role_latency.get(role, self.scenario.latency_seconds)
+        return max(0.0, self.random.gauss(mean, stddev))
+
+    async def respond(self, role: str, llm_request: LlmRequest) -> str:
+        """
+        Produce the text an agent in `role` would answer with.
+
+        Args:
+            role: Role from AGENT_ROLES
+            llm_request: Request ADK would have sent to the model
+
+        Returns:
+            Response text
+        """
+        self.calls[role] += 1
+        await asyncio.sleep(self.sample_latency(role))
+
+        if (self.calls[role] <= self.scenario.fail_first.get(role, 0)
+                or self.random.random() < self.scenario.error_rate):
+            self.failures[role] += 1
+            raise FakeLlmError(f"Injected failure for {role} call {self.calls[role]}")
+
+        prompt = _last_user_text(llm_request)
+        if role == "router":
+            return json.dumps(self.scenario.router_decision or _derive_routing_decision(prompt))
+        if role == "research":
+            return _RESEARCH_TEMPLATE.format(topic=extract_topic(prompt) or "this topic")
+        if role == "checker":
+            return self._quality_report(prompt)
+        if role in PLATFORM_ROLES:
+            section = _SECTION_REVISION_PATTERN.search(prompt)
+            if section and not self.scenario.repeat_drafts:
+                return build_fake_section(section.group(3), int(section.group(2)), int(section.group(1)))
+            revision = _REVISION_PATTERN.search(prompt)
+            if revision and not self.scenario.repeat_drafts:
+                return build_fake_draft(role, int(revision.group(1)))
+            candidate = _CANDIDATE_PATTERN.search(prompt)
+            if candidate:
+                return build_fake_draft(role, int(candidate.group(1)) - 1)
+            return build_fake_draft(role)
+        if role == "ranker":
+            return f"**BEST CANDIDATE**: {self.scenario.best_candidate}\n\n**RANKING**: " \
+                   f"{self.scenario.best_candidate}\n\n**WHY**: Most specific and personal."
+        return f"Fake {role} response."
+
+    def _quality_report(self, prompt: str) -> str:
+        platform = next((p for p in PLATFORM_ROLES if f"**{p.upper()}:**" in prompt), "unknown")
+        scripted = self.scenario.scores.get(platform, [])
+        index = self._assessments[platform]
+        self._assessments[platform] += 1
+        score = scripted[index] if index < len(scripted) else self.scenario.default_score
+        verdict = "APPROVED" if score >= QUALITY_SCORE_THRESHOLD else "MAJOR_REVISION_NEEDED"
+        detail = min(10, round(score))
+        return f"""**QUALITY ASSESSMENT REPORT**
+
+**OVERALL SCORE**: {score:.1f}/10
+
+**DETAILED SCORES**:
+- Human Authenticity: {detail}/10 - Reads like a person
+- Contextual Relevance: {detail}/10 - On topic
+- Engagement Potential: {detail}/10 - Ends with a question
+- Practical Value: {detail}/10 - One concrete tip
+- Platform Optimization: {detail}/10 - Fits the format
+
+**HUMAN TOUCH ANALYSIS**:
+Natural rhythm with a personal anecdote.
+
+**CONTEXTUAL IMPROVEMENTS** (Keep concise, focus on this specific content):
+1. Open with the concrete result instead of the setup
+2. Add one specific number from the research
+
+**CONTENT STRENGTHS**:
+Personal and specific.
+
+**PRIORITY FIX** (Most important single change):
+Lead with the outcome.
+
+**VERDICT**: {verdict}"""
+
+
+class FakeLlm(BaseLlm):
+    """BaseLlm that answers from a FakeLlmBackend instead of calling Gemini."""
+
+    # Keep the real model name so per-model rate limits and tool checks still apply
+    model: str = GEMINI_TEXT_MODEL
+    role: str = "unknown"
+    backend: Any = None
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        text = await self.backend.respond(self.role, llm_request)
+
+        if stream:
+            for start in range(0, len(text), 40):
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=text[start:start + 40])]),
+                    partial=True
+                )
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=estimate_tokens(_request_text(llm_request)),
+                candidates_token_count=estimate_tokens(text)
+            )
+        )
+
+
+def build_fake_draft(platform: str, revision: int = 0) -> str:
+    """
+    Canned draft for a platform that passes its local constraint checks.
+
+    Revisions (regeneration attempts) are worded differently from the
+    original and from each other.
+    """
+    pool = _DRAFT_SENTENCES
+    if revision:
+        pool = _REVISED_DRAFT_SENTENCES[(revision - 1) % len(_REVISED_DRAFT_SENTENCES)]
+    target_words = _DRAFT_WORDS.get(platform, 0)
+    sentences = [pool[0], pool[-1]]
+    if target_words:
+        sentences = []
+        while sum(len(s.split()) for s in sentences) < target_words:
+            sentences.append(pool[len(sentences) % len(pool)])
+    paragraphs = [" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5)]
+    if platform == "blog":
+        # Spread the paragraphs evenly over the opening and one section per heading
+        size = -(-len(paragraphs) // (len(_BLOG_HEADINGS) + 1))
+        blocks = [_BLOG_TITLE] + paragraphs[:size]
+        for number, heading in enumerate(_BLOG_HEADINGS, start=1):
+            blocks += [heading] + paragraphs[number * size:(number + 1) * size]
+        paragraphs = blocks
+    return "\n\n".join(paragraphs)
+
+
+def build_fake_section(first_line: str, words: int, revision: int) -> str:
+    """Canned rewrite of one article section, keeping its heading and rough length."""
+    pool = _REVISED_DRAFT_SENTENCES[(revision - 1) % len(_REVISED_DRAFT_SENTENCES)]
+    sentences = []
+    while sum(len(s.split()) for s in sentences) < max(words - len(first_line.split()), 20):
+        sentences.append(pool[len(sentences) % len(pool)])
+    paragraphs = [" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5)]
+    if first_line.startswith("#") or first_line == _BLOG_TITLE:
+        paragraphs.insert(0, first_line)
+    return "\n\n".join(paragraphs)
+
+
+@contextmanager
+def use_fake_llm(scenario: Optional[FakeLlmScenario] = None) -> Iterator[FakeLlmBackend]:
+    """
+    Swap every pipeline agent's model for a FakeLlm for the duration of the block.
+
+    Args:
+        scenario: Backend behaviour (defaults to FakeLlmScenario())
+
+    Yields:
+        The backend, for call counts and failure counts
+    """
+    import src.agents as agents
+
+    backend = FakeLlmBackend(scenario)
+    originals = {}
+    for name in agents.AGENT_NAMES:
+        agent = agents.get_agent(name)
+        originals[name] = agent.model
+        agent.model = FakeLlm(role=AGENT_ROLES.get(agent.name, agent.name), backend=backend)
+    try:
+        yield backend
+    finally:
+        for name, model in originals.items():
+            agents.get_agent(name).model = model
+
+
+def _derive_routing_decision(request: str) -> Dict[str, Any]:
+    return {
+        "selected_platforms": extract_platforms(request) or ["linkedin"],
+        "confidence": "HIGH",
+        "reasoning": "Fake router decision",
+        "clarification_needed": False,
+        "content_focus": extract_topic(request) or request
+    }
+
+
+def _last_user_text(llm_request: LlmRequest) -> str:
+    for content in reversed(llm_request.contents or []):
+        for part in content.parts or []:
+            if part.text:
+                return part.text
+    return ""
+
+
+def _request_text(llm_request: LlmRequest) -> str:
+    instruction = str(llm_request.config.system_instruction or "") if llm_request.config else ""
+    parts = [part.text for content in llm_request.contents or []
+             for part in content.parts or [] if part.text]
+    return instruction + "\n".join(parts)
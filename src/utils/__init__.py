@@ -9,9 +9,18 @@ from .parsing import (
     get_selected_content_agents
 )
 
-from .runners import run_single_agent
+from .runners import run_single_agent, run_platform_tasks
+from .resilience import AgentCallError, AgentTimeoutError, CircuitOpenError
+from .cache import get_agent_cache
+from .research_cache import get_research_cache, normalize_topic
+from .content_store import get_content_store
+from .scheduler import get_scheduler
+from .fast_routing import get_fast_router
+from .validation import validate_drafts, check_platform_constraints
 
 from .quality import (
+    QualityReport,
+    parse_quality_report,
     parse_quality_score,
     extract_improvement_suggestions,
     format_regeneration_prompt,
@@ -25,6 +34,20 @@ __all__ = [
     "build_clarification_message",
     "get_selected_content_agents",
     "run_single_agent",
+    "run_platform_tasks",
+    "AgentCallError",
+    "AgentTimeoutError",
+    "CircuitOpenError",
+    "get_agent_cache",
+    "get_content_store",
+    "get_scheduler",
+    "get_research_cache",
+    "normalize_topic",
+    "get_fast_router",
+    "validate_drafts",
+    "check_platform_constraints",
+    "QualityReport",
+    "parse_quality_report",
     "parse_quality_score",
     "extract_improvement_suggestions",
     "format_regeneration_prompt",
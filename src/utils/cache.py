@@ -0,0 +1,157 @@
+"""
+Agent call memoization for Smart Routing Pipeline
+In-memory LRU in front of an on-disk store, keyed by a content hash of the call
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from src.config.settings import CACHE_CONFIG
+
+
+class AgentCallCache:
+    """
+    Memoizes agent responses keyed by (agent, model, instruction, input).
+
+    Lookups check the in-memory LRU first, then the disk store. Entries
+    expire after `ttl_seconds`; the LRU holds at most `max_memory_entries`
+    and the disk store is trimmed (oldest first) to `max_disk_bytes`.
+    """
+
+    def __init__(self, config: Dict[str, Any] = CACHE_CONFIG):
+        self.config = config
+        self.directory = config["directory"]
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._writes_since_trim = 0
+        self.stats: Dict[str, Any] = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "per_agent": {}
+        }
+
+    def is_enabled_for(self, agent_name: str) -> bool:
+        """Per-agent override from CACHE_CONFIG['agents'], else the global switch."""
+        return self.config["agents"].get(agent_name, self.config["enabled"])
+
+    @staticmethod
+    def make_key(agent_name: str, model: str, instruction: str, input_text: str) -> str:
+        """Content hash identifying an agent call."""
+        payload = json.dumps([agent_name, model, instruction, input_text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _count(self, agent_name: str, outcome: str) -> None:
+        agent_stats = self.stats["per_agent"].setdefault(agent_name, {"hits": 0, "misses": 0})
+        agent_stats[outcome] += 1
+
+    async def get(self, key: str, agent_name: str) -> Optional[str]:
+        """
+        Look up a memoized response.
+
+        Args:
+            key: Call key from make_key
+            agent_name: Agent name (for per-agent counters)
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        now = time.time()
+        ttl = self.config["ttl_seconds"]
+
+        cached = self._memory.get(key)
+        if cached and now - cached[1] <= ttl:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            self._count(agent_name, "hits")
+            return cached[0]
+
+        entry = await asyncio.to_thread(self._read_disk, key)
+        if entry and now - entry["stored_at"] <= ttl:
+            self._remember(key, entry["value"], entry["stored_at"])
+            self.stats["disk_hits"] += 1
+            self._count(agent_name, "hits")
+            return entry["value"]
+
+        self._memory.pop(key, None)
+        self.stats["misses"] += 1
+        self._count(agent_name, "misses")
+        return None
+
+    async def put(self, key: str, agent_name: str, value: str) -> None:
+        """Store a response in memory and on disk."""
+        stored_at = time.time()
+        self._remember(key, value, stored_at)
+        await asyncio.to_thread(self._write_disk, key, agent_name, value, stored_at)
+        self.stats["writes"] += 1
+
+    def _remember(self, key: str, value: str, stored_at: float) -> None:
+        self._memory[key] = (value, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.config["max_memory_entries"]:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, key: str, agent_name: str, value: str, stored_at: float) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see partial files
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"agent": agent_name, "stored_at": stored_at, "value": value}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Failed to write agent cache entry: {e}")
+            return
+
+        self._writes_since_trim += 1
+        if self._writes_since_trim >= 50:
+            self._writes_since_trim = 0
+            self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """Delete expired entries, then the oldest ones until under max_disk_bytes."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        now = time.time()
+        total_bytes = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            expired = now - mtime > self.config["ttl_seconds"]
+            if not expired and total_bytes <= self.config["max_disk_bytes"]:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (the disk store is left untouched)."""
+        self._memory.clear()
+
+
+# Shared cache used by run_single_agent
+_agent_cache = AgentCallCache()
+
+
+def get_agent_cache() -> AgentCallCache:
+    """Return the process-wide agent call cache."""
+    return _agent_cache
@@ -0,0 +1,332 @@
+"""
+Persistent content store for Smart Routing Pipeline
+SQLite record of every request's routing decision, research, drafts,
+quality reports and final content, with lookup of approved content for reuse
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+from src.config.settings import CONTENT_STORE_CONFIG, QUALITY_SCORE_THRESHOLD
+from src.utils.research_cache import normalize_topic
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS research (
+    hash TEXT PRIMARY KEY,
+    text BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    request_id TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    content_focus TEXT,
+    topic TEXT,
+    confidence TEXT,
+    platforms TEXT,
+    failed_platforms TEXT,
+    routing BLOB,
+    research_hash TEXT REFERENCES research(hash),
+    result BLOB,
+    total_tokens INTEGER,
+    stage_seconds TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_requests_topic ON requests(topic, created_at);
+CREATE INDEX IF NOT EXISTS idx_requests_created ON requests(created_at);
+CREATE TABLE IF NOT EXISTS drafts (
+    request INTEGER NOT NULL REFERENCES requests(id) ON DELETE CASCADE,
+    platform TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    repaired INTEGER NOT NULL DEFAULT 0,
+    content BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_drafts_request ON drafts(request, platform);
+CREATE TABLE IF NOT EXISTS assessments (
+    request INTEGER NOT NULL REFERENCES requests(id) ON DELETE CASCADE,
+    platform TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    score REAL,
+    report BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_platform_score ON assessments(platform, score);
+CREATE TABLE IF NOT EXISTS content (
+    request INTEGER NOT NULL REFERENCES requests(id) ON DELETE CASCADE,
+    topic TEXT,
+    platform TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    score REAL,
+    attempts INTEGER NOT NULL,
+    stop_reason TEXT,
+    content BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_content_reuse ON content(topic, platform, stop_reason, created_at);
+CREATE INDEX IF NOT EXISTS idx_content_platform_score ON content(platform, score);
+CREATE INDEX IF NOT EXISTS idx_content_created ON content(created_at);
+"""
+
+
+def pack_text(text: Optional[str], level: int = CONTENT_STORE_CONFIG["compression_level"]) -> Optional[bytes]:
+    """zlib-compress text for a BLOB column (None stays None)."""
+    return None if text is None else zlib.compress(text.encode("utf-8"), level)
+
+
+def unpack_text(blob: Optional[bytes]) -> Optional[str]:
+    """Inverse of pack_text."""
+    return None if blob is None else zlib.decompress(blob).decode("utf-8")
+
+
+@dataclass
+class ContentRecord:
+    """Everything one pipeline request produced, as written to the store."""
+    request: str
+    request_id: str
+    created_at: float = field(default_factory=time.time)
+    status: str = "completed"             # completed, clarification or error
+    routing: Dict[str, Any] = field(default_factory=dict)
+    research: Optional[str] = None
+    drafts: List[Dict[str, Any]] = field(default_factory=list)        # platform, attempt, content, repaired
+    assessments: List[Dict[str, Any]] = field(default_factory=list)   # platform, attempt, score, report
+    platforms: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # platform -> content, scores, stop_reason
+    failed_platforms: List[str] = field(default_factory=list)
+    result: str = ""
+    token_usage: Dict[str, Any] = field(default_factory=dict)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class StoredContent:
+    """A platform's final content from an earlier request."""
+    platform: str
+    content: str
+    score: Optional[float]
+    stop_reason: str
+    created_at: float
+    request_id: str
+    request: str
+    research: Optional[str] = None
+
+
+class ContentStore:
+    """
+    SQLite store of pipeline output, written off the event loop.
+
+    All database work runs on one dedicated thread that owns the connection,
+    so writes are serialized without locking and never block a request.
+    Text columns are zlib-compressed; research is stored once per distinct
+    text, since requests on a cached topic share it.
+    """
+
+    def __init__(self, config: Dict[str, Any] = CONTENT_STORE_CONFIG):
+        self.config = config
+        self.enabled = config["enabled"]
+        self.path = config["path"]
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connection = None
+        self._pending: Set[Future] = set()
+        self.stats = {"writes": 0, "write_errors": 0, "lookups": 0, "reused": 0}
+
+    @property
+    def reuse_enabled(self) -> bool:
+        return self.enabled and self.config["reuse"]["enabled"]
+
+    def _submit(self, fn, *args) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="content-store")
+        return self._executor.submit(fn, *args)
+
+    def _connect(self):
+        """Open the database on the store thread (creating the schema on first use)."""
+        if self._connection is None:
+            import sqlite3
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(_SCHEMA)
+            connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._connection = connection
+        return self._connection
+
+    def save_in_background(self, record: ContentRecord) -> None:
+        """Queue a record for writing and return immediately."""
+        if not self.enabled:
+            return
+        future = self._submit(self._write, record)
+        self._pending.add(future)
+        future.add_done_callback(self._write_done)
+
+    def _write_done(self, future: Future) -> None:
+        self._pending.discard(future)
+        if future.exception() is not None:
+            self.stats["write_errors"] += 1
+            print(f"Warning: Could not save request to content store: {future.exception()}")
+        else:
+            self.stats["writes"] += 1
+
+    async def flush(self) -> None:
+        """Wait until every queued record has been written."""
+        if self._pending:
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in list(self._pending)),
+                                 return_exceptions=True)
+
+    def _write(self, record: ContentRecord) -> None:
+        connection = self._connect()
+        level = self.config["compression_level"]
+        content_focus = record.routing.get("content_focus", "")
+        topic = normalize_topic(content_focus) if content_focus else ""
+
+        with connection:
+            research_hash = None
+            if record.research is not None:
+                research_hash = hashlib.sha256(record.research.encode("utf-8")).hexdigest()
+                connection.execute("INSERT OR IGNORE INTO research (hash, text) VALUES (?, ?)",
+                                   (research_hash, pack_text(record.research, level)))
+
+            cursor = connection.execute(
+                "INSERT INTO requests (request_id, created_at, status, request, content_focus, "
+                "topic, confidence, platforms, failed_platforms, routing, research_hash, result, "
+                "total_tokens, stage_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (record.request_id, record.created_at, record.status, record.request, content_focus,
+                 topic, record.routing.get("confidence"),
+                 ",".join(record.routing.get("selected_platforms", [])),
+                 ",".join(record.failed_platforms),
+                 pack_text(json.dumps(record.routing), level) if record.routing else None,
+                 research_hash, pack_text(record.result, level),
+                 record.token_usage.get("total_tokens"), json.dumps(record.stage_seconds))
+            )
+            row = cursor.lastrowid
+
+            connection.executemany(
+                "INSERT INTO drafts (request, platform, attempt, repaired, content) VALUES (?, ?, ?, ?, ?)",
+                [(row, d["platform"], d["attempt"], int(d.get("repaired", False)),
+                  pack_text(d["content"], level)) for d in record.drafts]
+            )
+            connection.executemany(
+                "INSERT INTO assessments (request, platform, attempt, score, report) VALUES (?, ?, ?, ?, ?)",
+                [(row, a["platform"], a["attempt"], a["score"], pack_text(a.get("report"), level))
+                 for a in record.assessments]
+            )
+            connection.executemany(
+                "INSERT INTO content (request, topic, platform, created_at, score, attempts, stop_reason, "
+                "content) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(row, topic, platform, record.created_at,
+                  final["scores"][-1] if final.get("scores") else None, len(final.get("scores", [])),
+                  final.get("stop_reason"), pack_text(final["content"], level))
+                 for platform, final in record.platforms.items()]
+            )
+
+    async def find_approved(self, content_focus: str, platforms: List[str],
+                            max_age_seconds: Optional[float] = None,
+                            min_score: Optional[float] = None) -> Dict[str, StoredContent]:
+        """
+        Find previously approved content for an equivalent request.
+
+        A request is equivalent when its content focus normalizes to the same
+        topic (see normalize_topic); content is only returned for platforms
+        that passed quality assessment with at least `min_score`.
+
+        Args:
+            content_focus: Topic/angle from the routing decision
+            platforms: Platforms to look up
+            max_age_seconds: Ignore content older than this (defaults to
+                             CONTENT_STORE_CONFIG["reuse"]["max_age_seconds"])
+            min_score: Minimum final score (defaults to the reuse config, then
+                       QUALITY_SCORE_THRESHOLD)
+
+        Returns:
+            platform -> best-scoring (then most recent) approved content;
+            platforms without a match are absent
+        """
+        topic = normalize_topic(content_focus)
+        if not self.enabled or not topic or not platforms:
+            return {}
+
+        reuse_config = self.config["reuse"]
+        if max_age_seconds is None:
+            max_age_seconds = reuse_config["max_age_seconds"]
+        if min_score is None:
+            min_score = reuse_config["min_score"]
+            if min_score is None:
+                min_score = QUALITY_SCORE_THRESHOLD
+
+        self.stats["lookups"] += 1
+        return await asyncio.wrap_future(self._submit(
+            self._find_approved, topic, list(platforms), time.time() - max_age_seconds, min_score
+        ))
+
+    def _find_approved(self, topic: str, platforms: List[str], since: float,
+                       min_score: float) -> Dict[str, StoredContent]:
+        connection = self._connect()
+        rows = connection.execute(
+            "SELECT c.platform, c.content, c.score, c.stop_reason, c.created_at, r.request_id, "
+            "r.request, s.text FROM content c JOIN requests r ON r.id = c.request "
+            "LEFT JOIN research s ON s.hash = r.research_hash "
+            f"WHERE c.topic = ? AND c.platform IN ({', '.join('?' * len(platforms))}) "
+            "AND c.stop_reason = 'approved' AND c.created_at >= ? AND c.score >= ? "
+            "ORDER BY c.score DESC, c.created_at DESC",
+            (topic, *platforms, since, min_score)
+        ).fetchall()
+
+        found: Dict[str, StoredContent] = {}
+        for platform, content, score, stop_reason, created_at, request_id, request, research in rows:
+            if platform not in found:
+                found[platform] = StoredContent(platform, unpack_text(content), score, stop_reason,
+                                                created_at, request_id, request, unpack_text(research))
+        return found
+
+    async def assessment_scores(self, platform: Optional[str] = None,
+                                since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Quality scores per assessment attempt, for tuning thresholds.
+
+        Args:
+            platform: Only this platform (all platforms when None)
+            since: Only requests created at or after this timestamp
+
+        Returns:
+            Dicts with platform, attempt, score, final stop_reason and created_at
+        """
+        if not self.enabled:
+            return []
+        return await asyncio.wrap_future(self._submit(self._assessment_scores, platform, since or 0.0))
+
+    def _assessment_scores(self, platform: Optional[str], since: float) -> List[Dict[str, Any]]:
+        connection = self._connect()
+        rows = connection.execute(
+            "SELECT a.platform, a.attempt, a.score, c.stop_reason, r.created_at FROM assessments a "
+            "JOIN requests r ON r.id = a.request "
+            "LEFT JOIN content c ON c.request = a.request AND c.platform = a.platform "
+            "WHERE r.created_at >= ? AND (? IS NULL OR a.platform = ?) "
+            "ORDER BY r.created_at, a.attempt",
+            (since, platform, platform)
+        ).fetchall()
+        return [{"platform": p, "attempt": attempt, "score": score, "stop_reason": reason,
+                 "created_at": created_at} for p, attempt, score, reason, created_at in rows]
+
+    def close(self) -> None:
+        """Finish queued writes and close the database."""
+        if self._executor is not None:
+            if self._connection is not None:
+                self._executor.submit(self._connection.close).result()
+                self._connection = None
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Shared content store used by the pipeline
+_content_store = ContentStore()
+
+
+def get_content_store() -> ContentStore:
+    """Return the process-wide content store."""
+    return _content_store
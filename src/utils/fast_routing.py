@@ -0,0 +1,174 @@
+"""
+Fast-path routing for Smart Routing Pipeline
+Local rule-based pre-router for requests that name their platforms explicitly
+"""
+import re
+from typing import Any, Dict, List, Optional
+from src.config import ROUTING_CONFIG
+
+# Platform names. Only mentions in a platform clause count (see
+# extract_platforms), so "the article I read" or "my tweet" in a topic
+# isn't mistaken for a platform choice.
+PLATFORM_PATTERNS = {
+    "x_twitter": re.compile(r"\b(?:twitter|x)\b", re.IGNORECASE),
+    "linkedin": re.compile(r"\blinked\s?in\b", re.IGNORECASE),
+    "instagram": re.compile(r"\b(?:instagram|insta|ig)\b", re.IGNORECASE),
+    "blog": re.compile(r"\bblogs?\b", re.IGNORECASE)
+}
+
+# "for LinkedIn", "on the blog", "to X": a clause naming where content goes
+_CLAUSE_BEFORE = re.compile(r"\b(?:for|on|to|across|via)\s+(?:the\s+|my\s+|our\s+)?$", re.IGNORECASE)
+# Continues a list of platforms: "LinkedIn, X and Instagram"
+_LIST_SEPARATOR = re.compile(r"^(?:\s*,\s*(?:and\s+|or\s+)?|\s+(?:and|or|plus|&)\s+|\s*/\s*)$", re.IGNORECASE)
+# "LinkedIn post", "X thread", "blog article": a platform naming the content to write
+_CONTENT_AFTER = re.compile(
+    r"^\s+(?:content|posts?|threads?|tweets?|captions?|articles?|updates?|reels?|stor(?:y|ies)|carousels?)\b",
+    re.IGNORECASE
+)
+# What may follow a platform clause: the end, punctuation, another platform or clause
+_CLAUSE_AFTER = re.compile(
+    r"^(?:\s*$|\s*[,.;:!/&]|\s+(?:and|or|plus|about|regarding|covering|discussing|on|for|to|with)\b)",
+    re.IGNORECASE
+)
+
+# Topic markers, most specific first ("on" also introduces platforms)
+TOPIC_PATTERNS = [
+    re.compile(r"\b(?:about|regarding|covering|discussing)\s+(?P<topic>.+)$", re.IGNORECASE),
+    re.compile(r"\bon\s+(?P<topic>.+)$", re.IGNORECASE)
+]
+
+# Phrasing the rules can't interpret safely; leave these to the LLM router
+AMBIGUITY_PATTERN = re.compile(
+    r"\b(?:not|no|except|without|instead|unless|maybe|either|which|should)\b|n't\b|\?",
+    re.IGNORECASE
+)
+
+_TRAILING_PLATFORM_CLAUSE = re.compile(
+    r"\s+(?:for|on|to)\s+(?:the\s+)?(?:x|twitter|linkedin|instagram|blog)\b.*$", re.IGNORECASE
+)
+_TOPIC_FILLER = {"a", "an", "the", "my", "our", "some", "this", "that", "it", "content", "post"}
+
+
+def extract_platforms(request: str) -> List[str]:
+    """
+    Find explicitly chosen platforms in request order.
+
+    A mention counts when it names the content ("LinkedIn post", "X
+    thread"), sits in a platform clause ("for LinkedIn", "on the blog") or
+    continues a list started by one ("for LinkedIn, X and Instagram").
+    A bare "x" only counts when capitalized or followed by a content word.
+
+    Args:
+        request: User content request
+
+    Returns:
+        Platform codes (x_twitter, linkedin, instagram, blog)
+    """
+    mentions = sorted(
+        (match.start(), match.end(), platform)
+        for platform, pattern in PLATFORM_PATTERNS.items()
+        for match in pattern.finditer(request)
+    )
+    platforms = []
+    previous_end = None
+    for start, end, platform in mentions:
+        before, after = request[:start], request[end:]
+        names_content = bool(_CONTENT_AFTER.match(after))
+        in_clause = bool(_CLAUSE_AFTER.match(after)) and (
+            bool(_CLAUSE_BEFORE.search(before))
+            or (previous_end is not None and bool(_LIST_SEPARATOR.match(request[previous_end:start])))
+        )
+        if request[start:end] == "x" and not (names_content or after.lstrip().startswith("/")):
+            continue
+        if names_content or in_clause:
+            if platform not in platforms:
+                platforms.append(platform)
+            previous_end = end
+    return platforms
+
+
+def extract_topic(request: str) -> str:
+    """
+    Extract the topic a request is about ("... about AI trends" -> "AI trends").
+
+    Args:
+        request: User content request
+
+    Returns:
+        Topic text, or "" when no topic marker is found
+    """
+    for pattern in TOPIC_PATTERNS:
+        match = pattern.search(request.strip())
+        if not match:
+            continue
+        topic = _TRAILING_PLATFORM_CLAUSE.sub("", match.group("topic"))
+        topic = topic.strip(" .!\"'")
+        if extract_platforms(topic):
+            # "on LinkedIn and X" is a platform list, not a topic
+            continue
+        words = [w for w in re.findall(r"[\w'-]+", topic.lower()) if w not in _TOPIC_FILLER]
+        if words:
+            return topic
+    return ""
+
+
+class FastPathRouter:
+    """
+    Rule-based router producing the same decision shape as
+    parse_routing_decision, used when a request is explicit enough.
+    """
+
+    def __init__(self, config: Dict[str, Any] = ROUTING_CONFIG):
+        self.min_confidence = config["fast_path"]["min_confidence"]
+        self.max_platforms = config["platform_selection"]["max_platforms"]
+        self.stats = {"fast_path": 0, "llm_fallback": 0}
+
+    def score(self, request: str, platforms: List[str], topic: str) -> float:
+        """Confidence in [0, 1] that the rule-based decision is correct."""
+        if not platforms or len(platforms) > self.max_platforms:
+            return 0.0
+        if AMBIGUITY_PATTERN.search(request):
+            return 0.0
+        return 0.6 + (0.4 if topic else 0.0)
+
+    def route(self, request: str) -> Optional[Dict[str, Any]]:
+        """
+        Route a request locally when confident enough.
+
+        Args:
+            request: User content request
+
+        Returns:
+            Routing decision dict, or None to fall back to the LLM router
+        """
+        platforms = extract_platforms(request)
+        topic = extract_topic(request)
+        confidence = self.score(request, platforms, topic)
+
+        if confidence < self.min_confidence:
+            self.stats["llm_fallback"] += 1
+            return None
+
+        self.stats["fast_path"] += 1
+        return {
+            "selected_platforms": platforms,
+            "confidence": "HIGH",
+            "reasoning": f"Fast-path routing: request explicitly names {', '.join(platforms)}",
+            "clarification_needed": False,
+            "content_focus": topic,
+            "fast_path": True
+        }
+
+    def fast_path_rate(self) -> float:
+        """Share of routed requests that skipped the LLM router."""
+        total = self.stats["fast_path"] + self.stats["llm_fallback"]
+        return self.stats["fast_path"] / total if total else 0.0
+
+
+# Shared router so fast-path statistics accumulate across requests
+_fast_router = FastPathRouter()
+
+
+def get_fast_router() -> FastPathRouter:
+    """Return the process-wide fast-path router."""
+    return _fast_router
@@ -2,9 +2,13 @@
 Parsing utilities for Smart Routing Pipeline
 JSON parsing, decision handling, and message building
 """
+from __future__ import annotations
+
 import json
-from typing import Dict, List, Any
-from google.adk.agents import LlmAgent
+from typing import TYPE_CHECKING, Dict, List, Any
+
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
 
 
 def parse_routing_decision(routing_json: str) -> Dict[str, Any]:
@@ -66,24 +70,13 @@ def get_selected_content_agents(selected_platforms: List[str]) -> List[LlmAgent]
     Returns:
         List of corresponding content agents
     """
-    from src.agents.content import (
-        x_content_specialist,
-        linkedin_content_specialist,
-        instagram_content_specialist,
-        blog_content_specialist
-    )
-    
-    platform_agents = {
-        "x_twitter": x_content_specialist,
-        "linkedin": linkedin_content_specialist,
-        "instagram": instagram_content_specialist,
-        "blog": blog_content_specialist
-    }
+    from src.agents import get_platform_agent
     
     agents = []
     for platform in selected_platforms:
-        if platform in platform_agents:
-            agents.append(platform_agents[platform])
+        agent = get_platform_agent(platform)
+        if agent:
+            agents.append(agent)
         else:
             print(f"Warning: Unknown platform: {platform}")
     
@@ -3,8 +3,164 @@ Quality Assessment Utilities
 Functions for parsing quality scores and managing feedback loops
 """
 import re
-from typing import Dict, Any, Optional, Tuple
-from src.config import QUALITY_SCORE_THRESHOLD
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+from src.config import QUALITY_SCORE_THRESHOLD, EARLY_STOPPING_CONFIG
+
+# Criteria the quality checker scores, in report order
+QUALITY_CRITERIA = {
+    "human authenticity": "human_authenticity",
+    "contextual relevance": "contextual_relevance",
+    "engagement potential": "engagement_potential",
+    "practical value": "practical_value",
+    "platform optimization": "platform_optimization"
+}
+
+QUALITY_VERDICTS = ("APPROVED", "MINOR_REVISION_NEEDED", "MAJOR_REVISION_NEEDED")
+
+# Why the quality loop stopped working on a platform
+STOP_REASONS = {
+    "approved": "approved",
+    "max_attempts": "max attempts reached",
+    "plateau": "score plateaued",
+    "similar_draft": "regeneration repeated the previous draft",
+    "close_enough": "close enough to threshold",
+    "token_budget": "token budget exhausted",
+    "regeneration_failed": "regeneration failed",
+    "assessment_failed": "quality assessment failed",
+    "reused": "reused approved content"
+}
+
+# Report sections whose body spans several lines
+_SECTIONS = {
+    "CONTEXTUAL IMPROVEMENTS": "improvements",
+    "PRIORITY FIX": "priority_fix",
+    "VERDICT": "verdict"
+}
+
+# Compiled once. Scans are anchored on literals ("**" headers, "/10" scores)
+# so a report is parsed in a few fast passes instead of repeated searches
+_BOLD_HEADER = re.compile(
+    r"\*\*(?P<name>[A-Z][A-Z /&_-]*[A-Z])\*\*(?:[ \t]*\([^)\n]*\))?[ \t]*:[ \t]*(?P<rest>.*)"
+)
+_PLAIN_HEADER = re.compile(
+    r"^\W*(?P<name>CONTEXTUAL IMPROVEMENTS|PRIORITY FIX|VERDICT)[^:\n]*:[ \t]*(?P<rest>.*)$",
+    re.MULTILINE
+)
+# Matched against the lowercased line that precedes a "/10"
+_SCORE_LABEL = re.compile(
+    r"[\W_]*(?:(?P<overall>overall score)|(?P<criterion>" + "|".join(QUALITY_CRITERIA) + r")"
+    r"|(?P<platform>x[_/ ]?twitter|twitter|x|linkedin|instagram|blog)\b)"
+    r"[^\w\n]*(?:score[^\w\n]*)?(?P<value>\d+(?:\.\d+)?)$"
+)
+_LABELLED_SCORE = re.compile(r"score[:\s]+(\d+(?:\.\d+)?)/10", re.IGNORECASE)
+_ANY_SCORE = re.compile(r"(\d+(?:\.\d+)?)/10")
+_VERDICT = re.compile(r"\b(" + "|".join(QUALITY_VERDICTS) + r")\b", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*(.*)$")
+
+_PLATFORM_CODES = {"linkedin": "linkedin", "instagram": "instagram", "blog": "blog"}
+
+
+@dataclass
+class QualityReport:
+    """Structured view of a quality checker report."""
+    overall_score: float = 0.0
+    score_found: bool = False
+    criteria: Dict[str, float] = field(default_factory=dict)
+    verdict: Optional[str] = None
+    priority_fix: Optional[str] = None
+    improvements: List[str] = field(default_factory=list)
+    platform_scores: Dict[str, float] = field(default_factory=dict)
+    text: str = ""
+
+
+def _clamp_score(value: str) -> float:
+    return min(max(float(value), 0.0), 10.0)
+
+
+def _platform_code(name: str) -> str:
+    return _PLATFORM_CODES.get(name.lower(), "x_twitter")
+
+
+def parse_quality_report(quality_result: str) -> QualityReport:
+    """
+    Parse a quality checker report into a QualityReport in one go.
+    
+    Args:
+        quality_result: String output from quality checker agent
+        
+    Returns:
+        QualityReport with the overall score, criterion scores, verdict,
+        priority fix, improvements and any per-platform scores
+    """
+    report = QualityReport(text=quality_result)
+    _parse_scores(quality_result, report)
+    
+    headers = list(_BOLD_HEADER.finditer(quality_result))
+    if not any(h.group("name") in _SECTIONS for h in headers):
+        # Reports without markdown bold ("VERDICT: APPROVED")
+        headers = sorted(headers + list(_PLAIN_HEADER.finditer(quality_result)), key=lambda h: h.start())
+    
+    for index, header in enumerate(headers):
+        section = _SECTIONS.get(header.group("name"))
+        if section is None:
+            continue
+        # Section bodies may start on the header line ("**VERDICT**: APPROVED")
+        body_end = headers[index + 1].start() if index + 1 < len(headers) else len(quality_result)
+        body = header.group("rest") + quality_result[header.end():body_end]
+        
+        if section == "improvements":
+            report.improvements = _parse_list_items(body)
+        elif section == "priority_fix":
+            report.priority_fix = " ".join(body.split()) or None
+        elif report.verdict is None:
+            verdict = _VERDICT.search(body)
+            report.verdict = verdict.group(1).upper() if verdict else None
+    
+    return report
+
+
+def _parse_scores(quality_result: str, report: QualityReport) -> None:
+    """Fill overall, criterion and platform scores from every "N/10" in the report."""
+    lowered = quality_result.lower()
+    position = lowered.find("/10")
+    while position != -1:
+        line_start = lowered.rfind("\n", 0, position) + 1
+        label = _SCORE_LABEL.match(lowered, line_start, position)
+        if label:
+            value = _clamp_score(label.group("value"))
+            if label.group("overall"):
+                if not report.score_found:
+                    report.overall_score, report.score_found = value, True
+            elif label.group("criterion"):
+                report.criteria[QUALITY_CRITERIA[label.group("criterion")]] = value
+            else:
+                report.platform_scores[_platform_code(label.group("platform"))] = value
+        position = lowered.find("/10", position + 3)
+    
+    if not report.score_found:
+        # Same fallbacks as before: any "Score: N/10", then the first "N/10"
+        fallback = _LABELLED_SCORE.search(quality_result) or _ANY_SCORE.search(quality_result)
+        if fallback:
+            report.overall_score, report.score_found = _clamp_score(fallback.group(1)), True
+
+
+def _parse_list_items(body: str) -> List[str]:
+    """Numbered or bulleted items; unmarked lines continue the previous item."""
+    items = []
+    for line in body.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        item = _LIST_ITEM.match(line)
+        if item:
+            if item.group(1):
+                items.append(item.group(1).strip())
+        elif items:
+            items[-1] += " " + line
+        else:
+            items.append(line)
+    return items
 
 
 def parse_quality_score(quality_result: str) -> float:
@@ -17,32 +173,10 @@ def parse_quality_score(quality_result: str) -> float:
     Returns:
         Float score between 0.0 and 10.0, or 0.0 if parsing fails
     """
-    try:
-        # Look for "OVERALL SCORE: X.X/10" or "Overall Score: X/10" patterns
-        score_patterns = [
-            r"OVERALL SCORE[:\s]+(\d+\.?\d*)/10",
-            r"Overall Score[:\s]+(\d+\.?\d*)/10",
-            r"Score[:\s]+(\d+\.?\d*)/10"
-        ]
-        
-        for pattern in score_patterns:
-            match = re.search(pattern, quality_result, re.IGNORECASE)
-            if match:
-                score = float(match.group(1))
-                return min(max(score, 0.0), 10.0)  # Clamp between 0-10
-        
-        # Fallback: look for any number followed by /10
-        fallback_match = re.search(r"(\d+\.?\d*)/10", quality_result)
-        if fallback_match:
-            score = float(fallback_match.group(1))
-            return min(max(score, 0.0), 10.0)
-            
+    report = parse_quality_report(quality_result)
+    if not report.score_found:
         print("Warning: Could not parse quality score from assessment")
-        return 0.0
-        
-    except (ValueError, AttributeError) as e:
-        print(f"Error parsing quality score: {e}")
-        return 0.0
+    return report.overall_score
 
 
 def extract_improvement_suggestions(quality_result: str) -> list:
@@ -53,38 +187,12 @@ def extract_improvement_suggestions(quality_result: str) -> list:
         quality_result: String output from quality checker agent
         
     Returns:
-        List of improvement suggestions
+        List of improvement suggestions (the priority fix if none are listed)
     """
-    suggestions = []
-    
-    try:
-        # Look for CONTEXTUAL IMPROVEMENTS section
-        improvements_match = re.search(
-            r"CONTEXTUAL IMPROVEMENTS[^:]*:(.+?)(?=\*\*|$)", 
-            quality_result, 
-            re.DOTALL | re.IGNORECASE
-        )
-        
-        if improvements_match:
-            improvements_text = improvements_match.group(1).strip()
-            # Split by numbered items (1., 2., 3.)
-            items = re.split(r'\d+\.', improvements_text)
-            suggestions = [item.strip() for item in items if item.strip()]
-        
-        # Fallback: look for Priority Fix
-        if not suggestions:
-            priority_match = re.search(
-                r"PRIORITY FIX[^:]*:(.+?)(?=\*\*|$)",
-                quality_result,
-                re.DOTALL | re.IGNORECASE
-            )
-            if priority_match:
-                suggestions = [priority_match.group(1).strip()]
-    
-    except Exception as e:
-        print(f"Error extracting improvement suggestions: {e}")
-    
-    return suggestions
+    report = parse_quality_report(quality_result)
+    if report.improvements:
+        return report.improvements
+    return [report.priority_fix] if report.priority_fix else []
 
 
 def format_regeneration_prompt(original_content: str, quality_feedback: str, attempt: int) -> str:
@@ -126,6 +234,55 @@ def is_score_acceptable(score: float, threshold: float = QUALITY_SCORE_THRESHOLD
     return score >= threshold
 
 
+def early_stop_reason(scores: List[float], threshold: float = QUALITY_SCORE_THRESHOLD,
+                      config: Dict[str, Any] = EARLY_STOPPING_CONFIG) -> Optional[str]:
+    """
+    Decide whether a platform below threshold is worth another regeneration.
+    
+    Args:
+        scores: The platform's scores so far, latest last
+        threshold: Minimum acceptable score (default from settings.py)
+        config: Early stopping settings (default from settings.py)
+        
+    Returns:
+        "close_enough" when the latest score is within the margin below the
+        threshold, "plateau" when the last regeneration gained less than
+        min_gain, otherwise None (keep regenerating)
+    """
+    if not config["enabled"] or not scores or scores[-1] >= threshold:
+        return None
+    if scores[-1] >= threshold - config["close_enough_margin"]:
+        return "close_enough"
+    if len(scores) >= 2 and scores[-1] - scores[-2] < config["min_gain"]:
+        return "plateau"
+    return None
+
+
+_SHINGLE_WORD = re.compile(r"\w+")
+
+
+def draft_similarity(previous: str, current: str) -> float:
+    """
+    Similarity of two drafts as the Jaccard index of their word trigrams.
+    
+    Linear in the draft length, unlike an edit-distance ratio, and
+    insensitive to whitespace and punctuation changes.
+    
+    Args:
+        previous: Earlier draft
+        current: Regenerated draft
+        
+    Returns:
+        0.0 (nothing shared) to 1.0 (same wording)
+    """
+    def shingles(text: str) -> set:
+        words = _SHINGLE_WORD.findall(text.lower())
+        return {tuple(words[i:i + 3]) for i in range(max(1, len(words) - 2))}
+    
+    a, b = shingles(previous), shingles(current)
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
 def should_retry_generation(score: float, attempt: int, max_attempts: int = 3, 
                            threshold: float = QUALITY_SCORE_THRESHOLD) -> bool:
     """
@@ -143,34 +300,55 @@ def should_retry_generation(score: float, attempt: int, max_attempts: int = 3,
     return score < threshold and attempt < max_attempts
 
 
-def format_final_result_with_attempts(content: str, scores_history: list, attempts: int) -> str:
+def format_final_result_with_attempts(content: str, scores_history: Dict[str, List[float]],
+                                      attempts: int,
+                                      stop_reasons: Optional[Dict[str, str]] = None) -> str:
     """
-    Format final result including attempt history for transparency.
+    Format final result including per-platform attempt history for transparency.
     
     Args:
         content: Final content
-        scores_history: List of scores from each attempt
-        attempts: Number of attempts made
+        scores_history: Dict of platform -> list of scores from each attempt
+        attempts: Number of assessment rounds made
+        stop_reasons: Optional platform -> STOP_REASONS key, shown for
+                      platforms that stopped under threshold
         
     Returns:
         Formatted final result with attempt history
     """
-    final_score = scores_history[-1] if scores_history else 0.0
     threshold = QUALITY_SCORE_THRESHOLD
+    final_scores = {platform: scores[-1] for platform, scores in scores_history.items() if scores}
+    final_score = sum(final_scores.values()) / len(final_scores) if final_scores else 0.0
+    approved = bool(final_scores) and all(score >= threshold for score in final_scores.values())
+    
+    history_lines = []
+    for platform, scores in scores_history.items():
+        if scores:
+            marker = "✅" if scores[-1] >= threshold else "⚠️"
+            reason = (stop_reasons or {}).get(platform)
+            stopped = f" (stopped: {STOP_REASONS.get(reason, reason)})" \
+                if reason and reason != "approved" else ""
+            history_lines.append(
+                f"  - {platform}: {' → '.join(f'{s:.1f}' for s in scores)} {marker}{stopped}"
+            )
+        else:
+            history_lines.append(f"  - {platform}: not scored")
+    history = "\n".join(history_lines)
     
     result = f"""**=== FINAL CONTENT WITH QUALITY ASSURANCE ===**
 
 **QUALITY OPTIMIZATION SUMMARY**
 - Attempts Made: {attempts}
-- Final Score: {final_score:.1f}/10
-- Score History: {' → '.join(f'{s:.1f}' for s in scores_history)}
-- Status: {"✅ APPROVED" if final_score >= threshold else "⚠️ BEST EFFORT (Under Threshold)"}
+- Final Score: {final_score:.1f}/10 (average across platforms)
+- Score History:
+{history}
+- Status: {"✅ APPROVED" if approved else "⚠️ BEST EFFORT (Under Threshold)"}
 
 **FINAL CONTENT**
 {content}
 
 **QUALITY NOTES**
-{"This content meets quality standards and is ready for publication." if final_score >= threshold else "This content was improved through multiple iterations but may need manual review before publication."}
+{"This content meets quality standards and is ready for publication." if approved else "Platforms under threshold were improved through multiple iterations but may need manual review before publication."}
 """
     
     return result
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Rate limiting utilities for Smart Routing Pipeline
+Shared token-bucket limiter for requests and tokens per minute, per model
+"""
+import asyncio
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+from src.config.settings import RATE_LIMITS
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Arrival order, the tie-breaker between waiters with the same order key
+_arrivals = itertools.count()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a piece of text.
+
+    Args:
+        text: Text that will be sent to the model
+
+    Returns:
+        Approximate token count (at least 1)
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `capacity` units."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.available = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0.0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def take(self, amount: float) -> None:
+        """Remove units from the bucket; may go negative to record overspend."""
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+
+class ModelRateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for a single model."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self._waiters: List[Tuple[Tuple, int]] = []
+        self._condition: Optional[asyncio.Condition] = None
+        self._condition_loop = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Conditions are bound to an event loop; recreate when a new loop is running
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+            self._waiters = []
+        return self._condition
+
+    async def acquire(self, estimated_tokens: int, order: Tuple = ()) -> float:
+        """
+        Wait until one request and `estimated_tokens` tokens fit in the quota.
+
+        Quota goes to one waiter at a time: the one with the lowest `order`
+        key, then the earliest arrival. A large request is not starved by a
+        stream of small ones, and a more urgent caller does not queue behind
+        less urgent ones.
+
+        Args:
+            estimated_tokens: Estimated input tokens for the request
+            order: Sort key of the caller (e.g. priority rank); lower is served first
+
+        Returns:
+            Seconds spent waiting for quota
+        """
+        condition = self._get_condition()
+        waiter = (tuple(order), next(_arrivals))
+        started = time.monotonic()
+        waited = False
+        async with condition:
+            self._waiters.append(waiter)
+            try:
+                while True:
+                    delay = None
+                    if min(self._waiters) == waiter:
+                        delay = max(
+                            self.requests.wait_time(1),
+                            self.tokens.wait_time(estimated_tokens)
+                        )
+                        if delay <= 0:
+                            self.requests.take(1)
+                            self.tokens.take(estimated_tokens)
+                            return time.monotonic() - started if waited else 0.0
+                    # Wake when the quota should fit, or when the waiters change
+                    waited = True
+                    try:
+                        await asyncio.wait_for(condition.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiters.remove(waiter)
+                condition.notify_all()
+
+    def record_tokens(self, extra_tokens: int) -> None:
+        """Charge tokens that were not known at acquire time (e.g. corrections)."""
+        if extra_tokens > 0:
+            self.tokens.take(extra_tokens)
+
+
+class RateLimiter:
+    """Registry of per-model limiters configured from RATE_LIMITS."""
+
+    def __init__(self, limits: Dict[str, Dict[str, int]] = RATE_LIMITS):
+        self.limits = limits
+        self._models: Dict[str, ModelRateLimiter] = {}
+
+    def configure(self, limits: Dict[str, Dict[str, int]]) -> None:
+        """Replace the limits; per-model buckets are rebuilt on next use."""
+        self.limits = limits
+        self._models.clear()
+
+    def for_model(self, model: str) -> ModelRateLimiter:
+        """Get (or create) the limiter for a model name."""
+        if model not in self._models:
+            config = self.limits.get(model, self.limits["default"])
+            self._models[model] = ModelRateLimiter(
+                config["requests_per_minute"],
+                config["tokens_per_minute"]
+            )
+        return self._models[model]
+
+    async def acquire(self, model: str, estimated_tokens: int, order: Tuple = ()) -> float:
+        """
+        Wait for quota on a model before sending a request.
+
+        Args:
+            model: Model name the request is sent to
+            estimated_tokens: Estimated input tokens for the request
+            order: Sort key of the caller; lower keys get quota first
+
+        Returns:
+            Seconds spent waiting for quota
+        """
+        waited = await self.for_model(model).acquire(estimated_tokens, order)
+        if waited > 0:
+            print(f"   ⏳ Rate limit: waited {waited:.1f}s for {model} quota")
+        return waited
+
+    def record_tokens(self, model: str, extra_tokens: int) -> None:
+        """
+        Charge tokens a request used beyond its estimate.
+
+        Args:
+            model: Model name the request was sent to
+            extra_tokens: Actual minus estimated tokens (ignored when not positive)
+        """
+        self.for_model(model).record_tokens(extra_tokens)
+
+
+# Shared limiter used by every agent call in the process
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    return _rate_limiter
@@ -0,0 +1,138 @@
+"""
+Local repair for Smart Routing Pipeline
+Deterministic fixes for mechanical constraint violations, so drafts that are
+only slightly off don't need a full specialist regeneration
+"""
+import re
+from typing import List, Optional
+from src.utils.validation import (
+    PLATFORM_RULES,
+    HASHTAG_PATTERN,
+    RED_FLAG_PATTERN,
+    ConstraintViolation,
+    check_platform_constraints,
+    content_length,
+    wrapping_quotes
+)
+
+# Rules a local repair can satisfy; anything else needs the LLM
+REPAIRABLE_RULES = {"max_chars", "hashtags", "wrapping_quotes", "red_flag"}
+
+# Trimming more than this share of a draft changes its message; regenerate instead
+MAX_TRIM_RATIO = 0.25
+
+_HASHTAG_ONLY_LINE = re.compile(r"^\s*(?:#[A-Za-z]\w*[\s,]*)+$")
+_TRAILING_HASHTAGS = re.compile(r"(?:[ \t]*(?<![\w&/])#[A-Za-z]\w*)+[ \t]*$", re.MULTILINE)
+_TAKEAWAY_HEADING = re.compile(r"^[\s#*_>-]*key takeaways?\b[\s:*_]*$", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])[\"')\]]*\s+")
+_SENTENCE_END = re.compile(r"[.!?…][\"')\]]*(?=\s|$)|\n")
+_EXTRA_SPACES = re.compile(r"(?<=\S)[ \t]{2,}")
+_EXTRA_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def strip_wrapping_quotes(content: str) -> str:
+    """Remove quotation marks wrapped around the whole draft (one quoted span only)."""
+    text = content.strip()
+    if wrapping_quotes(text):
+        return text[1:-1].strip()
+    return text
+
+
+def strip_hashtags(content: str) -> str:
+    """Drop hashtag-only lines and trailing hashtag runs; unhash inline ones (#AI -> AI)."""
+    lines = [line for line in content.splitlines() if not _HASHTAG_ONLY_LINE.match(line)]
+    text = _TRAILING_HASHTAGS.sub("", "\n".join(lines))
+    text = HASHTAG_PATTERN.sub(lambda match: match.group(0)[1:], text)
+    return _tidy(text)
+
+
+def remove_red_flags(content: str) -> str:
+    """
+    Remove red-flag phrases: a "Key takeaways" heading goes with the list under
+    it, and any other flagged phrase takes its sentence with it.
+    """
+    kept = []
+    in_takeaways = False
+    for line in content.splitlines():
+        if in_takeaways:
+            if not line.strip() or _LIST_ITEM.match(line):
+                continue
+            in_takeaways = False
+
+        if not RED_FLAG_PATTERN.search(line):
+            kept.append(line)
+            continue
+        if _TAKEAWAY_HEADING.match(line):
+            in_takeaways = True
+            continue
+
+        sentences = [s for s in _SENTENCE_BOUNDARY.split(line) if not RED_FLAG_PATTERN.search(s)]
+        if sentences:
+            kept.append(" ".join(sentences))
+
+    return _tidy("\n".join(kept))
+
+
+def trim_to_length(platform: str, content: str, max_length: int) -> Optional[str]:
+    """
+    Cut a draft back to the last sentence or line boundary that fits.
+
+    Args:
+        platform: Platform name (decides how length is counted)
+        content: Draft content
+        max_length: Platform length limit
+
+    Returns:
+        Trimmed draft, or None when no boundary fits without losing
+        more than MAX_TRIM_RATIO of the draft
+    """
+    text = content.strip()
+    if content_length(platform, text) <= max_length:
+        return text
+
+    minimum_kept = len(text) * (1 - MAX_TRIM_RATIO)
+    cut_points = sorted({match.end() for match in _SENTENCE_END.finditer(text)}, reverse=True)
+    for cut in cut_points:
+        if cut < minimum_kept:
+            break
+        candidate = text[:cut].strip()
+        if content_length(platform, candidate) <= max_length:
+            return candidate
+    return None
+
+
+def repair_draft(platform: str, content: str,
+                 violations: List[ConstraintViolation]) -> Optional[str]:
+    """
+    Try to fix a draft's violations locally.
+
+    Args:
+        platform: Platform name (x_twitter, linkedin, instagram, blog)
+        content: Draft content
+        violations: Violations reported by check_platform_constraints
+
+    Returns:
+        Repaired draft that passes every platform rule, or None when the
+        draft needs an LLM regeneration instead
+    """
+    if not violations or any(v.rule not in REPAIRABLE_RULES for v in violations):
+        return None
+
+    repaired = strip_wrapping_quotes(content)
+    repaired = remove_red_flags(repaired)
+    repaired = strip_hashtags(repaired)
+
+    max_chars = PLATFORM_RULES.get(platform, {}).get("max_chars")
+    if max_chars:
+        repaired = trim_to_length(platform, repaired, max_chars)
+
+    if not repaired or check_platform_constraints(platform, repaired):
+        return None
+    return repaired
+
+
+def _tidy(text: str) -> str:
+    text = _EXTRA_SPACES.sub(" ", text)
+    text = _EXTRA_BLANK_LINES.sub("\n\n", text)
+    return "\n".join(line.rstrip() for line in text.splitlines()).strip()
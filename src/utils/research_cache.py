@@ -0,0 +1,139 @@
+"""
+Topic-scoped research cache for Smart Routing Pipeline
+Reuses research insights across requests and platforms until they go stale
+"""
+import asyncio
+import re
+from typing import Awaitable, Callable, Dict, Tuple
+from src.config import RESEARCH_CONFIG
+from src.utils.cache import AgentCallCache
+
+# Words that don't change what a topic is about
+_TOPIC_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "for", "to", "in", "on", "about", "with",
+    "content", "post", "posts", "tips", "insights"
+}
+_TOPIC_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_topic(content_focus: str) -> str:
+    """
+    Normalize a content focus so equivalent topics share a cache entry.
+
+    "Remote Work Productivity", "productivity of remote work" and
+    "remote-work productivity tips" all normalize to "productivity remote work".
+
+    Args:
+        content_focus: Topic/angle from the routing decision
+
+    Returns:
+        Normalized topic key, or "" when there is no usable topic
+    """
+    words = {word for word in _TOPIC_WORD.findall(content_focus.lower())
+             if word not in _TOPIC_STOPWORDS}
+    if not words or words == {"unknown"}:
+        return ""
+    return " ".join(sorted(words))
+
+
+def build_topic_research_prompt(content_focus: str) -> str:
+    """
+    Build a research prompt that depends only on the topic, so the result
+    can be shared by any request and platform selection on that topic.
+
+    Args:
+        content_focus: Topic/angle from the routing decision
+
+    Returns:
+        Research prompt covering all supported platforms
+    """
+    return f"""Research current trends and information about: {content_focus}
+
+Target platforms: X/Twitter, LinkedIn, Instagram, Blog
+
+Provide relevant, current data that would enhance content creation about this topic on any of these platforms."""
+
+
+class ResearchCache:
+    """
+    Research results keyed by normalized topic with a freshness window.
+
+    Concurrent requests for the same topic share one research call rather
+    than each missing the cache and researching independently. If the
+    request running that call is cancelled, a waiting request takes over.
+    """
+
+    def __init__(self, config: Dict = RESEARCH_CONFIG):
+        self.enabled = config["cache_enabled"]
+        self._store = AgentCallCache({
+            "enabled": True,
+            "agents": {},
+            "directory": config["cache_directory"],
+            "ttl_seconds": config["cache_ttl_seconds"],
+            "max_memory_entries": 256,
+            "max_disk_bytes": 64 * 1024 * 1024
+        })
+        self._in_flight: Dict[str, "asyncio.Future[str]"] = {}
+
+    @property
+    def stats(self) -> Dict:
+        return self._store.stats
+
+    async def get_or_research(self, content_focus: str,
+                              research: Callable[[str], Awaitable[str]]) -> Tuple[str, bool]:
+        """
+        Return fresh cached research for a topic, or run `research` and cache it.
+
+        Args:
+            content_focus: Topic/angle from the routing decision
+            research: Coroutine function called with the research prompt on a miss
+
+        Returns:
+            Tuple of (research_data, served_from_cache)
+        """
+        topic = normalize_topic(content_focus)
+        if not self.enabled or not topic:
+            return await research(build_topic_research_prompt(content_focus)), False
+
+        key = self._store.make_key("research", "", "", topic)
+        while True:
+            cached = await self._store.get(key, "research")
+            if cached is not None:
+                return cached, True
+            leader = self._in_flight.get(topic)
+            if leader is None:
+                break
+            # wait() doesn't pass on the leader's cancellation: when its request
+            # is cancelled, check again and research here if nobody else has
+            await asyncio.wait({leader})
+            if not leader.cancelled():
+                return leader.result(), True
+
+        future: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+        self._in_flight[topic] = future
+        try:
+            research_data = await research(build_topic_research_prompt(content_focus))
+            # Failed runs raise instead, so anything returned is real research
+            if research_data:
+                await self._store.put(key, "research", research_data)
+            future.set_result(research_data)
+            return research_data, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[topic]
+
+
+# Shared research cache used by the pipeline
+_research_cache = ResearchCache()
+
+
+def get_research_cache() -> ResearchCache:
+    """Return the process-wide research cache."""
+    return _research_cache
@@ -0,0 +1,213 @@
+"""
+Research slicing for Smart Routing Pipeline
+Parses ResearchEnhancer output into sections and builds platform-specific
+slices, so each prompt carries only the research its platform uses
+"""
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+from src.config import RESEARCH_CONFIG
+from src.utils.rate_limiter import estimate_tokens
+
+# Research output sections (matched case-insensitively in bold headers) -> key
+RESEARCH_SECTIONS = {
+    "conversation starters": "starters",
+    "story-worthy examples": "examples",
+    "human connection points": "connections",
+    "fresh context": "context",
+    "natural integration suggestions": "integration"
+}
+SECTION_TITLES = {
+    "starters": "Conversation Starters",
+    "examples": "Story-Worthy Examples",
+    "connections": "Human Connection Points",
+    "context": "Fresh Context",
+    "integration": "Natural Integration Suggestions"
+}
+
+# Items per section each platform uses (None = all); sections not listed are
+# left out. The platform's own integration suggestion is always included.
+PLATFORM_SLICES: Dict[str, Dict[str, Optional[int]]] = {
+    "x_twitter": {"starters": 2},
+    "linkedin": {"starters": 2, "examples": 1, "connections": 1, "context": 1},
+    "instagram": {"starters": 1, "examples": 1, "connections": 2},
+    "blog": {"starters": None, "examples": None, "connections": None, "context": None}
+}
+
+# Platform labels in integration suggestions, as written and as parsed
+PLATFORM_LABELS = {
+    "x_twitter": "X/Twitter",
+    "linkedin": "LinkedIn",
+    "instagram": "Instagram",
+    "blog": "Blog"
+}
+INTEGRATION_LABELS = {
+    "x/twitter": "x_twitter",
+    "x": "x_twitter",
+    "twitter": "x_twitter",
+    "linkedin": "linkedin",
+    "instagram": "instagram",
+    "blog": "blog"
+}
+
+_HEADER = re.compile(r"^(?:#+\s*)?\*\*(?P<title>[^*]+)\*\*|^#+\s*(?P<heading>[^*]+)")
+_ITEM = re.compile(r"^(?:[-*•]|\d+[.)])\s+(?P<text>.+)$")
+_INTEGRATION_ITEM = re.compile(r"^(?P<label>[A-Za-z/]+)\s*:\s*(?P<text>.+)$")
+
+
+@dataclass
+class ResearchSections:
+    """Research output split into section items."""
+    items: Dict[str, List[str]] = field(default_factory=dict)   # Section key -> items
+    integration: Dict[str, str] = field(default_factory=dict)   # Platform -> suggestion
+
+    @property
+    def parsed(self) -> bool:
+        return bool(self.items or self.integration)
+
+
+@lru_cache(maxsize=32)
+def parse_research(research_data: str) -> ResearchSections:
+    """
+    Split research output into its sections.
+
+    Items are bullet or numbered lines under a recognised bold or markdown
+    header; continuation lines are joined onto the previous item. Headers
+    the parser doesn't know (e.g. "Avoid Academic Research Patterns") end
+    the current section.
+
+    Args:
+        research_data: ResearchEnhancer output
+
+    Returns:
+        ResearchSections (empty when the output has no recognisable sections)
+    """
+    sections = ResearchSections()
+    current = None
+    for raw_line in research_data.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        header = _HEADER.match(line)
+        if header:
+            title = (header.group("title") or header.group("heading")).strip().rstrip(":").lower()
+            current = next((key for name, key in RESEARCH_SECTIONS.items() if title.startswith(name)), None)
+            continue
+        if current is None:
+            continue
+
+        item = _ITEM.match(line)
+        if item:
+            text = item.group("text").strip()
+            if current == "integration":
+                labelled = _INTEGRATION_ITEM.match(text.replace("**", ""))
+                platform = labelled and INTEGRATION_LABELS.get(labelled.group("label").lower())
+                if platform:
+                    sections.integration[platform] = labelled.group("text").strip()
+                continue
+            sections.items.setdefault(current, []).append(text)
+        elif current != "integration" and sections.items.get(current):
+            sections.items[current][-1] += " " + line
+
+    return sections
+
+
+def format_research_slice(sections: ResearchSections, platforms: List[str]) -> str:
+    """
+    Build the research text for one or more platforms.
+
+    With several platforms each section keeps as many items as the most
+    demanding platform uses.
+
+    Args:
+        sections: Parsed research
+        platforms: Platforms the slice is for
+
+    Returns:
+        Research text containing only the sections and items those platforms use
+    """
+    limits: Dict[str, Optional[int]] = {}
+    for platform in platforms:
+        for key, count in PLATFORM_SLICES.get(platform, PLATFORM_SLICES["blog"]).items():
+            if key not in limits:
+                limits[key] = count
+            elif limits[key] is not None:
+                limits[key] = None if count is None else max(limits[key], count)
+
+    blocks = []
+    for key in SECTION_TITLES:
+        if key == "integration":
+            suggestions = [f"- {PLATFORM_LABELS[p]}: {sections.integration[p]}"
+                           for p in platforms if p in sections.integration]
+            if suggestions:
+                blocks.append(f"**{SECTION_TITLES[key]}**:\n" + "\n".join(suggestions))
+            continue
+        if key not in limits or not sections.items.get(key):
+            continue
+        items = sections.items[key][:limits[key]]
+        blocks.append(f"**{SECTION_TITLES[key]}**:\n" + "\n".join(f"- {item}" for item in items))
+
+    return "**RESEARCH INSIGHTS FOR NATURAL INTEGRATION**\n\n" + "\n\n".join(blocks)
+
+
+class ResearchSlicer:
+    """
+    Serves platform slices of research and tracks the prompt-size reduction.
+
+    Research that can't be parsed is passed through whole. With
+    RESEARCH_CONFIG["slicing"]["report"] enabled each slice prints its size
+    against the full research.
+    """
+
+    def __init__(self, config: Dict = RESEARCH_CONFIG["slicing"]):
+        self.config = config
+        self.stats = {"slices": 0, "passthrough": 0, "full_chars": 0, "sliced_chars": 0}
+
+    def slice(self, research_data: str, platforms: List[str], purpose: str) -> str:
+        """
+        Research for the given platforms.
+
+        Args:
+            research_data: Full research output
+            platforms: Platforms the prompt is for
+            purpose: What the slice is used for, shown in reports ("linkedin generation")
+
+        Returns:
+            Sliced research, or research_data when slicing is off or not possible
+        """
+        if not self.config["enabled"]:
+            return research_data
+
+        sections = parse_research(research_data)
+        if not sections.parsed:
+            self.stats["passthrough"] += 1
+            return research_data
+
+        sliced = format_research_slice(sections, platforms)
+        self.stats["slices"] += 1
+        self.stats["full_chars"] += len(research_data)
+        self.stats["sliced_chars"] += len(sliced)
+
+        if self.config["report"]:
+            reduction = 1 - len(sliced) / len(research_data)
+            print(f"   ✂️ Research for {purpose}: {len(research_data):,} → {len(sliced):,} chars "
+                  f"(~{estimate_tokens(research_data) - estimate_tokens(sliced):,} tokens saved, "
+                  f"{reduction:.0%} smaller)")
+        return sliced
+
+    def reduction(self) -> float:
+        """Fraction of research characters removed across all slices so far."""
+        if not self.stats["full_chars"]:
+            return 0.0
+        return 1 - self.stats["sliced_chars"] / self.stats["full_chars"]
+
+
+# Shared slicer used by the pipeline
+_research_slicer = ResearchSlicer()
+
+
+def get_research_slicer() -> ResearchSlicer:
+    """Return the process-wide research slicer."""
+    return _research_slicer
@@ -0,0 +1,203 @@
+"""
+Resilience utilities for Smart Routing Pipeline
+Typed agent errors, retry classification with jittered backoff and
+Retry-After support, and a circuit breaker per model
+"""
+import asyncio
+import json
+import random
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from src.config.settings import RESILIENCE_CONFIG
+
+# HTTP statuses worth retrying: timeouts, quota and server-side failures
+_TRANSIENT_STATUS = {408, 429}
+_RETRY_DELAY = re.compile(r'retryDelay\W+(\d+(?:\.\d+)?)s')
+
+
+@lru_cache(maxsize=1)
+def _transient_exceptions() -> Tuple[type, ...]:
+    """Connection-level exception types (httpx is only imported once a call has failed)."""
+    try:
+        import httpx
+        return (ConnectionError, TimeoutError, httpx.TransportError)
+    except ImportError:
+        return (ConnectionError, TimeoutError)
+
+
+class AgentCallError(RuntimeError):
+    """An agent call failed (after any retries the failure allowed)."""
+
+    def __init__(self, agent: str, message: str, retryable: bool = False, attempts: int = 0):
+        super().__init__(f"{agent}: {message}")
+        self.agent = agent
+        self.retryable = retryable
+        self.attempts = attempts
+
+
+class AgentTimeoutError(AgentCallError):
+    """Every attempt of an agent call exceeded its timeout."""
+
+
+class CircuitOpenError(AgentCallError):
+    """The model's circuit breaker is open, so the call was not attempted."""
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Server-requested delay from a Retry-After header or a Gemini RetryInfo detail.
+
+    Args:
+        error: Exception raised by the model client
+
+    Returns:
+        Seconds to wait, or None when the error carries no hint
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            from email.utils import parsedate_to_datetime
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    details = getattr(error, "details", None)
+    if details:
+        match = _RETRY_DELAY.search(details if isinstance(details, str) else json.dumps(details, default=str))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def classify_error(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """
+    Decide whether a failed model call is worth retrying.
+
+    Timeouts, connection failures, 408/429 and 5xx responses are transient;
+    other client errors (bad request, auth, not found) are not.
+
+    Args:
+        error: Exception raised by the attempt
+
+    Returns:
+        Tuple of (retryable, retry_after_seconds or None)
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True, None
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        if code in _TRANSIENT_STATUS or code >= 500:
+            return True, retry_after_seconds(error)
+        return False, None
+    return isinstance(error, _transient_exceptions()), None
+
+
+def backoff_delay(retry: int, config: Dict = RESILIENCE_CONFIG) -> float:
+    """
+    Exponential backoff with full jitter for the given retry (0-indexed).
+
+    Returns:
+        Seconds drawn uniformly from [0, min(max, base * 2**retry)]
+    """
+    ceiling = min(config["backoff_max_seconds"], config["backoff_base_seconds"] * (2 ** retry))
+    return random.uniform(0, ceiling)
+
+
+def agent_setting(key: str, agent_name: str, config: Dict = RESILIENCE_CONFIG) -> Optional[float]:
+    """Per-agent value of a setting such as timeout_seconds, falling back to its default."""
+    values = config[key]
+    return values.get(agent_name, values["default"])
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one model.
+
+    Closed: calls flow. After `failure_threshold` consecutive transient
+    failures it opens and calls fail fast. After `reset_seconds` one trial
+    call is let through (half-open); its success closes the circuit and its
+    failure opens it again. A trial that ends without an outcome (cancelled)
+    is abandoned, letting the next call make the trial instead.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now (claims the trial call when half-open)."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def abandon_trial(self) -> None:
+        """Release the half-open trial claim of a call that ended without an outcome."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            if self.opened_at is None:
+                print(f"   ⚡ Circuit opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit allows a trial call."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers per model name configured from RESILIENCE_CONFIG."""
+
+    def __init__(self, config: Dict = RESILIENCE_CONFIG["circuit_breaker"]):
+        self.config = config
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def for_model(self, model: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a model name."""
+        if model not in self._breakers:
+            self._breakers[model] = CircuitBreaker(
+                self.config["failure_threshold"], self.config["reset_seconds"]
+            )
+        return self._breakers[model]
+
+    def states(self) -> Dict[str, str]:
+        return {model: breaker.state for model, breaker in self._breakers.items()}
+
+
+# Shared breakers used by every agent call in the process
+_circuit_breakers = CircuitBreakerRegistry()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Return the process-wide circuit breaker registry."""
+    return _circuit_breakers
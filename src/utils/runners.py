@@ -2,61 +2,416 @@
 Agent runner utilities for Smart Routing Pipeline
 Handles agent execution and session management
 """
-from google.adk.agents import LlmAgent
-from google.adk.runners import InMemoryRunner
-from google.genai import types
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from contextlib import aclosing, asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from src.config.settings import RESILIENCE_CONFIG, SINGLE_FLIGHT_CONFIG
+from src.utils.rate_limiter import get_rate_limiter, estimate_tokens
+from src.utils.cache import get_agent_cache
+from src.utils.tracing import get_tracer
+from src.utils.token_usage import TokenUsage
+from src.utils.single_flight import SingleFlight
+from src.utils.scheduler import get_scheduler
+from src.utils.resilience import (
+    AgentCallError,
+    AgentTimeoutError,
+    CircuitOpenError,
+    agent_setting,
+    backoff_delay,
+    classify_error,
+    get_circuit_breakers
+)
+
+# Google ADK is imported on the first agent call, not at import time
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
+    from google.adk.runners import InMemoryRunner
+
+
+class RunnerPool:
+    """Reusable InMemoryRunner per agent instead of one runner per call."""
+    
+    def __init__(self):
+        self._runners: Dict[int, InMemoryRunner] = {}
+    
+    def get(self, agent: LlmAgent) -> InMemoryRunner:
+        """Return the pooled runner for an agent, creating it on first use."""
+        # Keyed by identity: agents in different pipelines may share a name.
+        # The runner holds a reference to its agent, so the id stays unique.
+        runner = self._runners.get(id(agent))
+        if runner is None:
+            from google.adk.runners import InMemoryRunner
+            runner = InMemoryRunner(agent)
+            self._runners[id(agent)] = runner
+        return runner
+    
+    def __len__(self) -> int:
+        return len(self._runners)
+
+
+class SessionManager:
+    """
+    Gives every agent run a fresh ADK session on its pooled runner.
+    
+    The session is deleted when the run ends, so calls stay stateless like
+    one runner per call was and no earlier turns are sent with the prompt.
+    """
+    
+    def __init__(self):
+        self.stats = {"created": 0, "deleted": 0}
+    
+    @asynccontextmanager
+    async def session(self, runner: InMemoryRunner, user_id: str, session_id: str) -> AsyncIterator[str]:
+        """
+        Hold a session of its own ("<session_id>:call-<id>") for one agent run.
+        
+        Yields:
+            Session ID to run the agent in
+        """
+        call_session_id = f"{session_id}:call-{uuid.uuid4().hex[:8]}"
+        await runner.session_service.create_session(
+            app_name=runner.app_name,
+            user_id=user_id,
+            session_id=call_session_id
+        )
+        self.stats["created"] += 1
+        try:
+            yield call_session_id
+        finally:
+            await runner.session_service.delete_session(
+                app_name=runner.app_name,
+                user_id=user_id,
+                session_id=call_session_id
+            )
+            self.stats["deleted"] += 1
+
+
+# Shared pool and session manager used by every agent call in the process
+_runner_pool = RunnerPool()
+_session_manager = SessionManager()
+# Concurrent identical agent calls (SINGLE_FLIGHT_CONFIG["agent_calls"])
+_agent_flights = SingleFlight("agent_call")
+
+
+def get_session_manager() -> SessionManager:
+    """Return the process-wide session manager."""
+    return _session_manager
+
+
+def get_model_name(agent: LlmAgent) -> str:
+    """
+    Get the model name an agent sends requests to.
+    
+    Args:
+        agent: The LlmAgent to inspect
+        
+    Returns:
+        Model name string (used to key per-model limits)
+    """
+    if isinstance(agent.model, str):
+        return agent.model
+    return getattr(agent.model, "model", str(agent.model))
 
 
 async def run_single_agent(agent: LlmAgent, user_id: str, session_id: str, 
-                          input_text: str) -> str:
+                          input_text: str,
+                          on_partial: Optional[Callable[[str], None]] = None) -> str:
     """
     Run a single agent and return its output.
     
+    Each attempt has a per-agent timeout. Transient failures (timeouts,
+    429, 5xx, connection errors) are retried with jittered exponential
+    backoff, or after the server's Retry-After. An attempt slower than the
+    agent's hedge delay gets a duplicate attempt in a separate session and
+    the first answer wins. Calls fail fast while the model's circuit breaker
+    is open. See RESILIENCE_CONFIG. With SINGLE_FLIGHT_CONFIG["agent_calls"],
+    a call identical to one already running (same agent, model, instruction
+    and input) waits for that call's result instead of calling the model.
+    
+    Every model call first waits for a slot from the shared scheduler, which
+    serves the current request's priority and tenant (see SCHEDULER_CONFIG).
+    
     Args:
         agent: The LlmAgent to run
         user_id: User identifier
         session_id: Session identifier
         input_text: Input text/prompt for the agent
+        on_partial: Optional callback receiving model text chunks as they
+                    stream; enables SSE streaming when provided (and
+                    disables hedging, so chunks come from one attempt)
         
     Returns:
         Agent's response as string
+        
+    Raises:
+        CircuitOpenError: The model's circuit breaker is open
+        AgentTimeoutError: The last attempt timed out
+        AgentCallError: A non-retryable failure, or retries were exhausted
     """
-    try:
-        # Create runner for individual agent
-        runner = InMemoryRunner(agent)
+    tracer = get_tracer()
+    with tracer.span("agent_call", agent=agent.name) as span:
+        model_name = get_model_name(agent)
+        instruction = str(agent.instruction)
         
-        # Create session
-        await runner.session_service.create_session(
-            app_name=runner.app_name,
-            user_id=user_id,
-            session_id=session_id
-        )
+        # Identical calls are answered from the memoization cache when enabled
+        cache = get_agent_cache()
+        cache_key = None
+        if cache.is_enabled_for(agent.name):
+            cache_key = cache.make_key(agent.name, model_name, instruction, input_text)
+            cached_result = await cache.get(cache_key, agent.name)
+            if cached_result is not None:
+                span.attributes["cached"] = True
+                if on_partial:
+                    on_partial(cached_result)
+                return cached_result
         
-        # Create input content
-        user_content = types.Content(
-            role='user',
-            parts=[types.Part(text=input_text)]
-        )
+        # Concurrent identical calls share one execution when enabled
+        if SINGLE_FLIGHT_CONFIG["agent_calls"] and on_partial is None:
+            flight_key = cache_key or cache.make_key(agent.name, model_name, instruction, input_text)
+            final_result, coalesced = await _agent_flights.run(
+                flight_key,
+                lambda: _call_with_retries(agent, model_name, instruction, user_id, session_id,
+                                           input_text, None, span)
+            )
+            if coalesced:
+                span.attributes["coalesced"] = True
+        else:
+            final_result = await _call_with_retries(
+                agent, model_name, instruction, user_id, session_id, input_text, on_partial, span
+            )
         
-        # Execute agent
-        final_result = ""
-        async for event in runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=user_content
-        ):
-            if event.is_final_response() and event.content:
-                if hasattr(event.content, 'text') and event.content.text:
-                    final_result = event.content.text
-                elif event.content.parts:
-                    text_parts = [part.text for part in event.content.parts 
-                                if hasattr(part, 'text') and part.text]
-                    final_result = "".join(text_parts)
-                break
+        if cache_key and final_result:
+            await cache.put(cache_key, agent.name, final_result)
         
         return final_result
+
+
+async def _call_with_retries(agent: LlmAgent, model_name: str, instruction: str, user_id: str,
+                             session_id: str, input_text: str,
+                             on_partial: Optional[Callable[[str], None]], span: Any) -> str:
+    """Retry loop of run_single_agent: hedged attempts, backoff and the circuit breaker."""
+    tracer = get_tracer()
+    breaker = get_circuit_breakers().for_model(model_name)
+    max_retries = RESILIENCE_CONFIG["max_retries"]
+    for retry in range(max_retries + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(
+                agent.name, f"circuit open for {model_name}, next trial in {breaker.retry_in():.0f}s",
+                retryable=True, attempts=retry
+            )
+        trial = breaker.state == "half_open"
+        try:
+            final_result = await _run_hedged(
+                agent, model_name, instruction, user_id, session_id, input_text, on_partial, span
+            )
+            breaker.record_success()
+            break
+        except Exception as e:
+            retryable, retry_after = classify_error(e)
+            if retryable:
+                breaker.record_failure()
+            else:
+                # The backend answered; the request itself was bad
+                breaker.record_success()
+            
+            timed_out = isinstance(e, asyncio.TimeoutError)
+            reason = f"timed out after {agent_setting('timeout_seconds', agent.name):.0f}s" \
+                if timed_out else f"{type(e).__name__}: {e}"
+            if not retryable or retry == max_retries:
+                error_type = AgentTimeoutError if timed_out else AgentCallError
+                raise error_type(agent.name, reason, retryable, retry + 1) from e
+            if retry_after is not None and retry_after > RESILIENCE_CONFIG["max_retry_after_seconds"]:
+                raise AgentCallError(
+                    agent.name, f"{reason} (Retry-After {retry_after:.0f}s)", retryable, retry + 1
+                ) from e
+            
+            delay = retry_after if retry_after is not None else backoff_delay(retry)
+            print(f"   ↻ {agent.name} {reason} - retry {retry + 1}/{max_retries} in {delay:.1f}s")
+            span.attributes["retries"] = retry + 1
+            tracer.record_sleep(delay)
+            await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled mid-attempt: no outcome to record, but a claimed trial
+            # must be released or the breaker stays half-open with no trial allowed
+            if trial:
+                breaker.abandon_trial()
+            raise
+    
+    return final_result
+
+
+async def _run_hedged(agent: LlmAgent, model_name: str, instruction: str, user_id: str,
+                      session_id: str, input_text: str,
+                      on_partial: Optional[Callable[[str], None]], span: Any) -> str:
+    """Run one attempt, racing a duplicate in its own session if it is slow to answer."""
+    hedge_after = agent_setting("hedge_after_seconds", agent.name)
+    tasks = [asyncio.ensure_future(_run_attempt(
+        agent, model_name, instruction, user_id, session_id, input_text, on_partial, span
+    ))]
+    try:
+        if hedge_after is None or on_partial is not None:
+            return await tasks[0]
+        
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            print(f"   ⑂ {agent.name}: no answer after {hedge_after:.0f}s, starting a hedged attempt")
+            span.attributes["hedged"] = True
+            tasks.append(asyncio.ensure_future(_run_attempt(
+                agent, model_name, instruction, user_id,
+                f"{session_id}:hedge-{uuid.uuid4().hex[:8]}", input_text, None, span
+            )))
         
-    except Exception as e:
-        error_msg = f"Error running {agent.name}: {str(e)}"
-        print(error_msg)
-        return error_msg
\ No newline at end of file
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not tasks[0]:
+                        span.attributes["hedge_won"] = True
+                    return task.result()
+        # Every attempt failed: report the original attempt's error
+        return tasks[0].result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def _run_attempt(agent: LlmAgent, model_name: str, instruction: str, user_id: str,
+                       session_id: str, input_text: str,
+                       on_partial: Optional[Callable[[str], None]], span: Any) -> str:
+    """Make one model call within the agent's timeout and account its usage."""
+    tracer = get_tracer()
+    scheduler = get_scheduler()
+    rate_limiter = get_rate_limiter()
+    estimated_input = estimate_tokens(instruction + input_text)
+    
+    # Reuse the pooled runner for this agent
+    runner = _runner_pool.get(agent)
+    
+    # Create input content
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    from google.genai import types
+
+    user_content = types.Content(
+        role='user',
+        parts=[types.Part(text=input_text)]
+    )
+    
+    # Stream partial text only when someone is listening for it
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE) if on_partial else None
+    
+    final_result = ""
+    usage = TokenUsage()
+    usage_reported = False
+    
+    async def consume() -> None:
+        nonlocal final_result, usage_reported
+        # Execute agent in a fresh session of its own
+        async with _session_manager.session(runner, user_id, session_id) as run_session_id:
+            # aclosing finalizes the stream in this task when an attempt is
+            # cancelled (timeout or lost hedge); abandoning it mid-stream leaves
+            # it to be finalized from another task, which breaks ADK's tracing context
+            async with aclosing(runner.run_async(
+                user_id=user_id,
+                session_id=run_session_id,
+                new_message=user_content,
+                run_config=run_config
+            )) as events:
+                async for event in events:
+                    # Streamed chunks repeat the usage of the aggregated response
+                    if event.usage_metadata and not event.partial:
+                        usage.add_metadata(event.usage_metadata)
+                        usage_reported = True
+                    if event.partial and on_partial and event.content and event.content.parts:
+                        chunk = "".join(part.text for part in event.content.parts
+                                        if hasattr(part, 'text') and part.text)
+                        if chunk:
+                            on_partial(chunk)
+                    elif event.is_final_response() and event.content:
+                        if hasattr(event.content, 'text') and event.content.text:
+                            final_result = event.content.text
+                        elif event.content.parts:
+                            text_parts = [part.text for part in event.content.parts 
+                                        if hasattr(part, 'text') and part.text]
+                            final_result = "".join(text_parts)
+    
+    # Wait for the model's quota (only when its rate limit would be exceeded),
+    # then for a scheduler call slot; both go by priority, then tenant share
+    async with scheduler.call(
+        estimated_input, lambda order: rate_limiter.acquire(model_name, estimated_input, order)
+    ) as waited:
+        tracer.record_sleep(waited)
+        
+        model_started = time.time()
+        try:
+            await asyncio.wait_for(consume(), agent_setting("timeout_seconds", agent.name))
+        finally:
+            span.attributes["model_seconds"] = span.attributes.get("model_seconds", 0.0) + \
+                time.time() - model_started
+    
+    # Account actual usage, and charge the limiter for what the estimate missed
+    # (session history and tool results are sent along with input_text)
+    if not usage_reported:
+        usage = TokenUsage.estimate(instruction + input_text, final_result)
+    tracer.record_tokens(usage)
+    rate_limiter.record_tokens(model_name, usage.input_tokens - estimated_input)
+    scheduler.record_tokens(usage.total, estimated_input)
+    
+    return final_result
+
+
+async def run_platform_tasks(
+    platforms: List[str],
+    task_factory: Callable[[str], Awaitable[Any]],
+    mode: str = "sequential",
+    max_concurrency: int = 4
+) -> Dict[str, Any]:
+    """
+    Run one task per platform, either one after another or concurrently.
+    
+    Failures are isolated per platform: an exception raised by one task is
+    returned as that platform's result instead of cancelling the others.
+    Cancellation is not a failure: a task ending with CancelledError raises
+    it, in either mode.
+    
+    Args:
+        platforms: Platform names to run tasks for
+        task_factory: Coroutine function called with each platform name
+        mode: "sequential" or "parallel" (see AGENTIC_PATTERNS)
+        max_concurrency: Maximum tasks running at once in parallel mode
+        
+    Returns:
+        Dict of platform -> task result, or the exception the task raised
+
+    Raises:
+        asyncio.CancelledError: If a task was cancelled
+    """
+    if mode == "parallel":
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def run_bounded(platform: str) -> Any:
+            async with semaphore:
+                return await task_factory(platform)
+        
+        outcomes = await asyncio.gather(
+            *(run_bounded(platform) for platform in platforms),
+            return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+        return dict(zip(platforms, outcomes))
+    
+    results = {}
+    for platform in platforms:
+        try:
+            results[platform] = await task_factory(platform)
+        except Exception as e:
+            results[platform] = e
+    
+    return results
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Multi-tenant scheduling for Smart Routing Pipeline
+Per-tenant request concurrency and token shares, and priority ordering of
+model calls across every in-flight pipeline
+"""
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from src.config import USER_ID
+from src.config.settings import SCHEDULER_CONFIG
+from src.utils.rate_limiter import TokenBucket
+from src.utils.tracing import get_tracer
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """The tenant a pipeline request runs for and its priority."""
+    user_id: str
+    priority: str
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+# Arrival order, the tie-breaker between otherwise equal waiters
+_arrivals = itertools.count()
+
+
+def current_request() -> Optional[RequestContext]:
+    """The request context of the running pipeline, if any."""
+    return _current_request.get()
+
+
+class _Waiter:
+    """A caller queued for a slot."""
+
+    def __init__(self, rank: int, tenant: "TenantState"):
+        self.rank = rank
+        self.tenant = tenant
+        self.arrival = next(_arrivals)
+        self.future: Optional[asyncio.Future] = None
+
+
+class _Slots:
+    """
+    Up to `capacity` concurrent holders. When a slot frees up it goes to the
+    waiter with the lowest `order` key, evaluated at that moment.
+    """
+
+    def __init__(self, capacity: int, order: Callable[[_Waiter], Tuple]):
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        self.waiters: List[_Waiter] = []
+        self._order = order
+
+    async def acquire(self, waiter: _Waiter) -> float:
+        """Take a slot, waiting for one if all are in use. Returns seconds waited."""
+        if self.in_use < self.capacity and not self.waiters:
+            self.in_use += 1
+            return 0.0
+
+        waiter.future = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+            elif not waiter.future.cancelled():
+                # Granted a slot, but cancelled before using it
+                self.release()
+            raise
+        return time.monotonic() - started
+
+    def release(self) -> None:
+        self.in_use -= 1
+        while self.waiters and self.in_use < self.capacity:
+            waiter = min(self.waiters, key=self._order)
+            self.waiters.remove(waiter)
+            # Cancelled, but its task hasn't resumed to leave the queue yet
+            if waiter.future.done():
+                continue
+            self.in_use += 1
+            waiter.future.set_result(None)
+
+
+class TenantState:
+    """Limits and recent token usage of one tenant."""
+
+    def __init__(self, user_id: str, config: Dict[str, Any], half_life_seconds: float):
+        self.user_id = user_id
+        self.weight = float(config["weight"])
+        self.requests = _Slots(config["max_concurrent_requests"], order=lambda w: (w.rank, w.arrival))
+        tokens_per_minute = config["tokens_per_minute"]
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0) if tokens_per_minute else None
+        self.stats = {"requests": 0, "calls": 0, "tokens": 0, "queued_seconds": 0.0}
+        self._half_life_seconds = half_life_seconds
+        self._usage = 0.0
+        self._usage_at = time.monotonic()
+
+    def usage(self) -> float:
+        """Tokens used recently, each halving in weight every half-life."""
+        now = time.monotonic()
+        self._usage *= 0.5 ** ((now - self._usage_at) / self._half_life_seconds)
+        self._usage_at = now
+        return self._usage
+
+    def share(self) -> float:
+        """Recent usage relative to the tenant's weight; lower is served first."""
+        return self.usage() / self.weight
+
+    async def wait_for_tokens(self, estimated_tokens: int) -> float:
+        """Wait until the tenant's token cap (if any) admits a call. Returns seconds waited."""
+        waited = 0.0
+        while self.tokens is not None:
+            delay = self.tokens.wait_time(estimated_tokens)
+            if delay <= 0:
+                self.tokens.take(estimated_tokens)
+                break
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    def record_tokens(self, tokens: int, estimated_tokens: int) -> None:
+        self._usage = self.usage() + tokens
+        self.stats["tokens"] += tokens
+        if self.tokens is not None and tokens > estimated_tokens:
+            self.tokens.take(tokens - estimated_tokens)
+
+
+class Scheduler:
+    """
+    Schedules pipeline requests and their model calls across tenants.
+
+    A request runs for a tenant (user ID) at a priority from
+    SCHEDULER_CONFIG["priorities"]. Each tenant runs at most
+    `max_concurrent_requests` requests at once. Model calls from every
+    in-flight request share `max_concurrent_calls` slots. A free slot goes
+    to the highest priority first, then to the tenant with the least recent
+    token usage per unit of weight, then to the earliest arrival. A tenant
+    with a `tokens_per_minute` cap also waits for its own quota, and model
+    quota is granted in the same order before the slot is taken.
+    """
+
+    def __init__(self, config: Dict[str, Any] = SCHEDULER_CONFIG):
+        self.config = config
+        self._tenants: Dict[str, TenantState] = {}
+        self._calls = _Slots(config["max_concurrent_calls"],
+                             order=lambda w: (w.rank, w.tenant.share(), w.arrival))
+
+    @property
+    def enabled(self) -> bool:
+        return self.config["enabled"]
+
+    def rank(self, priority: str) -> int:
+        """Position of a priority, 0 being the most urgent."""
+        priorities = self.config["priorities"]
+        if priority not in priorities:
+            raise ValueError(f"Unknown priority '{priority}' (expected one of: {', '.join(priorities)})")
+        return priorities.index(priority)
+
+    def tenant(self, user_id: str) -> TenantState:
+        """Get (or create) a tenant's state from the defaults and its overrides."""
+        state = self._tenants.get(user_id)
+        if state is None:
+            config = {**self.config["tenant_defaults"], **self.config["tenants"].get(user_id, {})}
+            state = TenantState(user_id, config, self.config["usage_half_life_seconds"])
+            self._tenants[user_id] = state
+        return state
+
+    def context(self, user_id: Optional[str] = None, priority: Optional[str] = None) -> RequestContext:
+        """
+        Build a request context, filling in the defaults.
+
+        Args:
+            user_id: Tenant the request runs for (default: USER_ID)
+            priority: One of SCHEDULER_CONFIG["priorities"] (default: default_priority)
+
+        Raises:
+            ValueError: If the priority is unknown
+        """
+        context = RequestContext(user_id or USER_ID, priority or self.config["default_priority"])
+        self.rank(context.priority)
+        return context
+
+    @asynccontextmanager
+    async def request(self, context: RequestContext) -> AsyncIterator[RequestContext]:
+        """
+        Run a pipeline request for its tenant at its priority.
+
+        Waits while the tenant already runs `max_concurrent_requests`
+        requests (its more urgent requests go first), then makes the request
+        current so model calls made inside it are scheduled for the tenant.
+
+        Args:
+            context: Tenant and priority, from `context()`
+
+        Yields:
+            The request context
+        """
+        rank = self.rank(context.priority)
+        tenant = self.tenant(context.user_id)
+        if self.enabled:
+            waited = await tenant.requests.acquire(_Waiter(rank, tenant))
+            if waited > 0:
+                print(f"   ⏳ Scheduler: {context.user_id} waited {waited:.1f}s for a request slot")
+        tenant.stats["requests"] += 1
+        token = _current_request.set(context)
+        try:
+            yield context
+        finally:
+            _current_request.reset(token)
+            if self.enabled:
+                tenant.requests.release()
+
+    @asynccontextmanager
+    async def call(self, estimated_tokens: int,
+                   quota: Optional[Callable[[Tuple], Awaitable[float]]] = None) -> AsyncIterator[float]:
+        """
+        Hold a model-call slot for the current request while making a call.
+
+        Calls made outside a request are scheduled for USER_ID at the
+        default priority.
+
+        Args:
+            estimated_tokens: Estimated input tokens of the call
+            quota: Waits for the model's rate-limit quota given the call's
+                   order key (priority rank, tenant share). Awaited before
+                   the slot is taken, so slots are never held by calls
+                   queued for quota.
+
+        Yields:
+            Seconds spent waiting for the tenant's token quota, model quota and the slot
+        """
+        if not self.enabled:
+            yield await quota(()) if quota else 0.0
+            return
+
+        context = current_request() or RequestContext(USER_ID, self.config["default_priority"])
+        tenant = self.tenant(context.user_id)
+        rank = self.rank(context.priority)
+        waited = await tenant.wait_for_tokens(estimated_tokens)
+        if quota:
+            waited += await quota((rank, tenant.share()))
+        waited += await self._calls.acquire(_Waiter(rank, tenant))
+        tenant.stats["calls"] += 1
+        tenant.stats["queued_seconds"] += waited
+        get_tracer().record_scheduled_call(context.priority, waited)
+        try:
+            yield waited
+        finally:
+            self._calls.release()
+
+    def record_tokens(self, tokens: int, estimated_tokens: int) -> None:
+        """
+        Charge a finished call's tokens to the current request's tenant.
+
+        Args:
+            tokens: Tokens the call used (input and output)
+            estimated_tokens: Tokens taken from the tenant's cap when the call started
+        """
+        if not self.enabled:
+            return
+        context = current_request()
+        self.tenant(context.user_id if context else USER_ID).record_tokens(tokens, estimated_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """Call slots in use and waiting, and per-tenant totals."""
+        return {
+            "enabled": self.enabled,
+            "call_slots": self._calls.capacity,
+            "calls_in_flight": self._calls.in_use,
+            "calls_waiting": len(self._calls.waiters),
+            "tenants": {
+                user_id: {
+                    **state.stats,
+                    "queued_seconds": round(state.stats["queued_seconds"], 2),
+                    "requests_in_flight": state.requests.in_use,
+                    "requests_waiting": len(state.requests.waiters),
+                    "recent_tokens": round(state.usage())
+                }
+                for user_id, state in self._tenants.items()
+            }
+        }
+
+
+# Shared scheduler used by every pipeline in the process
+_scheduler = Scheduler()
+
+
+def get_scheduler() -> Scheduler:
+    """Return the process-wide scheduler."""
+    return _scheduler
@@ -0,0 +1,271 @@
+"""
+Section-level regeneration utilities for Smart Routing Pipeline
+Splits long-form markdown into sections, maps quality feedback onto the
+sections it is about, and splices regenerated sections back in place
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from src.utils.quality import QualityReport, draft_similarity
+from src.utils.validation import WORD_PATTERN
+
+# Markdown headings, or a line that is bold text only ("**Why it works**")
+_HEADING = re.compile(r"^(?:#{1,6}[ \t]+\S.*|\*\*[^*\n]+\*\*:?)[ \t]*$", re.MULTILINE)
+
+# Feedback about the start or the end of the article, wherever it is headed
+_OPENING_WORDS = re.compile(
+    r"\b(?:open(?:s|ing)?|intro(?:duction)?|hook|title|headline|lead(?:s)? with|"
+    r"first (?:line|paragraph|section)|beginning)\b", re.IGNORECASE
+)
+_CLOSING_WORDS = re.compile(
+    r"\b(?:conclu(?:de|des|sion)|ending|ends? with|clos(?:e|es|ing)|wrap(?:s|-up)? up|"
+    r"final (?:line|paragraph|section|thought)|last (?:line|paragraph|section))\b", re.IGNORECASE
+)
+_WORD = re.compile(r"\w+")
+_QUOTED = re.compile(r"[\"“']([^\"”'\n]{8,})[\"”']")
+
+# Words too common to tie a suggestion to a section
+_STOPWORDS = {
+    "about", "after", "again", "also", "because", "before", "being", "could", "every",
+    "from", "have", "into", "just", "like", "more", "most", "much", "only", "other",
+    "over", "same", "should", "some", "such", "than", "that", "their", "them", "then",
+    "there", "these", "they", "this", "those", "through", "very", "what", "when",
+    "where", "which", "while", "with", "would", "your", "content", "section", "article",
+    "paragraph", "reader", "readers", "make", "instead", "specific"
+}
+# Distinct meaningful words a suggestion must share with a section's text
+MIN_SHARED_WORDS = 2
+
+
+@dataclass
+class Section:
+    """A slice of an article: its heading line (empty for the opening) and body."""
+    heading: str
+    text: str        # Exact text of the slice, heading and trailing blank lines included
+
+    @property
+    def words(self) -> int:
+        return len(WORD_PATTERN.findall(self.text))
+
+
+def split_sections(content: str) -> List[Section]:
+    """
+    Split markdown into sections at each heading.
+
+    The title and everything before the first subheading form the opening
+    section. Joining the sections' text gives back `content` exactly.
+
+    Args:
+        content: Article text
+
+    Returns:
+        Sections in article order (a single section when there are no subheadings)
+    """
+    title_end = _first_line_end(content)
+    starts = [m.start() for m in _HEADING.finditer(content) if m.start() >= title_end]
+    bounds = [0] + starts + [len(content)]
+    sections = []
+    for start, end in zip(bounds, bounds[1:]):
+        if start == end:
+            continue
+        heading = content[start:_line_end(content, start)].strip() if start in starts else ""
+        sections.append(Section(heading=heading, text=content[start:end]))
+    return sections
+
+
+def _line_end(content: str, start: int) -> int:
+    end = content.find("\n", start)
+    return len(content) if end == -1 else end
+
+
+def _first_line_end(content: str) -> int:
+    """End of the first non-blank line (the title, if the article has one)."""
+    start = len(content) - len(content.lstrip())
+    return _line_end(content, start)
+
+
+def _meaningful_words(text: str) -> set:
+    return {word for word in _WORD.findall(text.lower()) if len(word) > 3 and word not in _STOPWORDS}
+
+
+def map_feedback_to_sections(sections: List[Section],
+                             report: QualityReport) -> Tuple[Dict[int, List[str]], List[str]]:
+    """
+    Assign each CONTEXTUAL IMPROVEMENTS item and the PRIORITY FIX to the
+    sections they are about.
+
+    A suggestion belongs to a section when it quotes the section's text or
+    names its heading, when it talks about the opening or the ending, or
+    failing that when it shares at least MIN_SHARED_WORDS meaningful words
+    with exactly the one section that shares the most.
+
+    Args:
+        sections: The article's sections
+        report: Parsed quality report
+
+    Returns:
+        Tuple of (section index -> suggestions, suggestions tied to no section)
+    """
+    suggestions = list(report.improvements)
+    if report.priority_fix and report.priority_fix not in suggestions:
+        suggestions.insert(0, f"PRIORITY: {report.priority_fix}")
+
+    section_words = [_meaningful_words(section.text) for section in sections]
+    targeted: Dict[int, List[str]] = {}
+    general: List[str] = []
+    for suggestion in suggestions:
+        indexes = _sections_for(suggestion, sections, section_words)
+        if not indexes:
+            general.append(suggestion)
+        for index in indexes:
+            targeted.setdefault(index, []).append(suggestion)
+    return targeted, general
+
+
+def _sections_for(suggestion: str, sections: List[Section], section_words: List[set]) -> List[int]:
+    lowered = suggestion.lower()
+    quoted = [q.lower() for q in _QUOTED.findall(suggestion)]
+    explicit = [
+        index for index, section in enumerate(sections)
+        if any(q in section.text.lower() for q in quoted)
+        or (len(_heading_text(section.heading)) > 3 and _heading_text(section.heading) in lowered)
+    ]
+    if explicit:
+        return explicit
+
+    positional = []
+    if _OPENING_WORDS.search(suggestion):
+        positional.append(0)
+    if _CLOSING_WORDS.search(suggestion) and len(sections) - 1 not in positional:
+        positional.append(len(sections) - 1)
+    if positional:
+        return positional
+
+    words = _meaningful_words(suggestion)
+    overlaps = [len(words & section) for section in section_words]
+    best = max(overlaps, default=0)
+    if best >= MIN_SHARED_WORDS and overlaps.count(best) == 1:
+        return [overlaps.index(best)]
+    return []
+
+
+def _heading_text(heading: str) -> str:
+    return heading.strip("#* :\t").lower()
+
+
+def format_section_regeneration_prompt(sections: List[Section], index: int, feedback: List[str],
+                                       general_feedback: List[str], attempt: int) -> str:
+    """
+    Prompt asking a specialist to rewrite one section of an article.
+
+    Args:
+        sections: The article's sections
+        index: Section to rewrite
+        feedback: Suggestions aimed at this section
+        general_feedback: Suggestions for the whole article, applied where relevant
+        attempt: Current attempt number
+
+    Returns:
+        Prompt whose answer is the rewritten section only
+    """
+    outline = "\n".join(
+        f"{number}. {section.heading or '(title and opening)'}"
+        f"{'   <-- THIS SECTION' if number - 1 == index else ''}"
+        for number, section in enumerate(sections, start=1)
+    )
+    section = sections[index]
+    prompt = f"""SECTION REGENERATION REQUEST (Attempt {attempt}/3)
+
+ARTICLE OUTLINE (the other sections stay as they are):
+{outline}
+
+SECTION TO IMPROVE (about {section.words} words):
+{section.text.strip()}
+
+FEEDBACK FOR THIS SECTION:
+""" + "\n".join(f"- {item}" for item in feedback)
+    if general_feedback:
+        prompt += "\n\nGENERAL FEEDBACK (apply where it fits this section):\n" + \
+            "\n".join(f"- {item}" for item in general_feedback)
+    prompt += ("\n\nRewrite only this section to address the feedback. Keep its heading line, "
+               "a similar length and the voice of the rest of the article so it still reads "
+               "as one piece. Return only the rewritten section.")
+    return prompt
+
+
+def splice_section(section: Section, rewritten: str) -> str:
+    """
+    Fit a rewritten section back into the article's layout.
+
+    Keeps the original trailing blank lines, and the original heading when
+    the rewrite dropped it. An empty rewrite keeps the original section.
+
+    Args:
+        section: The section that was rewritten
+        rewritten: Specialist output
+
+    Returns:
+        Replacement text for the section
+    """
+    body = rewritten.strip()
+    if not body:
+        return section.text
+    if section.heading and not _HEADING.match(body.split("\n", 1)[0]):
+        body = f"{section.heading}\n\n{body}"
+    return body + section.text[len(section.text.rstrip()):]
+
+
+def revised_similarity(previous: str, current: str) -> float:
+    """
+    draft_similarity over only the sections a revision changed.
+
+    Section-level regeneration leaves most of an article untouched, which
+    would make any revision look like a near-copy of the previous draft.
+
+    Args:
+        previous: Earlier draft
+        current: Revised draft
+
+    Returns:
+        0.0 (nothing shared) to 1.0 (same wording, or nothing changed)
+    """
+    before, after = split_sections(previous), split_sections(current)
+    if len(before) != len(after):
+        return draft_similarity(previous, current)
+    changed = [(old.text, new.text) for old, new in zip(before, after) if old.text != new.text]
+    if not changed:
+        return 1.0
+    return draft_similarity("\n".join(old for old, _ in changed), "\n".join(new for _, new in changed))
+
+
+def rewrite_fraction(sections: List[Section], indexes: List[int]) -> float:
+    """Share of the article's words that lie in the given sections."""
+    total = sum(section.words for section in sections)
+    return sum(sections[i].words for i in indexes) / total if total else 1.0
+
+
+SectionPlan = Tuple[List[Section], Dict[int, List[str]], List[str]]
+
+
+def plan_section_regeneration(content: str, report: QualityReport, min_sections: int,
+                              max_rewrite_fraction: float) -> Optional[SectionPlan]:
+    """
+    Decide whether feedback can be addressed section by section.
+
+    Args:
+        content: Article that failed assessment
+        report: Parsed quality report for it
+        min_sections: Fewer sections than this means a full rewrite
+        max_rewrite_fraction: Full rewrite when targeted sections hold more of the words
+
+    Returns:
+        (sections, section index -> suggestions, general suggestions), or
+        None when the whole article should be rewritten
+    """
+    sections = split_sections(content)
+    if len(sections) < min_sections:
+        return None
+    targeted, general = map_feedback_to_sections(sections, report)
+    if not targeted or rewrite_fraction(sections, list(targeted)) > max_rewrite_fraction:
+        return None
+    return sections, targeted, general
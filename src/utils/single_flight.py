@@ -0,0 +1,182 @@
+"""
+Single-flight execution for Smart Routing Pipeline
+Concurrent callers with the same key share one execution instead of each
+running identical work
+"""
+import asyncio
+from contextlib import suppress
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+from src.utils.tracing import get_tracer
+
+T = TypeVar("T")
+
+# Marks the end of a shared event stream
+_END = object()
+
+
+class FlightCancelledError(RuntimeError):
+    """The shared work was cancelled by something other than the caller waiting on it."""
+
+
+class _Flight(Generic[T]):
+    """One shared execution and the number of callers waiting on it."""
+
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    At most one execution per key at a time; concurrent callers share its result.
+
+    The work runs in its own task, so a caller that gives up (is cancelled)
+    doesn't cancel the work for the others. The work is cancelled only when
+    every caller waiting on it has gone. Each caller counts as either a run
+    or a coalesced call, both in `stats` and in the tracer's
+    smart_routing_single_flight_* counters.
+    """
+
+    def __init__(self, scope: str):
+        self.scope = scope
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.stats = {"runs": 0, "coalesced": 0}
+
+    def _record(self, coalesced: bool) -> None:
+        self.stats["coalesced" if coalesced else "runs"] += 1
+        get_tracer().record_single_flight(self.scope, coalesced)
+
+    async def run(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run `work`, or wait for the identical work already in flight.
+
+        Args:
+            key: Identifies identical work
+            work: Coroutine function started when nothing is in flight for key
+
+        Returns:
+            Tuple of (result, coalesced); exceptions from the shared work are
+            raised to every caller
+
+        Raises:
+            FlightCancelledError: If the shared work was cancelled while this
+                caller was still waiting (the caller itself was not cancelled)
+        """
+        flight = self._flights.get(key)
+        coalesced = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.create_task(work()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        self._record(coalesced)
+
+        flight.waiters += 1
+        try:
+            # Unlike awaiting the task, wait() raises CancelledError only when
+            # this caller is cancelled, never because the shared work was
+            await asyncio.wait({flight.task})
+            return _outcome(self.scope, flight.task), coalesced
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _forget(self, key: Hashable, flight: "_Flight") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Nobody may be left to retrieve the outcome
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+
+def _outcome(scope: str, task: asyncio.Task) -> Any:
+    """Result of finished shared work, re-raising its failure for this caller."""
+    if task.cancelled():
+        raise FlightCancelledError(f"Shared {scope} work was cancelled")
+    return task.result()
+
+
+class _StreamFlight:
+    """One shared event-producing execution and its subscribers."""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.events: List[Any] = []
+        self.queues: List["asyncio.Queue[Any]"] = []
+        self.done = False
+
+    def publish(self, event: Any) -> None:
+        self.events.append(event)
+        for queue in self.queues:
+            queue.put_nowait(event)
+
+    def close(self) -> None:
+        self.done = True
+        for queue in self.queues:
+            queue.put_nowait(_END)
+
+
+class SingleFlightStream(SingleFlight):
+    """
+    Single-flight for work that publishes events as it runs.
+
+    Every subscriber receives every event from the start: a caller that
+    joins late first gets the events published so far, then the rest as
+    they happen. When the work fails, each subscriber gets its exception
+    (FlightCancelledError if it was cancelled) after the events it
+    published. The work is cancelled when its last subscriber stops
+    reading early.
+    """
+
+    async def stream(self, key: Hashable,
+                     work: Callable[[Callable[[Any], None]], Awaitable[Any]]) -> AsyncIterator[Any]:
+        """
+        Subscribe to the events of `work`, starting it if nothing is in flight for key.
+
+        Args:
+            key: Identifies identical work
+            work: Coroutine function called with a publish callback
+
+        Yields:
+            Every event the work publishes, in order
+
+        Raises:
+            FlightCancelledError: If the work was cancelled while subscribed
+            Exception: Whatever the work raised
+        """
+        flight = self._flights.get(key)
+        coalesced = flight is not None
+        if flight is None:
+            flight = _StreamFlight()
+            flight.task = asyncio.create_task(work(flight.publish))
+            self._flights[key] = flight
+
+            def finished(_):
+                self._forget(key, flight)
+                flight.close()
+            flight.task.add_done_callback(finished)
+        self._record(coalesced)
+
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        for event in flight.events:
+            queue.put_nowait(event)
+        if flight.done:
+            queue.put_nowait(_END)
+        flight.queues.append(queue)
+        try:
+            while True:
+                event = await queue.get()
+                if event is _END:
+                    break
+                yield event
+            _outcome(self.scope, flight.task)
+        finally:
+            flight.queues.remove(queue)
+            # Last subscriber stopped early: stop the work too
+            if not flight.queues and not flight.task.done():
+                flight.task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await flight.task
@@ -0,0 +1,126 @@
+"""
+Speculative drafting utilities for Smart Routing Pipeline
+Candidate prompts, a cheap local scorer and ranking helpers for best-of-N
+drafting on low-confidence routes
+"""
+import re
+from typing import List, Optional, Tuple
+from src.utils.validation import check_platform_constraints, WORD_PATTERN
+from src.utils.repair import repair_draft
+
+# Distinct angles so candidates explore different drafts instead of near-copies
+CANDIDATE_ANGLES = [
+    "Open with a short personal story or moment.",
+    "Open with the most surprising research insight.",
+    "Open with one practical, specific tip the reader can use today."
+]
+
+# Word ranges the specialists are asked to write (outside them costs a point)
+TARGET_WORDS = {
+    "linkedin": (300, 500),
+    "instagram": (150, 300),
+    "blog": (800, 1500)
+}
+
+_FIRST_PERSON = re.compile(r"\b(?:I|I'm|I've|my|me|we|our)\b")
+_BEST_CANDIDATE = re.compile(r"BEST CANDIDATE\W*(\d+)", re.IGNORECASE)
+
+
+def build_candidate_prompt(prompt: str, candidate: int, total: int) -> str:
+    """
+    Vary a generation prompt for one of several candidates.
+
+    Args:
+        prompt: The platform's generation prompt
+        candidate: Candidate number (1-indexed)
+        total: Number of candidates
+
+    Returns:
+        Prompt with a candidate-specific angle appended
+    """
+    angle = CANDIDATE_ANGLES[(candidate - 1) % len(CANDIDATE_ANGLES)]
+    return f"{prompt}\n\nCANDIDATE {candidate} OF {total}: {angle}"
+
+
+def local_draft_score(platform: str, content: str) -> float:
+    """
+    Cheap 0-10 estimate of how a draft will fare in quality assessment.
+
+    Penalizes broken platform rules (lightly when a local repair can fix
+    them), lengths outside the specialist's target range, and drafts with
+    no personal voice or no question for the reader.
+
+    Args:
+        platform: Platform name
+        content: Candidate draft
+
+    Returns:
+        Score between 0.0 and 10.0 (0.0 for empty drafts)
+    """
+    if not content.strip():
+        return 0.0
+
+    score = 10.0
+    violations = check_platform_constraints(platform, content)
+    if violations:
+        repairable = repair_draft(platform, content, violations) is not None
+        score -= 1.0 * len(violations) if repairable else 4.0 * len(violations)
+
+    if platform in TARGET_WORDS:
+        low, high = TARGET_WORDS[platform]
+        if not low <= len(WORD_PATTERN.findall(content)) <= high:
+            score -= 1.0
+    if not _FIRST_PERSON.search(content):
+        score -= 0.5
+    if "?" not in content:
+        score -= 0.5
+    return max(0.0, score)
+
+
+def shortlist_candidates(platform: str, candidates: List[str],
+                         limit: int) -> List[Tuple[int, str, float]]:
+    """
+    Score candidates locally and keep the best for comparative ranking.
+
+    Args:
+        platform: Platform name
+        candidates: Candidate drafts, in generation order
+        limit: Maximum candidates to keep
+
+    Returns:
+        (candidate index, draft, local score) tuples, best first; drafts
+        scoring 0 are dropped unless nothing else is left
+    """
+    scored = sorted(
+        ((index, draft, local_draft_score(platform, draft)) for index, draft in enumerate(candidates)),
+        key=lambda item: item[2], reverse=True
+    )
+    viable = [item for item in scored if item[2] > 0] or scored[:1]
+    return viable[:max(1, limit)]
+
+
+def format_ranking_prompt(platform: str, shortlist: List[Tuple[int, str, float]]) -> str:
+    """Comparative prompt listing shortlisted drafts as candidates 1..N."""
+    blocks = [f"**CANDIDATE {number}:**\n{draft}"
+              for number, (_, draft, _) in enumerate(shortlist, start=1)]
+    return (f"CANDIDATE DRAFTS FOR {platform.upper()}:\n\n" + "\n\n".join(blocks) +
+            "\n\nWhich candidate is best?")
+
+
+def parse_best_candidate(ranking: str, count: int) -> Optional[int]:
+    """
+    Read the winning candidate from a DraftRanker response.
+
+    Args:
+        ranking: DraftRanker output
+        count: Number of candidates that were compared
+
+    Returns:
+        Zero-based position in the shortlist, or None when the response
+        names no valid candidate
+    """
+    match = _BEST_CANDIDATE.search(ranking)
+    if not match:
+        return None
+    number = int(match.group(1))
+    return number - 1 if 1 <= number <= count else None
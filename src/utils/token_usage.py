@@ -0,0 +1,102 @@
+"""
+Token accounting for Smart Routing Pipeline
+Per-call usage from ADK event metadata (estimated locally when a model
+reports none), per-request rollups and the regeneration token budget
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+from src.config.settings import TOKEN_BUDGET_CONFIG
+from src.utils.rate_limiter import estimate_tokens
+
+
+@dataclass
+class TokenUsage:
+    """Input and output tokens consumed by one agent call."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    estimated: bool = False   # True when counted locally instead of reported by the model
+
+    @property
+    def total(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add_metadata(self, usage_metadata: Any) -> None:
+        """
+        Add the counts from an event's usage metadata.
+
+        Thinking tokens are billed as output, so they are counted with it.
+        """
+        self.input_tokens += getattr(usage_metadata, "prompt_token_count", None) or 0
+        self.output_tokens += (getattr(usage_metadata, "candidates_token_count", None) or 0) + \
+            (getattr(usage_metadata, "thoughts_token_count", None) or 0)
+
+    @classmethod
+    def estimate(cls, prompt: str, response: str) -> "TokenUsage":
+        """Local fallback when the model reports no usage metadata."""
+        return cls(estimate_tokens(prompt), estimate_tokens(response) if response else 0, True)
+
+
+@dataclass
+class RequestUsage:
+    """Running token totals for one pipeline request."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    calls: int = 0
+    estimated_calls: int = 0
+    platforms: Counter = field(default_factory=Counter)   # platform (None = shared) -> tokens
+
+    @property
+    def total(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add(self, usage: TokenUsage, platform: Optional[str] = None) -> None:
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        self.calls += 1
+        self.estimated_calls += usage.estimated
+        self.platforms[platform] += usage.total
+
+
+def projected_round_tokens(usage: RequestUsage, platforms: Iterable[str], rounds: int) -> int:
+    """
+    Estimate the tokens one more regeneration round would consume.
+
+    Each platform is expected to cost what its rounds have cost on average
+    so far (generation or regeneration plus assessment).
+
+    Args:
+        usage: Running totals for the request
+        platforms: Platforms that would be regenerated
+        rounds: Rounds completed so far
+
+    Returns:
+        Projected tokens for regenerating and re-assessing those platforms
+    """
+    return sum(usage.platforms[platform] // max(1, rounds) for platform in platforms)
+
+
+def check_token_budget(usage: RequestUsage, platforms: Iterable[str], rounds: int,
+                       budget: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Decide whether another regeneration round fits in the request's budget.
+
+    Args:
+        usage: Running totals for the request
+        platforms: Platforms that would be regenerated
+        rounds: Rounds completed so far
+        budget: Maximum tokens per request (0 disables the budget;
+                defaults to TOKEN_BUDGET_CONFIG)
+
+    Returns:
+        Dict with allowed, used, projected and budget
+    """
+    if budget is None:
+        budget = TOKEN_BUDGET_CONFIG["max_tokens_per_request"]
+    projected = projected_round_tokens(usage, platforms, rounds)
+    return {
+        "allowed": not budget or usage.total + projected <= budget,
+        "used": usage.total,
+        "projected": projected,
+        "budget": budget
+    }
@@ -0,0 +1,321 @@
+"""
+Tracing for Smart Routing Pipeline
+Lightweight spans per stage and agent call, aggregated into latency
+histograms exportable as Prometheus text and JSON lines, plus token
+usage rolled up per request, stage and platform
+"""
+import asyncio
+import json
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from src.config.settings import TRACING_CONFIG
+from src.utils.token_usage import TokenUsage, RequestUsage
+
+# Pipeline stages reported in per-request summaries, in pipeline order
+PIPELINE_STAGES = ["routing", "research", "generation", "quality_loop", "synthesis"]
+
+
+@dataclass
+class Span:
+    """A timed unit of pipeline work."""
+    stage: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start: float = field(default_factory=time.time)
+    end: Optional[float] = None
+    sleep_seconds: float = 0.0   # Deliberate waiting (rate limiting), including children
+    input_tokens: int = 0        # Token usage, including children
+    output_tokens: int = 0
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+
+class LatencyHistogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + [float("inf")], self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for (bound, total) in self.cumulative():
+            if total >= rank:
+                return float(bound) if bound != "+Inf" else self.buckets[-1]
+        return self.buckets[-1]
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Records spans and aggregates them into histograms.
+
+    Stage spans feed `smart_routing_stage_seconds{stage}`; agent calls feed
+    `smart_routing_agent_seconds{agent}` plus counters splitting each call
+    into rate-limit sleep and model time, and counting its tokens.
+
+    Child spans inherit their parent's `platform` attribute, so agent calls
+    are attributed to the platform whose generation or assessment made them.
+    """
+
+    def __init__(self, config: Dict[str, Any] = TRACING_CONFIG):
+        self.config = config
+        self.histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self.counters: Dict[Tuple[str, str, str], float] = {}
+        self.recent: Deque[Span] = deque(maxlen=config["max_spans"])
+        self._unflushed: List[Span] = []
+        self._usage: Dict[str, RequestUsage] = {}
+
+    @contextmanager
+    def span(self, stage: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time a block of work as a child of the current span.
+
+        Args:
+            stage: Stage name (routing, research, agent_call, ...)
+            **attributes: Span attributes (agent, platform, attempt, ...)
+
+        Yields:
+            The open span (attributes may be added while it runs)
+        """
+        parent = _current_span.get()
+        if parent is not None and "platform" in parent.attributes:
+            attributes.setdefault("platform", parent.attributes["platform"])
+        span = Span(
+            stage=stage,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex[:16],
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            span.end = time.time()
+            _current_span.reset(token)
+            if parent is not None:
+                parent.sleep_seconds += span.sleep_seconds
+                parent.input_tokens += span.input_tokens
+                parent.output_tokens += span.output_tokens
+            self._finish(span)
+            if parent is None:
+                self._usage.pop(span.trace_id, None)
+
+    def record_sleep(self, seconds: float) -> None:
+        """Attribute deliberate waiting to the current span."""
+        span = _current_span.get()
+        if span is not None and seconds > 0:
+            span.sleep_seconds += seconds
+
+    def record_tokens(self, usage: TokenUsage) -> None:
+        """Attribute an agent call's token usage to the current span and request."""
+        span = _current_span.get()
+        if span is None:
+            return
+        span.input_tokens += usage.input_tokens
+        span.output_tokens += usage.output_tokens
+        if usage.estimated:
+            span.attributes["estimated_tokens"] = True
+        self._usage.setdefault(span.trace_id, RequestUsage()).add(
+            usage, span.attributes.get("platform")
+        )
+
+    def record_single_flight(self, scope: str, coalesced: bool) -> None:
+        """Count a single-flight caller that ran the work or shared another caller's run."""
+        if self.config["enabled"]:
+            outcome = "coalesced" if coalesced else "runs"
+            self._count(f"smart_routing_single_flight_{outcome}_total", "scope", scope, 1)
+
+    def record_scheduled_call(self, priority: str, waited: float) -> None:
+        """Count a model call granted a scheduler slot and the time it queued for it."""
+        if self.config["enabled"]:
+            self._count("smart_routing_scheduler_calls_total", "priority", priority, 1)
+            self._count("smart_routing_scheduler_wait_seconds_total", "priority", priority, waited)
+
+    def request_usage(self, trace_id: Optional[str] = None) -> RequestUsage:
+        """Running token totals for a request (the current one by default)."""
+        trace_id = trace_id or self.current_trace_id()
+        return self._usage.get(trace_id, RequestUsage()) if trace_id else RequestUsage()
+
+    def current_trace_id(self) -> Optional[str]:
+        span = _current_span.get()
+        return span.trace_id if span else None
+
+    def _finish(self, span: Span) -> None:
+        if not self.config["enabled"]:
+            return
+        self.recent.append(span)
+        if self.config["spans_file"]:
+            self._unflushed.append(span)
+
+        if span.stage == "agent_call":
+            agent = span.attributes.get("agent", "unknown")
+            self._observe("smart_routing_agent_seconds", "agent", agent, span.duration)
+            self._count("smart_routing_agent_sleep_seconds_total", "agent", agent, span.sleep_seconds)
+            self._count("smart_routing_agent_model_seconds_total", "agent", agent,
+                        span.attributes.get("model_seconds", 0.0))
+            self._count("smart_routing_agent_calls_total", "agent", agent, 1)
+            self._count("smart_routing_agent_retries_total", "agent", agent, span.attributes.get("retries", 0))
+            self._count("smart_routing_agent_hedges_total", "agent", agent, int(span.attributes.get("hedged", False)))
+            if "error" in span.attributes:
+                self._count("smart_routing_agent_errors_total", "agent", agent, 1)
+            self._count("smart_routing_agent_input_tokens_total", "agent", agent, span.input_tokens)
+            self._count("smart_routing_agent_output_tokens_total", "agent", agent, span.output_tokens)
+        else:
+            self._observe("smart_routing_stage_seconds", "stage", span.stage, span.duration)
+            self._count("smart_routing_stage_sleep_seconds_total", "stage", span.stage, span.sleep_seconds)
+            if span.stage in PIPELINE_STAGES:
+                self._count("smart_routing_stage_tokens_total", "stage", span.stage,
+                            span.input_tokens + span.output_tokens)
+
+    def _observe(self, metric: str, label: str, value: str, seconds: float) -> None:
+        key = (metric, label, value)
+        if key not in self.histograms:
+            self.histograms[key] = LatencyHistogram(self.config["buckets"])
+        self.histograms[key].observe(seconds)
+
+    def _count(self, metric: str, label: str, value: str, amount: float) -> None:
+        key = (metric, label, value)
+        self.counters[key] = self.counters.get(key, 0.0) + amount
+
+    def stage_summary(self, trace_id: str) -> Dict[str, float]:
+        """
+        Seconds per pipeline stage for one request, plus total rate-limit sleep.
+
+        Args:
+            trace_id: Trace of the request
+
+        Returns:
+            Dict of stage -> seconds, and "rate_limit_sleep"
+        """
+        summary = {stage: 0.0 for stage in PIPELINE_STAGES}
+        sleep = 0.0
+        for span in self.recent:
+            if span.trace_id == trace_id and span.stage in summary:
+                summary[span.stage] += span.duration
+                sleep += span.sleep_seconds
+        summary = {stage: round(seconds, 3) for stage, seconds in summary.items()}
+        summary["rate_limit_sleep"] = round(sleep, 3)
+        return summary
+
+    def token_summary(self, trace_id: str) -> Dict[str, Any]:
+        """
+        Token usage for one request, in total and per stage and platform.
+
+        Args:
+            trace_id: Trace of the request (must still be running)
+
+        Returns:
+            Dict with input/output/total tokens, calls, estimated_calls,
+            stages (stage -> tokens) and platforms (platform or "shared" -> tokens)
+        """
+        usage = self.request_usage(trace_id)
+        stages = {stage: 0 for stage in PIPELINE_STAGES}
+        for span in self.recent:
+            if span.trace_id == trace_id and span.stage in stages:
+                stages[span.stage] += span.input_tokens + span.output_tokens
+        return {
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "total_tokens": usage.total,
+            "calls": usage.calls,
+            "estimated_calls": usage.estimated_calls,
+            "stages": stages,
+            "platforms": {platform or "shared": tokens for platform, tokens in usage.platforms.items()}
+        }
+
+    def prometheus_text(self) -> str:
+        """Histograms and counters in the Prometheus text exposition format."""
+        lines = []
+        for metric in sorted({key[0] for key in self.histograms}):
+            lines.append(f"# TYPE {metric} histogram")
+            for (name, label, value), histogram in sorted(self.histograms.items()):
+                if name != metric:
+                    continue
+                for le, total in histogram.cumulative():
+                    lines.append(f'{metric}_bucket{{{label}="{value}",le="{le}"}} {total}')
+                lines.append(f'{metric}_sum{{{label}="{value}"}} {histogram.sum:.6f}')
+                lines.append(f'{metric}_count{{{label}="{value}"}} {histogram.count}')
+        for metric in sorted({key[0] for key in self.counters}):
+            lines.append(f"# TYPE {metric} counter")
+            for (name, label, value), amount in sorted(self.counters.items()):
+                if name == metric:
+                    lines.append(f'{metric}{{{label}="{value}"}} {amount:g}')
+        return "\n".join(lines) + "\n"
+
+    def json_lines(self) -> str:
+        """One JSON object per histogram with count, sum, p50/p95/p99 and buckets."""
+        records = []
+        for (metric, label, value), histogram in sorted(self.histograms.items()):
+            records.append(json.dumps({
+                "metric": metric,
+                label: value,
+                "count": histogram.count,
+                "sum": round(histogram.sum, 6),
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "p99": histogram.quantile(0.99),
+                "buckets": dict(histogram.cumulative())
+            }))
+        return "\n".join(records) + ("\n" if records else "")
+
+    async def flush(self) -> None:
+        """Append finished spans to TRACING_CONFIG['spans_file'] as JSON lines."""
+        if not self._unflushed:
+            return
+        spans, self._unflushed = self._unflushed, []
+        lines = "".join(json.dumps({**asdict(span), "duration": round(span.duration, 6)}) + "\n"
+                        for span in spans)
+        try:
+            await asyncio.to_thread(self._append, self.config["spans_file"], lines)
+        except OSError as e:
+            print(f"Warning: Failed to write trace spans: {e}")
+
+    @staticmethod
+    def _append(path: str, lines: str) -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+# Shared tracer used by the pipeline, runners and HTTP service
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer."""
+    return _tracer
@@ -0,0 +1,211 @@
+"""
+Local constraint validation for Smart Routing Pipeline
+Mechanical platform rule checks that run before any LLM quality assessment
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Hard platform rules taken from the content specialists' instructions
+PLATFORM_RULES = {
+    "x_twitter": {"max_chars": 280, "hashtags": False, "wrapping_quotes": False},
+    "linkedin": {"hashtags": False},
+    "instagram": {"hashtags": False},
+    "blog": {"min_words": 800, "max_words": 1500, "hashtags": False}
+}
+
+# "AI slop" phrases the quality checker and specialists explicitly reject
+RED_FLAG_PHRASES = [
+    "excited to share",
+    "key takeaways",
+    "key takeaway",
+    "in this article, you'll learn",
+    "in this article you'll learn",
+    "hey beautiful humans",
+    "double tap if you agree",
+    "don't forget to subscribe",
+    "let us know in the comments"
+]
+
+# Precompiled once and shared by every check
+HASHTAG_PATTERN = re.compile(r"(?<![\w&/])#[A-Za-z]\w*")
+RED_FLAG_PATTERN = re.compile(
+    "|".join(re.escape(phrase) for phrase in sorted(RED_FLAG_PHRASES, key=len, reverse=True)),
+    re.IGNORECASE
+)
+WORD_PATTERN = re.compile(r"\S+")
+# Kinds of quotation mark a draft may be wrapped in (either mark of a kind opens or closes)
+QUOTE_KINDS = ['"', "'", "“”", "‘’"]
+# Marks that aren't quotation boundaries: apostrophes inside words and escaped quotes
+_NON_BOUNDARY_QUOTES = re.compile(r"(?<=\w)['’](?=\w)|\\[\"'“”‘’]")
+
+
+@dataclass
+class ConstraintViolation:
+    """A single mechanical rule a draft breaks."""
+    rule: str
+    message: str
+
+
+# X counts most scripts and punctuation as 1, CJK/emoji as 2, and every URL as 23
+TWITTER_URL_LENGTH = 23
+TWITTER_URL_PATTERN = re.compile(r"https?://\S+|\bwww\.\S+")
+_TWITTER_LIGHT_RANGES = ((0, 4351), (8192, 8205), (8208, 8223), (8242, 8247))
+
+
+def _twitter_char_weight(char: str) -> int:
+    code = ord(char)
+    if 0xFE00 <= code <= 0xFE0F:
+        return 0  # Variation selectors don't add to the visible length
+    return 1 if any(low <= code <= high for low, high in _TWITTER_LIGHT_RANGES) else 2
+
+
+def twitter_length(text: str) -> int:
+    """
+    Weighted character count the way X counts it against the 280 limit.
+
+    Args:
+        text: Post text
+
+    Returns:
+        Weighted length
+    """
+    text = unicodedata.normalize("NFC", text.strip())
+    length = 0
+    position = 0
+    for match in TWITTER_URL_PATTERN.finditer(text):
+        length += sum(_twitter_char_weight(c) for c in text[position:match.start()])
+        length += TWITTER_URL_LENGTH
+        position = match.end()
+    return length + sum(_twitter_char_weight(c) for c in text[position:])
+
+
+def wrapping_quotes(content: str) -> Optional[str]:
+    """
+    The kind of quotation mark wrapped around a whole draft, if any.
+
+    The draft must open and close with a mark of one kind and hold no other
+    mark of that kind, so a draft that starts and ends with two separate
+    quotations ("Ship it," she said. I said "not yet") isn't counted.
+
+    Args:
+        content: Draft content
+
+    Returns:
+        The wrapping kind from QUOTE_KINDS, or None
+    """
+    text = content.strip()
+    if len(text) < 2:
+        return None
+    for kind in QUOTE_KINDS:
+        if text[0] in kind and text[-1] in kind:
+            inner = _NON_BOUNDARY_QUOTES.sub("", text[1:-1])
+            if not any(mark in inner for mark in kind):
+                return kind
+    return None
+
+
+def content_length(platform: str, content: str) -> int:
+    """Length as the platform counts it (weighted characters for X)."""
+    if platform == "x_twitter":
+        return twitter_length(content)
+    return len(content.strip())
+
+
+def check_platform_constraints(platform: str, content: str) -> List[ConstraintViolation]:
+    """
+    Check one draft against its platform's mechanical rules.
+
+    Args:
+        platform: Platform name (x_twitter, linkedin, instagram, blog)
+        content: Draft content
+
+    Returns:
+        List of violations (empty when the draft passes)
+    """
+    rules = PLATFORM_RULES.get(platform, {})
+    violations = []
+
+    max_chars = rules.get("max_chars")
+    if max_chars:
+        length = content_length(platform, content)
+        if length > max_chars:
+            violations.append(ConstraintViolation(
+                "max_chars", f"Must be at most {max_chars} characters (currently {length})"
+            ))
+
+    if "min_words" in rules or "max_words" in rules:
+        word_count = len(WORD_PATTERN.findall(content))
+        if word_count < rules.get("min_words", 0):
+            violations.append(ConstraintViolation(
+                "min_words", f"Must be at least {rules['min_words']} words (currently {word_count})"
+            ))
+        elif word_count > rules.get("max_words", word_count):
+            violations.append(ConstraintViolation(
+                "max_words", f"Must be at most {rules['max_words']} words (currently {word_count})"
+            ))
+
+    if rules.get("hashtags") is False:
+        hashtags = HASHTAG_PATTERN.findall(content)
+        if hashtags:
+            violations.append(ConstraintViolation(
+                "hashtags", f"Must not contain hashtags (found {', '.join(hashtags[:5])})"
+            ))
+
+    if rules.get("wrapping_quotes") is False and wrapping_quotes(content):
+        violations.append(ConstraintViolation(
+            "wrapping_quotes", "Must not be wrapped in quotation marks"
+        ))
+
+    red_flags = {match.group(0).lower() for match in RED_FLAG_PATTERN.finditer(content)}
+    if red_flags:
+        violations.append(ConstraintViolation(
+            "red_flag", f"Remove AI-sounding phrases: {', '.join(sorted(red_flags))}"
+        ))
+
+    return violations
+
+
+def validate_drafts(drafts: Dict[str, str]) -> Dict[str, List[ConstraintViolation]]:
+    """
+    Check every draft of a batch, one draft after another.
+
+    Each check is a regex or length test on a single draft, so there is no
+    shared work to batch across drafts; this is a loop over
+    check_platform_constraints.
+
+    Args:
+        drafts: Dict of platform -> draft content
+
+    Returns:
+        Dict of platform -> violations (empty list when the draft passes)
+    """
+    return {platform: check_platform_constraints(platform, content)
+            for platform, content in drafts.items()}
+
+
+def format_violation_feedback(platform: str, violations: List[ConstraintViolation]) -> str:
+    """
+    Turn violations into feedback for the regeneration prompt, in the same
+    layout as a quality checker report.
+
+    Args:
+        platform: Platform name
+        violations: Violations found for the draft
+
+    Returns:
+        Feedback text
+    """
+    fixes = "\n".join(f"{i}. {v.message}" for i, v in enumerate(violations, start=1))
+    return f"""**LOCAL CONSTRAINT CHECK** ({platform} platform rules)
+
+**OVERALL SCORE**: 0.0/10 (fails mandatory platform rules; not sent for quality assessment)
+
+**CONTEXTUAL IMPROVEMENTS**:
+{fixes}
+
+**PRIORITY FIX**:
+Fix every platform rule violation above while keeping the message and voice.
+
+**VERDICT**: MAJOR_REVISION_NEEDED"""
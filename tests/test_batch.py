@@ -0,0 +1,33 @@
+"""Tests for the batch pipeline runner."""
+import asyncio
+import json
+
+from src.pipelines import batch
+from src.pipelines.events import FINAL_CONTENT, RESEARCH_READY, PipelineEvent
+
+
+def test_request_ids_fall_back_to_line_number(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    lines = [{"request": "a", "request_id": 7}, {"request": "b", "request_id": None},
+             {"request": "c"}, {"request": "d", "request_id": 0}]
+    path.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+
+    ids = [request_id for request_id, _, _ in batch.load_batch_requests(str(path))]
+    assert ids == ["7", "line-2", "line-3", "0"]
+
+
+def test_record_needs_final_content(monkeypatch):
+    async def fake_pipeline(request, user_id=None, priority=None):
+        yield PipelineEvent(RESEARCH_READY, {"research": ""})
+        if request == "finish":
+            yield PipelineEvent(FINAL_CONTENT, {
+                "result": "ok", "content": {}, "scores_history": {}, "stop_reasons": {},
+                "failed_platforms": [], "stage_seconds": {}, "token_usage": {},
+            })
+
+    monkeypatch.setattr(batch, "stream_smart_routed_content", fake_pipeline)
+    finished = asyncio.run(batch.process_batch_request("1", "finish"))
+    cut_short = asyncio.run(batch.process_batch_request("2", "stop early"))
+
+    assert finished["status"] == "completed" and finished["result"] == "ok"
+    assert cut_short["status"] == "error" and "final content" in cut_short["error"]
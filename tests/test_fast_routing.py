@@ -0,0 +1,41 @@
+"""Tests for platform and topic extraction in the fast-path router."""
+import pytest
+
+from src.utils.fast_routing import FastPathRouter, extract_platforms, extract_topic
+
+
+@pytest.mark.parametrize("request_text, platforms", [
+    ("Create LinkedIn content about AI trends", ["linkedin"]),
+    ("Write an X thread about startups", ["x_twitter"]),
+    ("Write a blog post about remote work productivity", ["blog"]),
+    ("Create content for LinkedIn, X and Instagram on remote work", ["linkedin", "x_twitter", "instagram"]),
+    ("Create content for Instagram/LinkedIn about travel", ["instagram", "linkedin"]),
+    ("Write about AI for LinkedIn", ["linkedin"]),
+    # Platform words inside the topic are not platform choices
+    ("Write a LinkedIn post about the article I read on AI regulation", ["linkedin"]),
+    ("Write something about my tweet going viral for LinkedIn", ["linkedin"]),
+    ("Write a LinkedIn post on blog SEO tips", ["linkedin"]),
+    ("Post about x and y for LinkedIn", ["linkedin"]),
+])
+def test_extract_platforms(request_text, platforms):
+    assert extract_platforms(request_text) == platforms
+
+
+def test_topic_excludes_platform_clause():
+    assert extract_topic("Create content for LinkedIn and X about AI trends") == "AI trends"
+    assert extract_topic("Create content for LinkedIn and X on remote work") == "remote work"
+
+
+@pytest.mark.parametrize("request_text", [
+    "Write a tweet about AI",
+    "Write a LinkedIn post about why I quit Twitter content creation",
+    "Should I write a LinkedIn post about AI?",
+])
+def test_unclear_requests_fall_back_to_llm_router(request_text):
+    assert FastPathRouter().route(request_text) is None
+
+
+def test_topic_mention_does_not_add_a_platform():
+    decision = FastPathRouter().route("Write a LinkedIn post about the article I read on AI regulation")
+    assert decision["selected_platforms"] == ["linkedin"]
+    assert decision["content_focus"] == "the article I read on AI regulation"
@@ -0,0 +1,66 @@
+"""Tests for quality report parsing."""
+from src.utils.quality import extract_improvement_suggestions, parse_quality_report, parse_quality_score
+
+REPORT = """**QUALITY ASSESSMENT REPORT**
+
+**OVERALL SCORE**: 7.8/10
+
+**DETAILED SCORES**:
+- Human Authenticity: 8/10 - Reads naturally
+- Engagement Potential: 7/10 - Slow hook
+
+**CONTEXTUAL IMPROVEMENTS** (Keep concise):
+1. Open with the result
+   instead of the setup
+2. Replace "leverage" with plain language
+
+**PRIORITY FIX** (Most important single change):
+Lead with the outcome.
+
+**VERDICT**: APPROVED"""
+
+
+def test_full_report():
+    report = parse_quality_report(REPORT)
+    assert report.overall_score == 7.8 and report.score_found
+    assert report.criteria == {"human_authenticity": 8.0, "engagement_potential": 7.0}
+    assert report.improvements == ["Open with the result instead of the setup",
+                                   'Replace "leverage" with plain language']
+    assert report.priority_fix == "Lead with the outcome."
+    assert report.verdict == "APPROVED"
+
+
+def test_missing_score():
+    report = parse_quality_report("**VERDICT**: MAJOR_REVISION_NEEDED")
+    assert not report.score_found and report.overall_score == 0.0
+    assert report.verdict == "MAJOR_REVISION_NEEDED"
+    assert parse_quality_score("No score here") == 0.0
+
+
+def test_missing_sections():
+    report = parse_quality_report("**OVERALL SCORE**: 6/10\n\nReads fine overall.")
+    assert report.overall_score == 6.0
+    assert report.improvements == [] and report.priority_fix is None and report.verdict is None
+    assert extract_improvement_suggestions(report.text) == []
+
+
+def test_priority_fix_stands_in_for_missing_improvements():
+    text = "**OVERALL SCORE**: 5/10\n\n**PRIORITY FIX**: Cut the intro."
+    assert extract_improvement_suggestions(text) == ["Cut the intro."]
+
+
+def test_unlabelled_score_falls_back_to_first_out_of_ten():
+    assert parse_quality_score("Rating: 6.5/10, then 9/10 for tone") == 6.5
+    assert parse_quality_score("Final Score: 7/10 after 4/10 first") == 7.0
+
+
+def test_scores_are_clamped():
+    assert parse_quality_score("**OVERALL SCORE**: 12/10") == 10.0
+
+
+def test_plain_headers_without_bold():
+    report = parse_quality_report(
+        "OVERALL SCORE: 8/10\nCONTEXTUAL IMPROVEMENTS:\n- Tighten the close\nVERDICT: APPROVED"
+    )
+    assert report.improvements == ["Tighten the close"]
+    assert report.verdict == "APPROVED"
@@ -0,0 +1,52 @@
+"""Tests for the quality feedback loop, run against the fake LLM backend."""
+import asyncio
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from src.config import TOKEN_BUDGET_CONFIG
+from src.pipelines.smart_routing import quality_feedback_loop
+from src.testing import FakeLlmScenario, use_fake_llm
+from src.testing.fake_llm import build_fake_draft
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.tracing import get_tracer
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limits():
+    get_rate_limiter().configure({"default": {"requests_per_minute": 1_000_000,
+                                              "tokens_per_minute": 1_000_000_000}})
+
+
+def run_loop(scores):
+    scenario = FakeLlmScenario(latency_seconds=(0.0, 0.0), scores={"linkedin": scores})
+
+    async def scenario_run():
+        with get_tracer().span("request"):
+            return await quality_feedback_loop(
+                {"linkedin": build_fake_draft("linkedin")}, "research", "user", "session"
+            )
+
+    with use_fake_llm(scenario) as backend, redirect_stdout(io.StringIO()):
+        _, scores_history, attempts, stop_reasons = asyncio.run(scenario_run())
+    return scores_history, attempts, stop_reasons, backend.calls
+
+
+def test_spent_budget_keeps_the_current_draft(monkeypatch):
+    monkeypatch.setitem(TOKEN_BUDGET_CONFIG, "max_tokens_per_request", 1)
+    scores_history, attempts, stop_reasons, calls = run_loop([5.0, 8.0])
+
+    assert stop_reasons == {"linkedin": "token_budget"}
+    assert scores_history == {"linkedin": [5.0]} and attempts == 1
+    # Assessed once, never regenerated
+    assert calls["checker"] == 1 and calls["linkedin"] == 0
+
+
+def test_budget_left_allows_regeneration(monkeypatch):
+    monkeypatch.setitem(TOKEN_BUDGET_CONFIG, "max_tokens_per_request", 0)   # Disabled
+    scores_history, attempts, stop_reasons, calls = run_loop([5.0, 8.0])
+
+    assert stop_reasons == {"linkedin": "approved"}
+    assert scores_history == {"linkedin": [5.0, 8.0]} and attempts == 2
+    assert calls["linkedin"] == 1
@@ -0,0 +1,68 @@
+"""Tests for local repair of mechanical constraint violations."""
+import pytest
+
+from src.utils.repair import (
+    remove_red_flags,
+    repair_draft,
+    strip_hashtags,
+    strip_wrapping_quotes,
+    trim_to_length
+)
+from src.utils.validation import check_platform_constraints
+
+
+def repair(platform: str, content: str):
+    return repair_draft(platform, content, check_platform_constraints(platform, content))
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('"Ship it today."', "Ship it today."),
+    ("  “Ship it today.”\n", "Ship it today."),
+    ("'Don't ship it today.'", "Don't ship it today."),
+])
+def test_strip_wrapping_quotes(content, expected):
+    assert strip_wrapping_quotes(content) == expected
+
+
+@pytest.mark.parametrize("content", [
+    '"Ship it" my manager said. I said "not yet"',
+    "“Ship it” my manager said. I said “not yet”",
+    '"',
+    "",
+])
+def test_separate_quotations_are_left_alone(content):
+    assert strip_wrapping_quotes(content) == content.strip()
+
+
+def test_repair_unwraps_a_quoted_post():
+    assert repair("x_twitter", '"Ship small changes, often."') == "Ship small changes, often."
+
+
+def test_repair_keeps_separate_quotations():
+    content = '"Ship it" my manager said. I said "not yet"'
+    assert check_platform_constraints("x_twitter", content) == []
+    assert repair("x_twitter", content) is None
+
+
+def test_strip_hashtags():
+    assert strip_hashtags("Ship small changes. #AI #devops") == "Ship small changes."
+    assert strip_hashtags("Why #AI changes reviews\n#ml #data") == "Why AI changes reviews"
+
+
+def test_remove_red_flags_drops_sentence_and_takeaways_list():
+    content = "Excited to share our launch. It took a year.\n\nKey takeaways:\n- one\n- two\n\nThanks."
+    assert remove_red_flags(content) == "It took a year.\n\nThanks."
+
+
+def test_trim_to_length_cuts_at_sentence_boundary():
+    text = "First sentence here. " * 12 + "Last one."
+    trimmed = trim_to_length("x_twitter", text, 240)
+    assert trimmed.endswith(".") and len(trimmed) <= 240
+
+
+def test_trim_to_length_refuses_to_cut_too_much():
+    assert trim_to_length("x_twitter", "word " * 100, 280) is None
+
+
+def test_unrepairable_violations_need_regeneration():
+    assert repair("blog", "Too short to be an article.") is None
@@ -0,0 +1,85 @@
+"""Tests for topic-scoped research sharing."""
+import asyncio
+
+import pytest
+
+from src.config import RESEARCH_CONFIG
+from src.utils.research_cache import ResearchCache, normalize_topic
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResearchCache({**RESEARCH_CONFIG, "cache_enabled": True, "cache_directory": str(tmp_path)})
+
+
+def test_equivalent_topics_normalize_alike():
+    assert normalize_topic("Remote Work Productivity") == normalize_topic("productivity of remote work")
+    assert normalize_topic("unknown") == ""
+
+
+def test_concurrent_requests_share_one_research_call(cache):
+    calls = []
+
+    async def research(prompt):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return "insights"
+
+    async def scenario():
+        return await asyncio.gather(
+            cache.get_or_research("remote work", research),
+            cache.get_or_research("Remote Work", research)
+        )
+
+    assert asyncio.run(scenario()) == [("insights", False), ("insights", True)]
+    assert len(calls) == 1
+
+
+def test_leader_cancellation_does_not_cancel_followers(cache):
+    calls = []
+
+    async def scenario():
+        leader_started = asyncio.Event()
+
+        async def slow_research(prompt):
+            calls.append("leader")
+            leader_started.set()
+            await asyncio.sleep(3600)
+
+        async def research(prompt):
+            calls.append("follower")
+            return "insights"
+
+        leader = asyncio.ensure_future(cache.get_or_research("remote work", slow_research))
+        await leader_started.wait()
+        follower = asyncio.ensure_future(cache.get_or_research("remote work", research))
+        # Let the follower miss the cache and start waiting on the leader
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == ("insights", False)
+    assert calls == ["leader", "follower"]
+
+
+def test_leader_failure_is_shared_and_not_cached(cache):
+    async def failing(prompt):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("research failed")
+
+    async def working(prompt):
+        return "insights"
+
+    async def scenario():
+        outcomes = await asyncio.gather(
+            cache.get_or_research("remote work", failing),
+            cache.get_or_research("remote work", failing),
+            return_exceptions=True
+        )
+        return outcomes, await cache.get_or_research("remote work", working)
+
+    outcomes, retry = asyncio.run(scenario())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert retry == ("insights", False)
@@ -0,0 +1,106 @@
+"""Tests for per-platform research slicing."""
+import asyncio
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from src.pipelines import stream_smart_routed_content
+from src.testing import FakeLlmScenario, use_fake_llm
+from src.testing.fake_llm import FakeLlmBackend
+from src.utils import get_content_store, get_research_cache
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.research_slicing import ResearchSlicer
+
+RESEARCH = """**RESEARCH INSIGHTS FOR NATURAL INTEGRATION**
+
+**Conversation Starters** (2-3 insights):
+- Starter one
+- Starter two
+- Starter three
+
+**Story-Worthy Examples**:
+- A design studio moved status updates to a shared doc and
+  reclaimed an afternoon a week
+
+**Human Connection Points**:
+- Ending a busy day with nothing finished
+
+**Natural Integration Suggestions**:
+- X/Twitter: one surprising number
+- LinkedIn: a personal lesson
+
+**Avoid Academic Research Patterns**:
+- Skip formal citations
+"""
+
+
+def slicer(enabled: bool = True) -> ResearchSlicer:
+    return ResearchSlicer({"enabled": enabled, "report": False})
+
+
+def test_each_platform_gets_only_its_slice():
+    x_slice = slicer().slice(RESEARCH, ["x_twitter"], "test")
+    assert "Starter two" in x_slice and "Starter three" not in x_slice
+    assert "design studio" not in x_slice and "busy day" not in x_slice
+    assert "one surprising number" in x_slice and "personal lesson" not in x_slice
+    assert "formal citations" not in x_slice
+
+    linkedin_slice = slicer().slice(RESEARCH, ["linkedin"], "test")
+    # Continuation lines are joined onto their item
+    assert "shared doc and reclaimed an afternoon a week" in linkedin_slice
+    assert "personal lesson" in linkedin_slice and "surprising number" not in linkedin_slice
+
+
+def test_several_platforms_keep_the_most_items_any_of_them_uses():
+    combined = slicer().slice(RESEARCH, ["x_twitter", "blog"], "test")
+    assert "Starter three" in combined and "design studio" in combined
+    assert "surprising number" in combined
+
+
+def test_unrecognised_research_passes_through_whole():
+    research = "Remote teams that plan focus blocks report fewer interruptions."
+    research_slicer = slicer()
+    assert research_slicer.slice(research, ["x_twitter"], "test") == research
+    assert research_slicer.stats["passthrough"] == 1
+
+
+def test_disabled_slicing_passes_research_through():
+    assert slicer(enabled=False).slice(RESEARCH, ["x_twitter"], "test") == RESEARCH
+
+
+@pytest.fixture
+def pipeline_environment(monkeypatch):
+    monkeypatch.setattr(get_research_cache(), "enabled", False)
+    monkeypatch.setattr(get_content_store(), "enabled", False)
+    get_rate_limiter().configure({"default": {"requests_per_minute": 1_000_000,
+                                              "tokens_per_minute": 1_000_000_000}})
+
+
+def test_generation_prompts_carry_their_platform_slice(monkeypatch, pipeline_environment):
+    prompts = {}
+    respond = FakeLlmBackend.respond
+
+    async def recording_respond(self, role, llm_request):
+        text = "".join(part.text for content in llm_request.contents
+                       for part in content.parts or [] if part.text)
+        prompts.setdefault(role, []).append(text)
+        return await respond(self, role, llm_request)
+
+    monkeypatch.setattr(FakeLlmBackend, "respond", recording_respond)
+    scenario = FakeLlmScenario(latency_seconds=(0.0, 0.0))
+
+    async def run():
+        async for _ in stream_smart_routed_content(
+            "Create content for X and LinkedIn about remote work productivity"
+        ):
+            pass
+
+    with use_fake_llm(scenario), redirect_stdout(io.StringIO()):
+        asyncio.run(run())
+
+    x_prompt, linkedin_prompt = prompts["x_twitter"][0], prompts["linkedin"][0]
+    assert "Conversation Starters" in x_prompt and "Story-Worthy Examples" not in x_prompt
+    assert "X/Twitter:" in x_prompt and "LinkedIn:" not in x_prompt
+    assert "Story-Worthy Examples" in linkedin_prompt and "X/Twitter:" not in linkedin_prompt
+    assert "Avoid Academic Research Patterns" not in x_prompt + linkedin_prompt
@@ -0,0 +1,144 @@
+"""Tests for the circuit breaker state machine and its use in the agent retry loop."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import resilience, runners
+from src.utils.resilience import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """Stands in for the time module so tests control time.monotonic()."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience, "time", fake)
+    return fake
+
+
+def open_breaker(clock, threshold=2, reset=30.0) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=threshold, reset_seconds=reset)
+    for _ in range(threshold):
+        breaker.record_failure()
+    return breaker
+
+
+def test_stays_closed_below_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_success_resets_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30.0)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_opens_at_threshold_and_fails_fast(clock):
+    breaker = open_breaker(clock)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_in() == pytest.approx(30.0)
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = open_breaker(clock)
+    clock.now += 30.0
+    assert breaker.state == "half_open"
+    assert breaker.retry_in() == 0.0
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_trial_success_closes(clock):
+    breaker = open_breaker(clock)
+    clock.now += 30.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_trial_failure_reopens_for_another_reset_period(clock):
+    breaker = open_breaker(clock)
+    clock.now += 30.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now += 30.0
+    assert breaker.allow()
+
+
+def test_abandoned_trial_lets_the_next_call_try(clock):
+    breaker = open_breaker(clock)
+    clock.now += 30.0
+    assert breaker.allow()
+    breaker.abandon_trial()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def _retry_loop(model_name: str):
+    return runners._call_with_retries(
+        SimpleNamespace(name="test_agent"), model_name, "instruction", "user", "session",
+        "input", None, SimpleNamespace(attributes={})
+    )
+
+
+def test_cancelled_trial_call_releases_the_trial(clock, monkeypatch):
+    breaker = resilience.get_circuit_breakers().for_model("test-cancelled-trial")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    clock.now += breaker.reset_seconds
+
+    started = asyncio.Event()
+
+    async def hang(*args, **kwargs):
+        started.set()
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(runners, "_run_hedged", hang)
+
+    async def scenario():
+        task = asyncio.ensure_future(_retry_loop("test-cancelled-trial"))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_open_circuit_raises_without_calling_the_model(clock, monkeypatch):
+    breaker = resilience.get_circuit_breakers().for_model("test-open-circuit")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("model called while the circuit is open")
+
+    monkeypatch.setattr(runners, "_run_hedged", unexpected)
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(_retry_loop("test-open-circuit"))
@@ -0,0 +1,65 @@
+"""Tests for the platform task runner."""
+import asyncio
+
+import pytest
+
+from src.utils.runners import SessionManager, run_platform_tasks
+
+
+async def task(platform):
+    if platform == "fails":
+        raise ValueError("boom")
+    if platform == "cancelled":
+        raise asyncio.CancelledError()
+    return f"{platform} done"
+
+
+@pytest.mark.parametrize("mode", ["sequential", "parallel"])
+def test_failures_are_returned_per_platform(mode):
+    outcomes = asyncio.run(run_platform_tasks(["ok", "fails"], task, mode))
+    assert outcomes["ok"] == "ok done"
+    assert isinstance(outcomes["fails"], ValueError)
+
+
+@pytest.mark.parametrize("mode", ["sequential", "parallel"])
+def test_cancelled_task_is_raised_not_returned(mode):
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run_platform_tasks(["ok", "cancelled", "fails"], task, mode))
+
+
+class FakeSessionService:
+    def __init__(self):
+        self.sessions = set()
+
+    async def create_session(self, app_name, user_id, session_id):
+        self.sessions.add((user_id, session_id))
+
+    async def delete_session(self, app_name, user_id, session_id):
+        self.sessions.remove((user_id, session_id))
+
+
+class FakeRunner:
+    app_name = "test"
+
+    def __init__(self):
+        self.session_service = FakeSessionService()
+
+
+def test_each_run_gets_a_fresh_session_deleted_afterwards():
+    async def scenario():
+        manager = SessionManager()
+        runner = FakeRunner()
+        seen = []
+        for _ in range(2):
+            async with manager.session(runner, "user", "pipeline") as session_id:
+                seen.append(session_id)
+                assert ("user", session_id) in runner.session_service.sessions
+        with pytest.raises(ValueError):
+            async with manager.session(runner, "user", "pipeline"):
+                raise ValueError("agent failed")
+        return seen, runner.session_service.sessions, manager.stats
+
+    seen, left, stats = asyncio.run(scenario())
+    assert seen[0] != seen[1] and all(s.startswith("pipeline:call-") for s in seen)
+    assert not left
+    assert stats == {"created": 3, "deleted": 3}
@@ -0,0 +1,73 @@
+"""Tests for the multi-tenant scheduler."""
+import asyncio
+
+from src.config.settings import SCHEDULER_CONFIG
+from src.utils.scheduler import Scheduler
+
+
+def make_scheduler(**overrides) -> Scheduler:
+    return Scheduler({**SCHEDULER_CONFIG, "enabled": True, "max_concurrent_calls": 1, **overrides})
+
+
+async def run_queued(scheduler, callers):
+    """Start callers (user_id, priority) while the only call slot is held; return the order they ran in."""
+    order = []
+
+    async def call(user_id, priority):
+        async with scheduler.request(scheduler.context(user_id, priority)):
+            async with scheduler.call(100):
+                order.append((user_id, priority))
+
+    async with scheduler.call(100):
+        tasks = [asyncio.create_task(call(*caller)) for caller in callers]
+        await asyncio.sleep(0.01)   # Everyone is queued behind the held slot
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_higher_priority_calls_go_first():
+    callers = [("a", "batch"), ("a", "normal"), ("a", "interactive")]
+    order = asyncio.run(run_queued(make_scheduler(), callers))
+    assert order == [("a", "interactive"), ("a", "normal"), ("a", "batch")]
+
+
+def test_tenant_with_less_recent_usage_goes_first():
+    scheduler = make_scheduler()
+    scheduler.tenant("heavy").record_tokens(50_000, 0)
+    scheduler.tenant("light").record_tokens(1_000, 0)
+
+    order = asyncio.run(run_queued(scheduler, [("heavy", "normal"), ("light", "normal")]))
+    assert order == [("light", "normal"), ("heavy", "normal")]
+
+
+def test_tenant_weight_scales_its_share():
+    scheduler = make_scheduler(tenants={"big": {"weight": 10}})
+    scheduler.tenant("big").record_tokens(50_000, 0)
+    scheduler.tenant("small").record_tokens(10_000, 0)
+
+    order = asyncio.run(run_queued(scheduler, [("small", "normal"), ("big", "normal")]))
+    assert order == [("big", "normal"), ("small", "normal")]
+
+
+def test_cancelled_waiter_does_not_take_or_leak_the_slot():
+    async def scenario():
+        scheduler = make_scheduler()
+        ran = []
+
+        async def call(name):
+            async with scheduler.call(100):
+                ran.append(name)
+
+        async with scheduler.call(100):
+            first = asyncio.create_task(call("cancelled"))
+            second = asyncio.create_task(call("waiting"))
+            await asyncio.sleep(0.01)
+            # The slot frees up before the cancelled task resumes to leave the queue
+            first.cancel()
+        await asyncio.wait({first, second})
+        return first, second, ran, scheduler.stats()
+
+    first, second, ran, stats = asyncio.run(scenario())
+    assert first.cancelled() and second.exception() is None
+    assert ran == ["waiting"]
+    assert stats["calls_in_flight"] == 0 and stats["calls_waiting"] == 0
@@ -0,0 +1,101 @@
+"""Tests for section-level regeneration utilities."""
+from src.utils.quality import QualityReport
+from src.utils.sections import (
+    map_feedback_to_sections,
+    plan_section_regeneration,
+    splice_section,
+    split_sections,
+)
+
+ARTICLE = """# Remote Work That Actually Works
+
+Most teams copied the office onto video calls and wondered why everyone was tired.
+
+## Protect Focus Time
+
+Block two hours every morning with no meetings. Our engineers shipped faster within a month.
+
+## Write Things Down
+
+Async documents replace status meetings. A weekly written update takes ten minutes to read.
+
+## Conclusion
+
+Remote work rewards teams that plan their communication on purpose.
+"""
+
+
+def report(*improvements, priority_fix=None) -> QualityReport:
+    return QualityReport(improvements=list(improvements), priority_fix=priority_fix)
+
+
+def test_split_round_trips_and_keeps_title_in_opening():
+    sections = split_sections(ARTICLE)
+    assert "".join(section.text for section in sections) == ARTICLE
+    assert [section.heading for section in sections] == \
+        ["", "## Protect Focus Time", "## Write Things Down", "## Conclusion"]
+    assert sections[0].text.startswith("# Remote Work")
+
+
+def test_split_without_subheadings_is_one_section():
+    text = "# Title\n\nJust one body paragraph.\n"
+    assert [section.text for section in split_sections(text)] == [text]
+
+
+def test_opening_and_closing_feedback():
+    targeted, general = map_feedback_to_sections(split_sections(ARTICLE), report(
+        "Make the opening line punchier",
+        "End with a question in the conclusion",
+    ))
+    assert targeted == {0: ["Make the opening line punchier"],
+                        3: ["End with a question in the conclusion"]}
+    assert general == []
+
+
+def test_quoted_text_and_heading_names_pick_their_section():
+    targeted, _ = map_feedback_to_sections(split_sections(ARTICLE), report(
+        'Back up "shipped faster within a month" with a number',
+        "Write Things Down needs an example document",
+    ))
+    assert targeted[1] == ['Back up "shipped faster within a month" with a number']
+    assert targeted[2] == ["Write Things Down needs an example document"]
+
+
+def test_unmatched_feedback_is_general_and_priority_fix_comes_first():
+    targeted, general = map_feedback_to_sections(split_sections(ARTICLE), report(
+        "Use a warmer tone", priority_fix="Sound less formal overall"
+    ))
+    assert targeted == {}
+    assert general == ["PRIORITY: Sound less formal overall", "Use a warmer tone"]
+
+
+def test_splice_restores_dropped_heading_and_spacing():
+    section = split_sections(ARTICLE)[1]
+    spliced = splice_section(section, "Block mornings for deep work.")
+    assert spliced == "## Protect Focus Time\n\nBlock mornings for deep work.\n\n"
+
+
+def test_splice_keeps_a_rewritten_heading_and_ignores_empty_rewrites():
+    section = split_sections(ARTICLE)[1]
+    assert splice_section(section, "## Guard Your Mornings\n\nNo meetings before noon.") == \
+        "## Guard Your Mornings\n\nNo meetings before noon.\n\n"
+    assert splice_section(section, "   ") == section.text
+
+
+def test_plan_targets_sections():
+    plan = plan_section_regeneration(ARTICLE, report("Make the opening line punchier"),
+                                     min_sections=3, max_rewrite_fraction=0.6)
+    assert plan is not None
+    sections, targeted, general = plan
+    assert len(sections) == 4 and list(targeted) == [0] and general == []
+
+
+def test_plan_falls_back_to_full_rewrite():
+    feedback = report("Make the opening line punchier")
+    # Too few sections
+    assert plan_section_regeneration(ARTICLE, feedback, min_sections=5, max_rewrite_fraction=0.6) is None
+    # No feedback tied to a section
+    assert plan_section_regeneration(ARTICLE, report("Use a warmer tone"),
+                                     min_sections=3, max_rewrite_fraction=0.6) is None
+    # Targeted sections hold too much of the article
+    assert plan_section_regeneration(ARTICLE, feedback, min_sections=3, max_rewrite_fraction=0.1) is None
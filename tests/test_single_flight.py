@@ -0,0 +1,159 @@
+"""Tests for single-flight sharing of plain and streaming work."""
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import FlightCancelledError, SingleFlight, SingleFlightStream
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+def test_concurrent_callers_share_one_run():
+    async def scenario():
+        flights = SingleFlight("test")
+        runs = 0
+
+        async def work():
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        outcomes = await asyncio.gather(*(flights.run("key", work) for _ in range(3)))
+        return runs, outcomes, flights.stats
+
+    runs, outcomes, stats = asyncio.run(scenario())
+    assert runs == 1
+    assert outcomes == [("result", False), ("result", True), ("result", True)]
+    assert stats == {"runs": 1, "coalesced": 2}
+
+
+def test_leader_failure_is_raised_to_every_caller():
+    async def scenario():
+        flights = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        return await asyncio.gather(*(flights.run("key", work) for _ in range(2)), return_exceptions=True)
+
+    outcomes = asyncio.run(scenario())
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+
+
+def test_cancelled_work_fails_waiters_without_cancelling_them():
+    async def scenario():
+        flights = SingleFlight("test")
+        task = asyncio.ensure_future(flights.run("key", lambda: asyncio.sleep(3600)))
+        await asyncio.sleep(0)
+        flights._flights["key"].task.cancel()
+        with pytest.raises(FlightCancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+
+def test_work_survives_one_caller_giving_up():
+    async def scenario():
+        flights = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        first = asyncio.ensure_future(flights.run("key", work))
+        second = asyncio.ensure_future(flights.run("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == ("result", True)
+
+
+def test_stream_late_subscriber_gets_every_event():
+    async def scenario():
+        flights = SingleFlightStream("test")
+        halfway = asyncio.Event()
+
+        async def work(publish):
+            publish(1)
+            publish(2)
+            halfway.set()
+            await asyncio.sleep(0.01)
+            publish(3)
+
+        first = asyncio.ensure_future(collect(flights.stream("key", work)))
+        await halfway.wait()
+        second = await collect(flights.stream("key", work))
+        return await first, second, flights.stats
+
+    first, second, stats = asyncio.run(scenario())
+    assert first == second == [1, 2, 3]
+    assert stats == {"runs": 1, "coalesced": 1}
+
+
+def test_stream_leader_failure_reaches_every_subscriber():
+    async def scenario():
+        flights = SingleFlightStream("test")
+
+        async def work(publish):
+            publish("started")
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def subscriber():
+            received = []
+            with pytest.raises(ValueError, match="boom"):
+                async for event in flights.stream("key", work):
+                    received.append(event)
+            return received
+
+        return await asyncio.gather(subscriber(), subscriber())
+
+    assert asyncio.run(scenario()) == [["started"], ["started"]]
+
+
+def test_stream_cancelled_work_raises_instead_of_ending_cleanly():
+    async def scenario():
+        flights = SingleFlightStream("test")
+
+        async def work(publish):
+            publish("started")
+            await asyncio.sleep(3600)
+
+        received = []
+
+        async def subscriber():
+            async for event in flights.stream("key", work):
+                received.append(event)
+                flights._flights["key"].task.cancel()
+
+        with pytest.raises(FlightCancelledError):
+            await subscriber()
+        return received
+
+    assert asyncio.run(scenario()) == ["started"]
+
+
+def test_stream_work_is_cancelled_when_last_subscriber_leaves():
+    async def scenario():
+        flights = SingleFlightStream("test")
+        cancelled = asyncio.Event()
+
+        async def work(publish):
+            publish("started")
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        events = flights.stream("key", work)
+        assert await events.__anext__() == "started"
+        await events.aclose()
+        return cancelled.is_set(), flights.in_flight()
+
+    assert asyncio.run(scenario()) == (True, 0)
@@ -0,0 +1,43 @@
+"""Tests for local platform constraint checks."""
+import pytest
+
+from src.utils.validation import check_platform_constraints, wrapping_quotes
+
+
+def rules_broken(platform: str, content: str):
+    return [violation.rule for violation in check_platform_constraints(platform, content)]
+
+
+@pytest.mark.parametrize("content, kind", [
+    ('"Ship it today."', '"'),
+    ("  'Ship it today.'  ", "'"),
+    ("“Ship it today.”", "“”"),
+    ("'Don't ship it today.'", "'"),
+    ('"Ship it \\"today\\"."', '"'),
+])
+def test_wrapping_quotes_detected(content, kind):
+    assert wrapping_quotes(content) == kind
+
+
+@pytest.mark.parametrize("content", [
+    '"Ship it" my manager said. I said "not yet"',
+    "“Ship it” my manager said. I said “not yet”",
+    "'Ship it' my manager said. I said 'not yet'",
+    "Ship it today.",
+    '"',
+    "",
+])
+def test_separate_quotations_are_not_wrapping(content):
+    assert wrapping_quotes(content) is None
+
+
+def test_wrapping_quotes_rule_only_flags_wrapped_posts():
+    assert rules_broken("x_twitter", '"Ship it today."') == ["wrapping_quotes"]
+    assert rules_broken("x_twitter", '"Ship it" my manager said. I said "not yet"') == []
+    # Only X forbids wrapping quotes
+    assert rules_broken("linkedin", '"Ship it today."') == []
+
+
+def test_hashtags_and_red_flags():
+    assert rules_broken("linkedin", "Excited to share our launch #AI") == ["hashtags", "red_flag"]
+    assert rules_broken("linkedin", "Issue #42 and R&D#1 are not hashtags") == []
@@ -0,0 +1,103 @@
+"""Tests for the service work queue and its HTTP endpoints."""
+import asyncio
+
+import pytest
+
+from src.pipelines.events import FINAL_CONTENT, RESEARCH_READY, PipelineEvent
+from src.service import app as service
+from src.service import work_queue as work_queue_module
+from src.service.work_queue import QueueFullError, WorkQueue
+
+
+async def fake_pipeline(request, user_id=None, priority=None):
+    """Stands in for the pipeline; the request text picks the behaviour."""
+    yield PipelineEvent(RESEARCH_READY, {"research": ""})
+    if request == "hang":
+        await asyncio.sleep(3600)
+    elif request == "stray cancel":
+        raise asyncio.CancelledError()
+    elif request == "no final":
+        return
+    yield PipelineEvent(FINAL_CONTENT, {"result": f"done: {request}"})
+
+
+@pytest.fixture(autouse=True)
+def pipeline(monkeypatch):
+    monkeypatch.setattr(work_queue_module, "stream_smart_routed_content", fake_pipeline)
+
+
+def test_full_queue_sheds_load_with_503(monkeypatch):
+    async def scenario():
+        queue = WorkQueue(workers=1, max_size=1)   # Not started, so jobs stay queued
+        monkeypatch.setattr(service, "work_queue", queue)
+        queue.submit("waiting")
+        with pytest.raises(QueueFullError):
+            queue.submit("one too many")
+        response = await service.create_content(service.ContentRequest(request="rejected"))
+        return response, queue.stats()
+
+    response, stats = asyncio.run(scenario())
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+    assert stats["rejected"] == 2
+
+
+def test_stream_disconnect_cancels_job_and_keeps_worker(monkeypatch):
+    async def scenario():
+        queue = WorkQueue(workers=1, max_size=10)
+        monkeypatch.setattr(service, "work_queue", queue)
+        await queue.start()
+        response = await service.stream_content(service.ContentRequest(request="hang"))
+        lines = response.body_iterator
+        first = await lines.__anext__()
+        await lines.aclose()   # What the server does when the client goes away
+        after = await asyncio.wait_for(queue.submit("after").result, 5)
+        await queue.stop()
+        return first, after, queue.stats()
+
+    first, after, stats = asyncio.run(scenario())
+    assert RESEARCH_READY in first
+    assert after["status"] == "completed"
+    assert stats["cancelled"] == 1 and stats["completed"] == 1
+
+
+def test_stray_cancellation_fails_job_not_worker():
+    async def scenario():
+        queue = WorkQueue(workers=1, max_size=10)
+        await queue.start()
+        stray = await asyncio.wait_for(queue.submit("stray cancel").result, 5)
+        after = await asyncio.wait_for(queue.submit("after").result, 5)
+        await queue.stop()
+        return stray, after, queue.stats()
+
+    stray, after, stats = asyncio.run(scenario())
+    assert stray["status"] == "error"
+    assert after == {"status": "completed", "result": "done: after", "total_seconds": after["total_seconds"]}
+    assert stats["failed"] == 1 and stats["completed"] == 1
+
+
+def test_stream_without_final_content_is_an_error():
+    async def scenario():
+        queue = WorkQueue(workers=1, max_size=10)
+        await queue.start()
+        record = await asyncio.wait_for(queue.submit("no final").result, 5)
+        await queue.stop()
+        return record
+
+    record = asyncio.run(scenario())
+    assert record["status"] == "error"
+
+
+def test_shutdown_answers_running_and_waiting_jobs():
+    async def scenario():
+        queue = WorkQueue(workers=1, max_size=10)
+        await queue.start()
+        running = queue.submit("hang", stream=True)
+        waiting = queue.submit("hang")
+        await running.events.get()   # The first job is running
+        await queue.stop()
+        return running.result.result(), waiting.result.result(), queue.stats()
+
+    running, waiting, stats = asyncio.run(scenario())
+    assert running["status"] == waiting["status"] == "error"
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0